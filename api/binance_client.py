@@ -4,12 +4,18 @@ Responsabilité unique : Communication avec l'API REST Binance
 """
 import hashlib
 import hmac
+import json
 import time
 from typing import Dict, List, Optional, Any
 from urllib.parse import urlencode
 
 import requests
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson optionnel: décodage JSON standard sinon
+    from json import loads as json_loads
+
 import config
 from core.logger import get_module_logger
 
@@ -29,6 +35,11 @@ class BinanceAPIClient:
         if not self.api_key or not self.secret_key:
             self.logger.error("Clés API Binance manquantes dans la configuration")
             raise ValueError("Clés API Binance manquantes")
+        
+        # Session persistante: connexions TLS réutilisées (keep-alive) et
+        # en-tête d'authentification défini une seule fois
+        self.session = requests.Session()
+        self.session.headers.update({"X-MBX-APIKEY": self.api_key})
     
     def _generate_signature(self, data: str) -> str:
         """
@@ -75,17 +86,14 @@ class BinanceAPIClient:
             signature = self._generate_signature(query_string)
             params["signature"] = signature
             
-            headers = {"X-MBX-APIKEY": self.api_key}
-            
             self.logger.debug(f"Requête API: {endpoint}")
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}{endpoint}",
-                params=params,
-                headers=headers
+                params=params
             )
             
             if response.status_code == 200:
-                balance_data = response.json()
+                balance_data = json_loads(response.content)
                 self.logger.info("Balance du compte récupérée avec succès")
                 self.logger.debug(f"Nombre de balances: {len(balance_data)}")
                 return balance_data
@@ -120,16 +128,13 @@ class BinanceAPIClient:
             signature = self._generate_signature(query_string)
             params["signature"] = signature
             
-            headers = {"X-MBX-APIKEY": self.api_key}
-            
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}{endpoint}",
-                params=params,
-                headers=headers
+                params=params
             )
             
             if response.status_code == 200:
-                account_data = response.json()
+                account_data = json_loads(response.content)
                 self.logger.info("Informations du compte récupérées avec succès")
                 return account_data
             else:
@@ -158,10 +163,10 @@ class BinanceAPIClient:
         try:
             endpoint = "/fapi/v1/exchangeInfo"
             
-            response = requests.get(f"{self.base_url}{endpoint}")
+            response = self.session.get(f"{self.base_url}{endpoint}")
             
             if response.status_code == 200:
-                exchange_info = response.json()
+                exchange_info = json_loads(response.content)
                 
                 # Chercher le symbole spécifique
                 for symbol_info in exchange_info.get("symbols", []):
@@ -306,16 +311,13 @@ class BinanceAPIClient:
             signature = self._generate_signature(query_string)
             params["signature"] = signature
             
-            headers = {"X-MBX-APIKEY": self.api_key}
-            
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}{endpoint}",
-                params=params,
-                headers=headers
+                params=params
             )
             
             if response.status_code == 200:
-                order_data = response.json()
+                order_data = json_loads(response.content)
                 self.logger.info(f"Ordre placé avec succès: {order_data.get('orderId')}")
                 return order_data
             else:
@@ -372,16 +374,13 @@ class BinanceAPIClient:
             signature = self._generate_signature(query_string)
             params["signature"] = signature
             
-            headers = {"X-MBX-APIKEY": self.api_key}
-            
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}{endpoint}",
-                params=params,
-                headers=headers
+                params=params
             )
             
             if response.status_code == 200:
-                order_data = response.json()
+                order_data = json_loads(response.content)
                 self.logger.info(f"Ordre STOP_MARKET placé avec succès: {order_data.get('orderId')}")
                 return order_data
             else:
@@ -419,16 +418,13 @@ class BinanceAPIClient:
             signature = self._generate_signature(query_string)
             params["signature"] = signature
             
-            headers = {"X-MBX-APIKEY": self.api_key}
-            
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}{endpoint}",
-                params=params,
-                headers=headers
+                params=params
             )
             
             if response.status_code == 200:
-                order_data = response.json()
+                order_data = json_loads(response.content)
                 self.logger.debug(f"Statut ordre {order_id}: {order_data.get('status')}")
                 return order_data
             else:
@@ -439,7 +435,7 @@ class BinanceAPIClient:
             self.logger.error(f"Erreur lors de la récupération du statut d'ordre: {e}", exc_info=True)
             return None
     
-    def get_open_orders(self, symbol: str) -> list[Dict[str, Any]]:
+    def get_open_orders(self, symbol: str) -> Optional[list[Dict[str, Any]]]:
         """
         Récupère tous les ordres ouverts pour un symbole
         
@@ -447,7 +443,7 @@ class BinanceAPIClient:
             symbol: Symbole de trading
             
         Returns:
-            Liste des ordres ouverts
+            Liste des ordres ouverts ou None en cas d'erreur (à distinguer d'une liste vide)
         """
         self.logger.debug(f"get_open_orders called: {symbol}")
         
@@ -464,25 +460,22 @@ class BinanceAPIClient:
             signature = self._generate_signature(query_string)
             params["signature"] = signature
             
-            headers = {"X-MBX-APIKEY": self.api_key}
-            
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}{endpoint}",
-                params=params,
-                headers=headers
+                params=params
             )
             
             if response.status_code == 200:
-                orders = response.json()
+                orders = json_loads(response.content)
                 self.logger.debug(f"Ordres ouverts récupérés: {len(orders)} ordres")
                 return orders
             else:
                 self.logger.error(f"Erreur récupération ordres ouverts: {response.status_code} - {response.text}")
-                return []
+                return None
                 
         except Exception as e:
             self.logger.error(f"Erreur lors de la récupération des ordres ouverts: {e}", exc_info=True)
-            return []
+            return None
     
     def place_take_profit_order(
         self,
@@ -534,16 +527,13 @@ class BinanceAPIClient:
             signature = self._generate_signature(query_string)
             params["signature"] = signature
             
-            headers = {"X-MBX-APIKEY": self.api_key}
-            
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}{endpoint}",
-                params=params,
-                headers=headers
+                params=params
             )
             
             if response.status_code == 200:
-                order_data = response.json()
+                order_data = json_loads(response.content)
                 self.logger.info(f"Ordre TAKE_PROFIT placé avec succès: {order_data.get('orderId')}")
                 return order_data
             else:
@@ -554,6 +544,55 @@ class BinanceAPIClient:
             self.logger.error(f"Erreur lors du placement TAKE_PROFIT: {e}", exc_info=True)
             return None
     
+    def place_batch_orders(self, orders: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Place plusieurs ordres en une seule requête (POST /fapi/v1/batchOrders)
+        
+        Les prix et quantités doivent déjà être formatés selon le symbole.
+        
+        Args:
+            orders: Paramètres de chaque ordre (5 maximum)
+            
+        Returns:
+            Réponses dans l'ordre des ordres envoyés (ordre placé ou
+            {"code", "msg"} en cas d'échec individuel), ou None si la requête échoue
+        """
+        self.logger.debug(f"place_batch_orders called: {len(orders)} ordres")
+        
+        if not 1 <= len(orders) <= 5:
+            self.logger.error(f"Nombre d'ordres groupés invalide: {len(orders)} (1 à 5)")
+            return None
+        
+        try:
+            endpoint = "/fapi/v1/batchOrders"
+            timestamp = int(time.time() * 1000)
+            
+            params: Dict[str, Any] = {
+                "batchOrders": json.dumps(orders, separators=(",", ":")),
+                "timestamp": timestamp
+            }
+            
+            query_string = urlencode(params)
+            signature = self._generate_signature(query_string)
+            params["signature"] = signature
+            
+            response = self.session.post(
+                f"{self.base_url}{endpoint}",
+                params=params
+            )
+            
+            if response.status_code == 200:
+                results = json_loads(response.content)
+                self.logger.info(f"Ordres groupés envoyés: {[result.get('orderId', result.get('msg')) for result in results]}")
+                return results
+            else:
+                self.logger.error(f"Erreur placement ordres groupés: {response.status_code} - {response.text}")
+                return None
+                
+        except Exception as e:
+            self.logger.error(f"Erreur lors du placement d'ordres groupés: {e}", exc_info=True)
+            return None
+    
     def cancel_order(self, symbol: str, order_id: int) -> Optional[Dict[str, Any]]:
         """
         Annule un ordre spécifique
@@ -582,16 +621,13 @@ class BinanceAPIClient:
             signature = self._generate_signature(query_string)
             params["signature"] = signature
             
-            headers = {"X-MBX-APIKEY": self.api_key}
-            
-            response = requests.delete(
+            response = self.session.delete(
                 f"{self.base_url}{endpoint}",
-                params=params,
-                headers=headers
+                params=params
             )
             
             if response.status_code == 200:
-                cancel_data = response.json()
+                cancel_data = json_loads(response.content)
                 self.logger.info(f"Ordre {order_id} annulé avec succès")
                 return cancel_data
             else:
@@ -602,6 +638,106 @@ class BinanceAPIClient:
             self.logger.error(f"Erreur lors de l'annulation d'ordre: {e}", exc_info=True)
             return None
     
+    def cancel_batch_orders(self, symbol: str, order_ids: List[int]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Annule plusieurs ordres d'un symbole en une seule requête (DELETE /fapi/v1/batchOrders)
+        
+        Args:
+            symbol: Symbole de trading
+            order_ids: IDs des ordres à annuler (10 maximum)
+            
+        Returns:
+            Résultats dans l'ordre des IDs (ordre annulé ou {"code", "msg"}
+            en cas d'échec individuel), ou None si la requête échoue
+        """
+        self.logger.debug(f"cancel_batch_orders called: {symbol} {order_ids}")
+        self.logger.info(f"Annulation groupée des ordres {order_ids} sur {symbol}")
+        
+        if not 1 <= len(order_ids) <= 10:
+            self.logger.error(f"Nombre d'ordres à annuler invalide: {len(order_ids)} (1 à 10)")
+            return None
+        
+        try:
+            endpoint = "/fapi/v1/batchOrders"
+            timestamp = int(time.time() * 1000)
+            
+            params: Dict[str, Any] = {
+                "symbol": symbol,
+                "orderIdList": json.dumps([int(order_id) for order_id in order_ids], separators=(",", ":")),
+                "timestamp": timestamp
+            }
+            
+            query_string = urlencode(params)
+            signature = self._generate_signature(query_string)
+            params["signature"] = signature
+            
+            response = self.session.delete(
+                f"{self.base_url}{endpoint}",
+                params=params
+            )
+            
+            if response.status_code == 200:
+                results = json_loads(response.content)
+                self.logger.info(f"Annulation groupée traitée: {[result.get('orderId', result.get('msg')) for result in results]}")
+                return results
+            else:
+                self.logger.error(f"Erreur annulation groupée: {response.status_code} - {response.text}")
+                return None
+                
+        except Exception as e:
+            self.logger.error(f"Erreur lors de l'annulation groupée: {e}", exc_info=True)
+            return None
+    
+    def replace_stop_market_order(
+        self,
+        symbol: str,
+        cancel_order_id: int,
+        side: str,
+        quantity: str,
+        stop_price: str,
+        position_side: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Remplace un ordre STOP_MARKET existant par un nouveau
+        
+        Binance Futures (USDⓈ-M) n'expose pas d'endpoint cancelReplace pour les
+        ordres stop: le nouvel ordre est placé AVANT l'annulation de l'ancien,
+        de sorte que la position n'est jamais sans protection.
+        
+        Args:
+            symbol: Symbole de trading
+            cancel_order_id: ID de l'ordre STOP_MARKET à remplacer
+            side: BUY ou SELL
+            quantity: Quantité à trader
+            stop_price: Nouveau prix de déclenchement
+            position_side: LONG ou SHORT (requis en mode Hedge)
+            
+        Returns:
+            Résultat au format cancelReplace (cancelResult, newOrderResult,
+            cancelResponse, newOrderResponse) ou None si le nouvel ordre a échoué
+        """
+        self.logger.debug(f"replace_stop_market_order called: {symbol} {cancel_order_id} → {stop_price}")
+        
+        new_order = self.place_stop_market_order(
+            symbol=symbol,
+            side=side,
+            quantity=quantity,
+            stop_price=stop_price,
+            position_side=position_side
+        )
+        if not new_order:
+            # L'ancien ordre reste en place
+            return None
+        
+        cancel_response = self.cancel_order(symbol, cancel_order_id)
+        
+        return {
+            "cancelResult": "SUCCESS" if cancel_response else "FAILURE",
+            "newOrderResult": "SUCCESS",
+            "cancelResponse": cancel_response,
+            "newOrderResponse": new_order
+        }
+    
     def get_position_info(self, symbol: str) -> Optional[List[Dict[str, Any]]]:
         """
         Récupère les informations de position pour un symbole
@@ -628,16 +764,13 @@ class BinanceAPIClient:
             signature = self._generate_signature(query_string)
             params["signature"] = signature
             
-            headers = {"X-MBX-APIKEY": self.api_key}
-            
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}{endpoint}",
-                params=params,
-                headers=headers
+                params=params
             )
             
             if response.status_code == 200:
-                positions = response.json()
+                positions = json_loads(response.content)
                 self.logger.info(f"Positions récupérées avec succès pour {symbol}")
                 return positions
             else:
@@ -660,12 +793,11 @@ class BinanceAPIClient:
         
         try:
             endpoint = "/fapi/v1/listenKey"
-            headers = {"X-MBX-APIKEY": self.api_key}
             
-            response = requests.post(f"{self.base_url}{endpoint}", headers=headers)
+            response = self.session.post(f"{self.base_url}{endpoint}")
             
             if response.status_code == 200:
-                listen_key_data = response.json()
+                listen_key_data = json_loads(response.content)
                 self.logger.info("Listen key créé avec succès")
                 return listen_key_data
             else:
@@ -690,10 +822,9 @@ class BinanceAPIClient:
         
         try:
             endpoint = "/fapi/v1/listenKey"
-            headers = {"X-MBX-APIKEY": self.api_key}
             params = {"listenKey": listen_key}
             
-            response = requests.put(f"{self.base_url}{endpoint}", headers=headers, params=params)
+            response = self.session.put(f"{self.base_url}{endpoint}", params=params)
             
             if response.status_code == 200:
                 self.logger.debug("Listen key keep-alive réussi")
@@ -720,10 +851,9 @@ class BinanceAPIClient:
         
         try:
             endpoint = "/fapi/v1/listenKey"
-            headers = {"X-MBX-APIKEY": self.api_key}
             params = {"listenKey": listen_key}
             
-            response = requests.delete(f"{self.base_url}{endpoint}", headers=headers, params=params)
+            response = self.session.delete(f"{self.base_url}{endpoint}", params=params)
             
             if response.status_code == 200:
                 self.logger.info("Listen key fermé avec succès")
@@ -763,12 +893,10 @@ class BinanceAPIClient:
             signature = self._generate_signature(query_string)
             params["signature"] = signature
 
-            headers = {"X-MBX-APIKEY": self.api_key}
-
-            response = requests.get(f"{self.base_url}{endpoint}", headers=headers, params=params)
+            response = self.session.get(f"{self.base_url}{endpoint}", params=params)
 
             if response.status_code == 200:
-                trades = response.json()
+                trades = json_loads(response.content)
                 self.logger.info(f"Trades récupérés: {len(trades)} trades pour {symbol}")
                 return trades
             else:
@@ -808,12 +936,10 @@ class BinanceAPIClient:
             signature = self._generate_signature(query_string)
             params["signature"] = signature
 
-            headers = {"X-MBX-APIKEY": self.api_key}
-
-            response = requests.get(f"{self.base_url}{endpoint}", headers=headers, params=params)
+            response = self.session.get(f"{self.base_url}{endpoint}", params=params)
 
             if response.status_code == 200:
-                income_list = response.json()
+                income_list = json_loads(response.content)
                 self.logger.info(f"Income récupéré: {len(income_list)} entrées PNL pour {symbol}")
                 return income_list
             else:
@@ -6,6 +6,11 @@ from typing import List, Dict, Any, Optional
 import pandas as pd
 import requests
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson optionnel: décodage JSON standard sinon
+    from json import loads as json_loads
+
 import config
 from core.logger import get_module_logger
 
@@ -59,7 +64,7 @@ class MarketDataClient:
             )
             
             if response.status_code == 200:
-                klines_data = response.json()
+                klines_data = json_loads(response.content)
                 self.logger.info(f"Récupération réussie: {len(klines_data)} bougies")
                 self.logger.debug(f"Première bougie: {klines_data[0] if klines_data else 'Aucune'}")
                 return klines_data
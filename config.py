@@ -82,6 +82,7 @@ ALL_OR_NOTHING_CONFIG: Dict[str, Any] = {
     "SL_OFFSET_PERCENT": 0.00001,  # 0.001% offset pour SL
     "TP_PERCENT": 0.003,  # 0.3% TP fixe du prix d'entrée
     "PRICE_OFFSET": 0.001,  # Offset entre stopPrice et price pour l'ordre limite (0.1%)
+    "STATE_FILE": "data/all_or_nothing_state.json",  # Persistance des SL/TP actifs entre redémarrages
     "DYNAMIC_RSI_EXIT": {
         "ENABLED": True,  # Activer/désactiver le TP dynamique basé sur RSI
         "MONITOR_FREQUENCY": "candle_close",  # Fréquence de monitoring ("candle_close")
@@ -561,7 +561,7 @@ class AccumulatorService:
                 return
             
             # 2. Récupérer les ordres ouverts (potentiels TPs)
-            open_orders = self.binance_client.get_open_orders(config.SYMBOL)
+            open_orders = self.binance_client.get_open_orders(config.SYMBOL) or []
             
             # 3. Analyser les positions et restaurer l'état
             for position in positions_info:
@@ -2,13 +2,29 @@
 Service de gestion de la stratégie ALL_OR_NOTHING
 Responsabilité unique : Gestion des positions avec Stop Loss et Take Profit fixes
 """
-from typing import Dict, Any, Optional, List, Callable
-from enum import Enum
+from typing import Dict, Any, Optional, List, Callable, Iterator, Union
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum, IntEnum
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
 import time
 
+import numpy as np
+
 import config
 from api.binance_client import BinanceAPIClient
-from core.logger import get_module_logger
+from api.market_data import MarketDataClient
+from core.logger import get_module_logger, trace
 from core.rsi_service import RSIService
 
 
@@ -18,6 +34,124 @@ class AllOrNothingSide(Enum):
     SHORT = "SHORT"
 
 
+class PosState(IntEnum):
+    """Phase d'un côté: transitions par compare-and-set sous verrou"""
+    IDLE = 0  # Aucune position: un signal peut ouvrir
+    CREATING = 1  # execute_signal en cours (entrée puis SL/TP)
+    ACTIVE = 2  # Position ouverte et protégée
+
+
+@dataclass(slots=True)
+class OrderRef:
+    """Référence d'un ordre SL/TP actif sur Binance"""
+    order_id: int
+    symbol: str
+    side: str
+    stop_price: float
+    quantity: float
+    price: Optional[float] = None  # Prix limite (TP uniquement)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> Optional["OrderRef"]:
+        """
+        Reconstruit un ordre depuis le fichier d'état JSON
+
+        Args:
+            data: Champs sauvegardés (accepte aussi l'ancien format orderId/stopPrice)
+
+        Returns:
+            OrderRef ou None si aucune donnée
+        """
+        if not data:
+            return None
+        return cls(
+            order_id=int(data.get("order_id", data.get("orderId"))),
+            symbol=data["symbol"],
+            side=data["side"],
+            stop_price=float(data.get("stop_price", data.get("stopPrice"))),
+            quantity=float(data["quantity"]),
+            price=data.get("price")
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class PositionState:
+    """État immuable d'un côté (position, SL, TP, référence trailing), remplacé d'un bloc"""
+    position: Optional[Dict[str, Any]] = None
+    sl: Optional[OrderRef] = None
+    tp: Optional[OrderRef] = None
+    trailing_ref: Optional[float] = None  # Prix de référence pour le trailing
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "PositionState":
+        """
+        Reconstruit l'état d'un côté depuis le fichier d'état JSON
+
+        Args:
+            data: Champs sauvegardés
+
+        Returns:
+            PositionState (vide si aucune donnée)
+        """
+        if not data:
+            return EMPTY_SIDE
+        return cls(
+            position=data.get("position"),
+            sl=OrderRef.from_dict(data.get("sl")),
+            tp=OrderRef.from_dict(data.get("tp")),
+            trailing_ref=data.get("trailing_ref")
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class _SideSpec:
+    """Paramètres propres à un côté, choisis une fois par signal au lieu de tester le côté partout"""
+    sign: int  # +1 LONG, -1 SHORT: sens favorable du prix
+    entry_side: str  # Ordre d'entrée
+    exit_side: str  # Ordres de sortie (SL, TP, sortie RSI)
+    rsi_exit_target: str  # Classification RSI requise pour la sortie dynamique
+
+
+EMPTY_SIDE = PositionState()
+_SIDES = ("LONG", "SHORT")
+_SIDE_SPECS = {
+    "LONG": _SideSpec(sign=1, entry_side="BUY", exit_side="SELL", rsi_exit_target="OVERBOUGHT"),
+    "SHORT": _SideSpec(sign=-1, entry_side="SELL", exit_side="BUY", rsi_exit_target="OVERSOLD"),
+}
+
+# Lignes du buffer circulaire des bougies (une ligne contiguë par champ)
+_HIGH, _LOW, _CLOSE, _VOLUME = range(4)
+
+# Statuts finaux d'un ordre remontés par le User Data Stream
+_TERMINAL_ORDER_STATUSES = frozenset({"FILLED", "CANCELED", "EXPIRED"})
+_ORDER_STATE_MAX_SIZE = 256  # Borne du cache des statuts d'ordres
+_CANCEL_CONFIRM_TIMEOUT = 2.0  # Attente max (s) de la confirmation d'annulation par le stream
+_RSI_CACHE_TTL = 1.0  # Durée (s) de partage d'un recalcul RSI complet entre LONG et SHORT
+_WORK_QUEUE_SIZE = 4  # Traitements de fermeture de bougie en attente (les plus anciens sont abandonnés)
+_PROTECTION_RETRY_DEADLINE = 5.0  # Durée max (s) des retries SL/TP: position non protégée pendant ce temps
+
+# Rejets Binance qu'une nouvelle tentative ne corrigera pas (signature/clé API,
+# marge insuffisante, positionSide invalide, stop déjà déclenché)
+_NON_RETRYABLE_ORDER_CODES = frozenset({-1022, -2014, -2015, -2019, -2021, -4061})
+
+
+class OrderRejectedError(RuntimeError):
+    """Ordre rejeté définitivement par Binance: inutile de réessayer"""
+
+
+def _to_api_str(value: float) -> str:
+    """
+    Représentation décimale d'un nombre pour l'API (sans notation scientifique)
+
+    Args:
+        value: Prix ou quantité déjà arrondi à la précision du symbole
+
+    Returns:
+        Chaîne positionnelle la plus courte (ex: 92.46, 0.00001)
+    """
+    return np.format_float_positional(value, trim='-')
+
+
 class AllOrNothingService:
     """Service de gestion des positions All Or Nothing avec SL/TP automatiques"""
 
@@ -27,36 +161,233 @@ class AllOrNothingService:
         self.binance_client = binance_client
         self.trading_service = trading_service  # Référence pour formatage dynamique
 
-        # Ordres actifs par côté
-        self.active_position_long: Optional[Dict[str, Any]] = None  # Position LONG
-        self.active_position_short: Optional[Dict[str, Any]] = None  # Position SHORT
-        self.active_sl_long: Optional[Dict[str, Any]] = None  # Stop Loss LONG
-        self.active_sl_short: Optional[Dict[str, Any]] = None  # Stop Loss SHORT
-        self.active_tp_long: Optional[Dict[str, Any]] = None  # Take Profit LONG
-        self.active_tp_short: Optional[Dict[str, Any]] = None  # Take Profit SHORT
+        # État par côté ("LONG"/"SHORT"): dict copié puis remplacé en une affectation
+        # pour que les lecteurs (WebSocket, statut) ne voient jamais d'état partiel
+        self._state: Dict[str, PositionState] = {side: EMPTY_SIDE for side in _SIDES}
+        self._state_lock = threading.RLock()  # Sérialise uniquement les écrivains
+
+        # Phase de chaque côté: CREATING appartient à execute_signal, IDLE/ACTIVE
+        # suivent la présence d'une position à chaque remplacement de l'état
+        self._phase: Dict[str, PosState] = {side: PosState.IDLE for side in _SIDES}
 
-        # Variables de tracking pour trailing stop
-        self.trailing_reference_long: Optional[float] = None  # Prix de référence LONG pour trailing
-        self.trailing_reference_short: Optional[float] = None  # Prix de référence SHORT pour trailing
+        # Index orderId -> (côté, "SL"/"TP") reconstruit à chaque remplacement de l'état
+        self._order_index: Dict[int, tuple] = {}
 
         # Configuration depuis config
         self.config = config.ALL_OR_NOTHING_CONFIG
 
+        # Fichier JSON de persistance des ordres SL/TP actifs
+        self._state_file_path = self.config.get("STATE_FILE", "data/all_or_nothing_state.json")
+
+        # Paramètres résolus une seule fois (voir _reload_config)
+        self._dynamic_exit_enabled: bool = False
+        self._cancel_fixed_orders: bool = True
+        self._trailing_enabled: bool = False
+        self._trailing_trigger_pct: float = 0.10
+        self._trailing_adjust_pct: float = 0.05
+        self._sl_lookback: int = 5
+        self._sl_offset: float = 0.001
+        self._tp_percent: float = 0.005
+        self._price_offset: float = 0.001
+        self._symbol: str = 'BTCUSDC'
+        self._timeframe: str = '5m'
+
+        # Historique des bougies pour calcul SL: buffer circulaire NumPy en colonnes
+        # séparées (high, low, close, volume) pour des réductions min/max contiguës
+        self._ring: Optional[np.ndarray] = None
+        self._ring_idx: int = 0  # Prochaine case à écrire
+        self._ring_filled: int = 0  # Nombre de bougies valides
+        self._last_close: Optional[float] = None  # Close de la dernière bougie (lecture sans accès au buffer)
+
+        # Minima croissants / maxima décroissants de la fenêtre: (n° de bougie, valeur)
+        # Le LOW min et le HIGH max sont toujours en tête, sans reparcourir la fenêtre
+        self._candle_seq: int = 0
+        self._sl_low_deque: deque = deque()
+        self._sl_high_deque: deque = deque()
+        self._reload_config()
+
         # Service RSI pour monitoring dynamique
         self.rsi_service = RSIService()
 
+        # Client de données de marché partagé avec le service RSI (préremplissage)
+        self._market_data: MarketDataClient = self.rsi_service.market_data_client
+        self._rsi_cache_lock = threading.Lock()
+        self._rsi_cache_t: float = 0.0
+        self._rsi_cache_val: Optional[Dict[str, Dict]] = None
+
+        # Statuts finaux de nos SL/TP reçus du User Data Stream, et annulations en attente
+        self._order_state: Dict[int, str] = {}
+        self._pending_cancels: Dict[int, threading.Event] = {}
+
+        # Pool dédié pour traiter LONG et SHORT en parallèle (appels REST bloquants)
+        self._side_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="AllOrNothingSide")
+
+        # Récupération du prix d'exécution en arrière-plan pendant le calcul du SL
+        self._fill_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="AllOrNothingFill")
+
+        # Sauvegarde de l'état hors des threads appelants (WebSocket compris), une seule
+        # écriture en attente à la fois: les mutations rapprochées sont regroupées
+        self._save_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="AllOrNothingSave")
+        self._save_pending = False
+
+        # Traitements de fermeture de bougie (REST) hors du thread WebSocket
+        self._work_queue: queue.Queue = queue.Queue(maxsize=_WORK_QUEUE_SIZE)
+        self._worker_thread = threading.Thread(target=self._candle_worker, name="AllOrNothingWorker", daemon=True)
+        self._worker_thread.start()
+
         # Cache des informations de formatage pour éviter appels répétés
-        self._symbol_precision_cache: Optional[Dict[str, Any]] = None
         self._cached_symbol: Optional[str] = None
+        self._tick_size: Optional[float] = None  # Pas de prix du symbole (ex: 0.005)
+        self._price_decimals: int = 0  # Décimales du pas (ex: 3)
 
-        # Historique des bougies pour calcul SL
-        self._candle_history: List[Dict[str, float]] = []
+        # Symboles internés une seule fois puis stockés tels quels sur les ordres
+        self._symbol_interned: Dict[str, str] = {}
 
         self.logger.debug("AllOrNothingService initialisé")
 
         # Recovery automatique de l'état existant au démarrage
         self._recover_existing_state()
 
+    @trace
+    def _reload_config(self) -> None:
+        """
+        Extrait une seule fois les paramètres de configuration utilisés à chaque bougie
+
+        Évite les chaînes de self.config.get(...) (et les dict {} par défaut)
+        sur le chemin chaud de fermeture de bougie.
+        """
+        dynamic_config = self.config.get("DYNAMIC_RSI_EXIT") or {}
+        trailing_config = self.config.get("TRAILING_STOP") or {}
+
+        self._dynamic_exit_enabled = bool(dynamic_config.get("ENABLED", False))
+        self._cancel_fixed_orders = bool(dynamic_config.get("CANCEL_FIXED_ORDERS", True))
+        self._trailing_enabled = bool(trailing_config.get("ENABLED", False))
+        self._trailing_trigger_pct = float(trailing_config.get("PRICE_TRIGGER_PERCENT", 0.10))  # X% = 10%
+        self._trailing_adjust_pct = float(trailing_config.get("SL_ADJUSTMENT_PERCENT", 0.05))  # Y% = 5%
+        self._sl_lookback = max(1, int(self.config.get("SL_LOOKBACK_CANDLES", 5)))
+        self._sl_offset = float(self.config.get("SL_OFFSET_PERCENT", 0.001))
+        self._tp_percent = float(self.config.get("TP_PERCENT", 0.005))  # 0.5% par défaut
+        self._price_offset = float(self.config.get("PRICE_OFFSET", 0.001))
+        self._symbol = getattr(config, 'SYMBOL', 'BTCUSDC')
+        self._timeframe = getattr(config, 'TIMEFRAME', '5m')
+
+        # Le buffer couvre exactement la fenêtre du SL: min/max sur tout le buffer
+        if self._ring is None or self._ring.shape[1] != self._sl_lookback:
+            self._ring = np.empty((4, self._sl_lookback), dtype=np.float64)
+            self._reset_candle_history()
+
+    def _reset_candle_history(self) -> None:
+        """Vide le buffer circulaire et les extrêmes de la fenêtre"""
+        self._ring_idx = 0
+        self._ring_filled = 0
+        self._last_close = None
+        self._sl_low_deque.clear()
+        self._sl_high_deque.clear()
+
+    @contextmanager
+    def _state_update(self, persist: bool = True) -> Iterator[None]:
+        """
+        Encadre le remplacement de self._state (écrivains sérialisés)
+
+        Args:
+            persist: Programmer la sauvegarde de l'état sur disque après la mutation
+        """
+        with self._state_lock:
+            try:
+                yield
+            finally:
+                for side, side_state in self._state.items():
+                    if self._phase[side] is not PosState.CREATING:
+                        self._phase[side] = PosState.ACTIVE if side_state.position else PosState.IDLE
+                self._order_index = {
+                    order.order_id: (side, kind)
+                    for side, side_state in self._state.items()
+                    for kind, order in (("SL", side_state.sl), ("TP", side_state.tp))
+                    if order is not None
+                }
+                if persist:
+                    self._request_save()
+
+    def _transition(self, side: str, expected: PosState, new: PosState) -> bool:
+        """
+        Change la phase d'un côté seulement si elle vaut encore expected (compare-and-set)
+
+        Args:
+            side: "LONG" ou "SHORT"
+            expected: Phase attendue
+            new: Nouvelle phase
+
+        Returns:
+            True si la transition a eu lieu
+        """
+        with self._state_lock:
+            if self._phase[side] is not expected:
+                return False
+            self._phase[side] = new
+            return True
+
+    def _set_side(self, side: str, **changes: Any) -> None:
+        """
+        Modifie l'état d'un côté (copie puis échange atomique du dict)
+
+        Args:
+            side: "LONG" ou "SHORT"
+            **changes: Champs de PositionState à remplacer
+        """
+        with self._state_update():
+            self._state = {**self._state, side: replace(self._state[side], **changes)}
+
+    def _request_save(self) -> None:
+        """Programme une sauvegarde de l'état, sauf si une sauvegarde est déjà en attente"""
+        if self._save_pending:
+            return
+        self._save_pending = True
+        try:
+            self._save_executor.submit(self._flush_state)
+        except RuntimeError:
+            # Pool arrêté (après cleanup): sauvegarde directe
+            self._flush_state()
+
+    def _flush_state(self) -> None:
+        """Écrit l'état courant; une mutation postérieure programme une nouvelle sauvegarde"""
+        self._save_pending = False
+        self._save_state()
+
+    def _save_state(self) -> None:
+        """Sauvegarde les ordres actifs dans le fichier JSON (écriture atomique)"""
+        try:
+            data: Dict[str, Any] = {side: asdict(side_state) for side, side_state in self._state.items()}
+            data["timestamp"] = datetime.now().isoformat()
+
+            directory = os.path.dirname(self._state_file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            # Écrire dans un fichier temporaire puis renommer: jamais de fichier partiel
+            tmp_path = f"{self._state_file_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self._state_file_path)
+
+        except Exception as e:
+            self.logger.error("Erreur sauvegarde état AllOrNothing: %s", e, exc_info=True)
+
+    def _load_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Charge les ordres actifs depuis le fichier JSON
+
+        Returns:
+            Données sauvegardées ou None si aucun fichier
+        """
+        try:
+            if os.path.exists(self._state_file_path):
+                with open(self._state_file_path, 'r') as f:
+                    return json.load(f)
+            return None
+        except Exception as e:
+            self.logger.error("Erreur chargement état AllOrNothing: %s", e, exc_info=True)
+            return None
+
     def set_trading_service_reference(self, trading_service) -> None:
         """
         Définit la référence au TradingService après initialisation
@@ -67,53 +398,104 @@ class AllOrNothingService:
         self.trading_service = trading_service
         self.logger.debug("Référence TradingService définie pour AllOrNothingService")
 
+        # Relire la configuration (peut avoir été modifiée depuis l'initialisation)
+        self._reload_config()
+
         # Précharger le cache de précision pour le symbole actuel
         self._cache_symbol_precision()
 
         # Préremplir l'historique des bougies si possible
         self._prefill_candle_history()
 
-    def update_candle_history(self, candle_data: Dict[str, float]) -> None:
+        # Initialiser le RSI incrémental (mis à jour ensuite à chaque bougie fermée)
+        if self._dynamic_exit_enabled:
+            self.rsi_service.seed_incremental_rsi(self._symbol, self._timeframe)
+
+    def update_candle_history(self, candle_data: Union[Dict[str, float], tuple, np.ndarray]) -> None:
         """
-        Met à jour l'historique des bougies pour calcul des SL
+        Met à jour l'historique des bougies pour calcul des SL et le RSI incrémental
 
         Args:
-            candle_data: Données de la bougie fermée (high, low, close, volume)
+            candle_data: Bougie fermée, tuple/ndarray (open, high, low, close, volume)
+                ou dict avec les mêmes clés
         """
-        self.logger.debug(f"update_candle_history called with candle: {candle_data}")
+        if isinstance(candle_data, (tuple, np.ndarray)):
+            # Chemin rapide: aucune table de hachage
+            open_price, high, low, close, volume = candle_data
+        else:
+            open_price = candle_data.get("open")
+            high, low, close, volume = candle_data["high"], candle_data["low"], candle_data["close"], candle_data["volume"]
 
-        # Ajouter la bougie à l'historique
-        self._candle_history.append(candle_data)
+        self._push_candle(high, low, close, volume)
 
-        # Garder seulement les N dernières bougies selon la configuration
-        max_candles = self.config.get("SL_LOOKBACK_CANDLES", 5) + 1  # +1 pour sécurité
-        if len(self._candle_history) > max_candles:
-            self._candle_history = self._candle_history[-max_candles:]
+        # RSI mis à jour en O(1) au lieu d'un recalcul complet à la vérification de sortie
+        if self._dynamic_exit_enabled:
+            self.rsi_service.update_incremental_rsi_values(open_price, high, low, close)
+
+        self.logger.debug("Historique bougies mis à jour: %s bougies", self._ring_filled)
+
+    def _push_candle(self, high: float, low: float, close: float, volume: float) -> None:
+        """
+        Écrit une bougie dans le buffer circulaire (écrase la plus ancienne)
 
-        self.logger.debug(f"Historique bougies mis à jour: {len(self._candle_history)} bougies")
+        Args:
+            high: Plus haut
+            low: Plus bas
+            close: Clôture
+            volume: Volume
+        """
+        capacity = self._ring.shape[1]
+        self._ring[:, self._ring_idx] = (high, low, close, volume)
+        self._ring_idx = (self._ring_idx + 1) % capacity
+        if self._ring_filled < capacity:
+            self._ring_filled += 1
+        self._last_close = close
+        self._push_extrema(high, low)
+
+    def _push_extrema(self, high: float, low: float) -> None:
+        """
+        Met à jour les deques monotones de la fenêtre SL (O(1) amorti)
 
+        Args:
+            high: Plus haut de la nouvelle bougie
+            low: Plus bas de la nouvelle bougie
+        """
+        seq = self._candle_seq
+        self._candle_seq = seq + 1
+        oldest_kept = seq - self._ring.shape[1] + 1
+
+        lows = self._sl_low_deque
+        while lows and lows[-1][1] >= low:
+            lows.pop()
+        lows.append((seq, low))
+        while lows[0][0] < oldest_kept:
+            lows.popleft()
+
+        highs = self._sl_high_deque
+        while highs and highs[-1][1] <= high:
+            highs.pop()
+        highs.append((seq, high))
+        while highs[0][0] < oldest_kept:
+            highs.popleft()
+
+    @trace
     def _prefill_candle_history(self) -> None:
         """
         Prérempli l'historique des bougies au démarrage pour permettre le calcul immédiat des SL
         """
-        self.logger.debug("_prefill_candle_history called")
-
         if not self.trading_service:
             self.logger.warning("TradingService non disponible - impossible de préremplir l'historique")
             return
 
         try:
-            # Obtenir le symbole depuis la config globale
-            symbol = getattr(config, 'SYMBOL', 'BTCUSDC')
-            timeframe = getattr(config, 'TIMEFRAME', '5m')
-            lookback_candles = self.config.get("SL_LOOKBACK_CANDLES", 5)
+            symbol = self._symbol
+            timeframe = self._timeframe
+            lookback_candles = self._sl_lookback
 
-            self.logger.info(f"Préremplissage historique bougies: {lookback_candles} dernières bougies {symbol} {timeframe}")
+            self.logger.info("Préremplissage historique bougies: %s dernières bougies %s %s", lookback_candles, symbol, timeframe)
 
             # Récupérer les données historiques via market_data
-            from api.market_data import MarketDataClient
-            market_data = MarketDataClient()
-            historical_data = market_data.get_historical_data(
+            historical_data = self._market_data.get_historical_data(
                 symbol=symbol,
                 interval=timeframe,
                 limit=lookback_candles + 1  # +1 pour sécurité
@@ -123,60 +505,83 @@ class AllOrNothingService:
                 self.logger.warning("Aucune donnée historique récupérée pour préremplissage")
                 return
 
-            # Convertir le DataFrame en format attendu par update_candle_history
-            # Exclure la dernière ligne (bougie en cours)
-            for _, row in historical_data.iloc[:-1].iterrows():
-                candle_data = {
-                    "high": float(row['high']),
-                    "low": float(row['low']),
-                    "close": float(row['close']),
-                    "volume": float(row['volume'])
-                }
-                self._candle_history.append(candle_data)
-
-            # Garder seulement le nombre requis
-            if len(self._candle_history) > lookback_candles:
-                self._candle_history = self._candle_history[-lookback_candles:]
-
-            self.logger.info(f"✅ Historique prérempli: {len(self._candle_history)} bougies disponibles")
+            # Exclure la dernière ligne (bougie en cours) et ne convertir que les
+            # lignes gardées par le buffer: une seule copie, sans iterrows()
+            capacity = self._ring.shape[1]
+            candles = historical_data[['high', 'low', 'close', 'volume']].iloc[-(capacity + 1):-1].to_numpy(dtype=np.float64)
+
+            # Repartir d'un buffer vide pour ne jamais dupliquer des bougies
+            self._reset_candle_history()
+            count = len(candles)
+            if count:
+                self._ring[:, :count] = candles.T
+            self._ring_idx = count % capacity
+            self._ring_filled = count
+            if count:
+                self._last_close = float(candles[-1, _CLOSE])
+            for high, low in candles[:, :2].tolist():
+                self._push_extrema(high, low)
+
+            self.logger.info("✅ Historique prérempli: %s bougies disponibles", self._ring_filled)
 
         except Exception as e:
-            self.logger.error(f"Erreur préremplissage historique bougies: {e}", exc_info=True)
+            self.logger.error("Erreur préremplissage historique bougies: %s", e, exc_info=True)
 
-    def _retry_operation(self, operation: Callable[[], bool], operation_name: str, max_attempts: int = 5) -> bool:
+    def _retry_operation(self, operation: Callable[[], bool], operation_name: str, max_attempts: int = 5,
+                         fast_first_retry: bool = True, deadline_s: Optional[float] = None) -> bool:
         """
-        Effectue une opération avec retry automatique
+        Effectue une opération avec retry automatique (backoff exponentiel + jitter)
 
         Args:
             operation: Fonction à exécuter qui retourne bool
             operation_name: Nom de l'opération pour les logs
             max_attempts: Nombre maximum de tentatives
+            fast_first_retry: Premier délai à 250ms (sinon 2s) - la plupart des erreurs Binance sont transitoires
+            deadline_s: Durée totale max (s) - aucune attente ne la dépasse (None = sans limite)
 
         Returns:
-            True si l'opération réussit, False après max_attempts échecs
+            True si l'opération réussit, False après max_attempts échecs, au-delà
+            du délai total ou sur un rejet définitif (OrderRejectedError)
         """
+        start = time.monotonic()
+
         for attempt in range(1, max_attempts + 1):
             try:
-                self.logger.info(f"Tentative {attempt}/{max_attempts} - {operation_name}")
+                self.logger.info("Tentative %s/%s - %s", attempt, max_attempts, operation_name)
 
                 if operation():
-                    self.logger.info(f"✅ {operation_name} réussi à la tentative {attempt}")
+                    self.logger.info("✅ %s réussi à la tentative %s", operation_name, attempt)
                     return True
                 else:
-                    self.logger.warning(f"❌ Échec tentative {attempt}/{max_attempts} - {operation_name}")
+                    self.logger.warning("❌ Échec tentative %s/%s - %s", attempt, max_attempts, operation_name)
+
+            except OrderRejectedError as e:
+                self.logger.error("🚫 %s rejeté définitivement: %s - pas de nouvelle tentative", operation_name, e)
+                return False
 
             except Exception as e:
-                self.logger.error(f"❌ Erreur tentative {attempt}/{max_attempts} - {operation_name}: {e}")
+                self.logger.error("❌ Erreur tentative %s/%s - %s: %s", attempt, max_attempts, operation_name, e)
 
-            # Délai entre les tentatives (sauf dernière)
+            # Délai entre les tentatives (sauf dernière): 0.25s, 0.5s, 1s, 2s... plafonné à 8s,
+            # avec jitter ±50% pour ne pas resynchroniser les retries
             if attempt < max_attempts:
-                delay = 2 * attempt  # Délai croissant: 2s, 4s, 6s, 8s
-                self.logger.info(f"⏳ Attente {delay}s avant prochaine tentative...")
+                base_delay = 0.25 if fast_first_retry else 2.0
+                delay = min(8.0, base_delay * (2 ** (attempt - 1))) * (0.5 + random.random())
+
+                if deadline_s is not None:
+                    remaining = deadline_s - (time.monotonic() - start)
+                    if remaining <= 0:
+                        self.logger.error("⌛ Délai de %.1fs dépassé - %s", deadline_s, operation_name)
+                        break
+                    delay = min(delay, remaining)
+
+                self.logger.info("⏳ Attente %.2fs avant prochaine tentative...", delay)
                 time.sleep(delay)
 
-        self.logger.error(f"🚫 ÉCHEC DÉFINITIF {operation_name} après {max_attempts} tentatives")
+        self.logger.error("🚫 ÉCHEC DÉFINITIF %s après %s tentatives", operation_name, attempt)
         return False
 
+    @trace
     def _check_dynamic_rsi_exit_condition(self, position_side: str) -> bool:
         """
         Vérifie si les conditions RSI pour sortie dynamique sont remplies
@@ -187,77 +592,74 @@ class AllOrNothingService:
         Returns:
             True si toutes les conditions RSI sont remplies pour sortie
         """
-        self.logger.debug(f"_check_dynamic_rsi_exit_condition called for {position_side}")
-
         try:
             # Vérifier si le TP dynamique RSI est activé
-            dynamic_config = self.config.get("DYNAMIC_RSI_EXIT", {})
-            if not dynamic_config.get("ENABLED", False):
-                self.logger.debug(f"Dynamic RSI Exit DISABLED in config")
+            if not self._dynamic_exit_enabled:
+                self.logger.debug("Dynamic RSI Exit DISABLED in config")
                 return False
 
-            # Calculer les RSI actuels
-            symbol = config.SYMBOL
-            timeframe = config.TIMEFRAME
-
-            self.logger.info(f"🔍 DEBUGGING RSI EXIT: Checking condition for {position_side} - Symbol: {symbol}, Timeframe: {timeframe}")
-
-            rsi_data = self.rsi_service.calculate_rsi_for_symbol(symbol, timeframe)
+            # RSI incrémental (mis à jour à la fermeture de bougie), sinon recalcul complet
+            rsi_data = self.rsi_service.get_incremental_rsi()
+            if rsi_data is None:
+                rsi_data = self._get_cached_rsi()
 
             if not rsi_data:
                 self.logger.warning("❌ Impossible de récupérer les données RSI pour vérification sortie")
                 return False
 
-            self.logger.info(f"📊 RSI Data retrieved: {list(rsi_data.keys()) if rsi_data else 'None'}")
-
-            # Définir les conditions selon le côté de la position
-            if position_side == "LONG":
-                # Position LONG: sortir quand TOUS les RSI sont OVERBOUGHT
-                required_classifications = ["OVERBOUGHT"]
-                condition_description = "TOUS RSI OVERBOUGHT pour sortie LONG"
-            else:  # SHORT
-                # Position SHORT: sortir quand TOUS les RSI sont OVERSOLD
-                required_classifications = ["OVERSOLD"]
-                condition_description = "TOUS RSI OVERSOLD pour sortie SHORT"
-
-            self.logger.info(f"🎯 Required condition for {position_side}: {required_classifications[0]}")
+            # Condition selon le côté: LONG sort quand TOUS les RSI sont OVERBOUGHT,
+            # SHORT quand TOUS les RSI sont OVERSOLD
+            target = _SIDE_SPECS[position_side].rsi_exit_target
+            condition_description = f"TOUS RSI {target} pour sortie {position_side}"
 
-            # Vérifier que TOUS les RSI respectent la condition
-            all_conditions_met = True
-            rsi_status = []
-            debug_details = []
-
-            for rsi_key, rsi_info in rsi_data.items():
-                classification = rsi_info.get("classification", "N/A")
-                value = rsi_info.get("value")
-
-                rsi_status.append(f"{rsi_key}: {value:.2f} ({classification})")
-                debug_details.append(f"  • {rsi_key}: {value:.2f} → {classification} (Required: {required_classifications[0]})")
-
-                if classification.upper() not in required_classifications:
-                    all_conditions_met = False
-                    self.logger.info(f"❌ {rsi_key} condition NOT met: {classification} (need {required_classifications[0]})")
-                else:
-                    self.logger.info(f"✅ {rsi_key} condition MET: {classification}")
-
-            self.logger.info(f"📈 RSI Status: {' | '.join(rsi_status)}")
-            self.logger.info(f"🔍 DEBUG Details for {position_side}:\n" + "\n".join(debug_details))
+            # Vérifier que TOUS les RSI respectent la condition (arrêt au premier échec)
+            all_conditions_met = all(
+                rsi_info.get("classification", "").upper() == target for rsi_info in rsi_data.values()
+            )
 
-            self.logger.info(f"🧮 Final condition check: all_conditions_met = {all_conditions_met}")
+            # Détails construits uniquement si le niveau INFO est actif
+            if self.logger.isEnabledFor(logging.INFO):
+                rsi_status = " | ".join(
+                    f"{rsi_key}: {rsi_info.get('value')} ({rsi_info.get('classification', 'N/A')})"
+                    for rsi_key, rsi_info in rsi_data.items()
+                )
+                self.logger.info("📈 RSI %s (requis: %s): %s", position_side, target, rsi_status)
 
             if all_conditions_met:
-                self.logger.info(f"🎯 ✅ CONDITION SORTIE REMPLIE: {condition_description}")
-                self.logger.info(f"🚀 EXECUTING DYNAMIC RSI EXIT for {position_side}")
+                self.logger.info("🎯 ✅ CONDITION SORTIE REMPLIE: %s", condition_description)
                 return True
             else:
-                self.logger.info(f"⏳ Condition sortie non remplie: {condition_description}")
-                self.logger.info(f"📊 Not all RSI periods are {required_classifications[0]} - waiting...")
+                self.logger.info("⏳ Condition sortie non remplie: %s", condition_description)
                 return False
 
         except Exception as e:
-            self.logger.error(f"Erreur vérification condition sortie RSI: {e}", exc_info=True)
+            self.logger.error("Erreur vérification condition sortie RSI: %s", e, exc_info=True)
             return False
 
+    def _get_cached_rsi(self) -> Optional[Dict[str, Dict]]:
+        """
+        Recalcule les RSI, en partageant le résultat pendant _RSI_CACHE_TTL
+
+        LONG et SHORT vérifient la sortie à la même fermeture de bougie: un
+        seul appel réseau pour les deux côtés.
+
+        Returns:
+            RSI classifiés ou None si indisponibles
+        """
+        with self._rsi_cache_lock:
+            now = time.monotonic()
+            if self._rsi_cache_val is not None and now - self._rsi_cache_t < _RSI_CACHE_TTL:
+                self.logger.debug("Cache RSI: hit (%.3fs)", now - self._rsi_cache_t)
+                return self._rsi_cache_val
+
+            self.logger.debug("Cache RSI: miss")
+            rsi_data = self.rsi_service.calculate_rsi_for_symbol(self._symbol, self._timeframe)
+            if rsi_data:
+                self._rsi_cache_t = time.monotonic()
+                self._rsi_cache_val = rsi_data
+            return rsi_data
+
+    @trace
     def _execute_dynamic_rsi_exit(self, position_side: str, symbol: str) -> bool:
         """
         Exécute la sortie dynamique basée sur RSI
@@ -269,76 +671,62 @@ class AllOrNothingService:
         Returns:
             True si sortie réussie, False sinon
         """
-        self.logger.debug(f"_execute_dynamic_rsi_exit called for {position_side}")
-
         try:
             # Récupérer les informations de la position active
-            if position_side == "LONG":
-                position_data = self.active_position_long
-                sl_data = self.active_sl_long
-                tp_data = self.active_tp_long
-            else:  # SHORT
-                position_data = self.active_position_short
-                sl_data = self.active_sl_short
-                tp_data = self.active_tp_short
+            side_state = self._state[position_side]
+            position_data, sl_data, tp_data = side_state.position, side_state.sl, side_state.tp
 
             if not position_data:
-                self.logger.warning(f"Aucune position {position_side} active pour sortie RSI")
+                self.logger.warning("Aucune position %s active pour sortie RSI", position_side)
                 return False
 
             quantity = position_data.get("quantity")
             if not quantity:
-                self.logger.error(f"Quantité position {position_side} non disponible")
+                self.logger.error("Quantité position %s non disponible", position_side)
                 return False
 
-            self.logger.info(f"🚀 SORTIE RSI DYNAMIQUE {position_side}: {quantity} {symbol}")
+            self.logger.info("🚀 SORTIE RSI DYNAMIQUE %s: %s %s", position_side, quantity, symbol)
 
-            # Préparer l'ordre de sortie MARKET
-            if position_side == "LONG":
-                # Position LONG: ordre SELL pour sortir
-                exit_side = "SELL"
-                exit_position_side = "LONG"
-            else:  # SHORT
-                # Position SHORT: ordre BUY pour sortir
-                exit_side = "BUY"
-                exit_position_side = "SHORT"
+            # Préparer l'ordre de sortie MARKET (LONG: SELL, SHORT: BUY)
+            exit_side = _SIDE_SPECS[position_side].exit_side
+            exit_position_side = position_side
 
             # Exécuter l'ordre de sortie MARKET
             exit_order = self.binance_client.place_order(
                 symbol=symbol,
                 side=exit_side,
-                quantity=str(quantity),
+                quantity=_to_api_str(quantity),
                 order_type="MARKET",
                 position_side=exit_position_side
             )
 
             if not exit_order:
-                self.logger.error(f"Échec ordre sortie RSI {position_side}")
+                self.logger.error("Échec ordre sortie RSI %s", position_side)
                 return False
 
-            self.logger.info(f"✅ SORTIE RSI {position_side} exécutée: {exit_order.get('orderId')}")
+            self.logger.info("✅ SORTIE RSI %s exécutée: %s", position_side, exit_order.get('orderId'))
 
             # Annuler les ordres SL/TP correspondants si configuré
-            dynamic_config = self.config.get("DYNAMIC_RSI_EXIT", {})
-            if dynamic_config.get("CANCEL_FIXED_ORDERS", True):
+            if self._cancel_fixed_orders:
                 if sl_data:
                     self._cancel_order(sl_data, f"SL {position_side}")
                 if tp_data:
                     self._cancel_order(tp_data, f"TP {position_side}")
-                    self.logger.info(f"📊 TP fixe {position_side} annulé après sortie RSI dynamique")
+                    self.logger.info("📊 TP fixe %s annulé après sortie RSI dynamique", position_side)
                 else:
-                    self.logger.info(f"🎯 Aucun TP fixe à annuler pour {position_side} (mode dynamique RSI)")
+                    self.logger.info("🎯 Aucun TP fixe à annuler pour %s (mode dynamique RSI)", position_side)
 
             # Reset de la position
             self._reset_position_side(position_side)
 
-            self.logger.info(f"🎯 SORTIE RSI DYNAMIQUE {position_side} TERMINÉE")
+            self.logger.info("🎯 SORTIE RSI DYNAMIQUE %s TERMINÉE", position_side)
             return True
 
         except Exception as e:
-            self.logger.error(f"Erreur lors de la sortie RSI {position_side}: {e}", exc_info=True)
+            self.logger.error("Erreur lors de la sortie RSI %s: %s", position_side, e, exc_info=True)
             return False
 
+    @trace
     def _reset_position_side(self, position_side: str) -> None:
         """
         Reset d'un côté de position (LONG ou SHORT)
@@ -346,20 +734,9 @@ class AllOrNothingService:
         Args:
             position_side: "LONG" ou "SHORT" à reset
         """
-        self.logger.debug(f"_reset_position_side called for {position_side}")
-
-        if position_side == "LONG":
-            self.active_position_long = None
-            self.active_sl_long = None
-            self.active_tp_long = None
-            self.trailing_reference_long = None  # Reset référence trailing
-            self.logger.info("🔄 Position LONG resetée (incluant trailing)")
-        else:  # SHORT
-            self.active_position_short = None
-            self.active_sl_short = None
-            self.active_tp_short = None
-            self.trailing_reference_short = None  # Reset référence trailing
-            self.logger.info("🔄 Position SHORT resetée (incluant trailing)")
+        with self._state_update():
+            self._state = {**self._state, position_side: EMPTY_SIDE}  # Incluant la référence trailing
+        self.logger.info("🔄 Position %s resetée (incluant trailing)", position_side)
 
     def _check_trailing_stop_condition(self, position_side: str, current_price: float) -> bool:
         """
@@ -372,53 +749,39 @@ class AllOrNothingService:
         Returns:
             True si trailing stop doit être activé
         """
-        self.logger.debug(f"_check_trailing_stop_condition called for {position_side}, price={current_price}")
-
         try:
             # Vérifier si trailing stop est activé
-            trailing_config = self.config.get("TRAILING_STOP", {})
-            if not trailing_config.get("ENABLED", False):
+            if not self._trailing_enabled:
                 return False
 
             # Récupérer les paramètres
-            trigger_percent = trailing_config.get("PRICE_TRIGGER_PERCENT", 0.10)  # X% = 10%
-
-            # Récupérer la référence de trailing selon le côté
-            if position_side == "LONG":
-                reference_price = self.trailing_reference_long
-                if reference_price is None:
-                    self.logger.warning("Référence trailing LONG non définie")
-                    return False
-
-                # LONG: vérifier si prix a augmenté de X% depuis référence
-                price_change_percent = (current_price - reference_price) / reference_price
-                condition_met = price_change_percent >= trigger_percent
+            trigger_percent = self._trailing_trigger_pct
 
-                self.logger.debug(f"LONG Trailing: Référence={reference_price}, Actuel={current_price}, "
-                               f"Change={price_change_percent*100:.2f}%, Trigger={trigger_percent*100}%")
-
-            else:  # SHORT
-                reference_price = self.trailing_reference_short
-                if reference_price is None:
-                    self.logger.warning("Référence trailing SHORT non définie")
-                    return False
+            # Récupérer la référence de trailing du côté
+            reference_price = self._state[position_side].trailing_ref
+            if reference_price is None:
+                self.logger.warning("Référence trailing %s non définie", position_side)
+                return False
 
-                # SHORT: vérifier si prix a diminué de X% depuis référence
-                price_change_percent = (reference_price - current_price) / reference_price
-                condition_met = price_change_percent >= trigger_percent
+            # Variation favorable depuis la référence (LONG: hausse, SHORT: baisse)
+            sign = _SIDE_SPECS[position_side].sign
+            price_change_percent = sign * (current_price - reference_price) / reference_price
+            condition_met = price_change_percent >= trigger_percent
 
-                self.logger.debug(f"SHORT Trailing: Référence={reference_price}, Actuel={current_price}, "
-                               f"Change={price_change_percent*100:.2f}%, Trigger={trigger_percent*100}%")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("%s Trailing: Référence=%s, Actuel=%s, Change=%.2f%%, Trigger=%s%%", position_side,
+                                  reference_price, current_price, price_change_percent * 100, trigger_percent * 100)
 
             if condition_met:
-                self.logger.info(f"🎯 CONDITION TRAILING {position_side} REMPLIE: {price_change_percent*100:.2f}% ≥ {trigger_percent*100}%")
+                self.logger.info("🎯 CONDITION TRAILING %s REMPLIE: %.2f%% ≥ %s%%", position_side, price_change_percent*100, trigger_percent*100)
 
             return condition_met
 
         except Exception as e:
-            self.logger.error(f"Erreur vérification condition trailing {position_side}: {e}", exc_info=True)
+            self.logger.error("Erreur vérification condition trailing %s: %s", position_side, e, exc_info=True)
             return False
 
+    @trace
     def _execute_trailing_stop_adjustment(self, position_side: str, current_price: float) -> bool:
         """
         Exécute l'ajustement du SL selon la logique trailing stop
@@ -430,46 +793,24 @@ class AllOrNothingService:
         Returns:
             True si ajustement réussi, False sinon
         """
-        self.logger.debug(f"_execute_trailing_stop_adjustment called for {position_side}, price={current_price}")
-
         try:
             # Récupérer les paramètres
-            trailing_config = self.config.get("TRAILING_STOP", {})
-            adjustment_percent = trailing_config.get("SL_ADJUSTMENT_PERCENT", 0.05)  # Y% = 5%
-            symbol = config.SYMBOL
-
-            # Récupérer le SL actuel selon le côté
-            if position_side == "LONG":
-                current_sl_data = self.active_sl_long
-                if not current_sl_data:
-                    self.logger.error("Aucun SL LONG actif pour ajustement trailing")
-                    return False
-
-                current_sl_price = current_sl_data.get("stopPrice")
-                if not current_sl_price:
-                    self.logger.error("Prix SL LONG actuel non disponible")
-                    return False
-
-                # LONG: monter le SL de Y%
-                new_sl_price = current_sl_price * (1 + adjustment_percent)
-
-                self.logger.info(f"📈 TRAILING LONG: SL {current_sl_price} → {new_sl_price} (+{adjustment_percent*100}%)")
+            adjustment_percent = self._trailing_adjust_pct
+            symbol = self._symbol
 
-            else:  # SHORT
-                current_sl_data = self.active_sl_short
-                if not current_sl_data:
-                    self.logger.error("Aucun SL SHORT actif pour ajustement trailing")
-                    return False
-
-                current_sl_price = current_sl_data.get("stopPrice")
-                if not current_sl_price:
-                    self.logger.error("Prix SL SHORT actuel non disponible")
-                    return False
+            # Récupérer le SL actuel du côté
+            current_sl_data = self._state[position_side].sl
+            if not current_sl_data:
+                self.logger.error("Aucun SL %s actif pour ajustement trailing", position_side)
+                return False
 
-                # SHORT: descendre le SL de Y%
-                new_sl_price = current_sl_price * (1 - adjustment_percent)
+            current_sl_price = current_sl_data.stop_price
 
-                self.logger.info(f"📉 TRAILING SHORT: SL {current_sl_price} → {new_sl_price} (-{adjustment_percent*100}%)")
+            # LONG: monter le SL de Y%, SHORT: descendre le SL de Y%
+            sign = _SIDE_SPECS[position_side].sign
+            new_sl_price = current_sl_price * (1 + sign * adjustment_percent)
+            self.logger.info("%s TRAILING %s: SL %s → %s (%+.2f%%)", "📈" if sign > 0 else "📉", position_side,
+                             current_sl_price, new_sl_price, sign * adjustment_percent * 100)
 
             # Formater le nouveau prix selon la précision du symbole
             formatted_new_sl = self._format_price_with_precision(new_sl_price, symbol)
@@ -480,136 +821,206 @@ class AllOrNothingService:
             # Mettre à jour l'ordre SL sur Binance
             update_success = self._update_stop_loss_order(position_side, formatted_new_sl, current_sl_data)
             if not update_success:
-                self.logger.error(f"Échec mise à jour SL {position_side}")
+                self.logger.error("Échec mise à jour SL %s", position_side)
                 return False
 
             # Mettre à jour la référence de trailing
-            if position_side == "LONG":
-                self.trailing_reference_long = current_price
-            else:
-                self.trailing_reference_short = current_price
+            self._set_side(position_side, trailing_ref=current_price)
 
-            self.logger.info(f"✅ TRAILING {position_side} RÉUSSI: SL mis à jour, nouvelle référence={current_price}")
+            self.logger.info("✅ TRAILING %s RÉUSSI: SL mis à jour, nouvelle référence=%s", position_side, current_price)
             return True
 
         except Exception as e:
-            self.logger.error(f"Erreur ajustement trailing {position_side}: {e}", exc_info=True)
+            self.logger.error("Erreur ajustement trailing %s: %s", position_side, e, exc_info=True)
             return False
 
-    def _update_stop_loss_order(self, position_side: str, new_sl_price: float, current_sl_data: Dict[str, Any]) -> bool:
+    @trace
+    def _update_stop_loss_order(self, position_side: str, new_sl_price: float, current_sl: OrderRef) -> bool:
         """
         Met à jour un ordre Stop Loss existant
 
         Args:
             position_side: "LONG" ou "SHORT"
             new_sl_price: Nouveau prix du SL
-            current_sl_data: Données du SL actuel
+            current_sl: SL actuel
 
         Returns:
             True si mise à jour réussie
         """
-        self.logger.debug(f"_update_stop_loss_order called for {position_side}, new_price={new_sl_price}")
-
         try:
-            symbol = current_sl_data.get("symbol")
-            order_id = current_sl_data.get("orderId")
-            quantity = current_sl_data.get("quantity")
-            side = current_sl_data.get("side")
+            symbol = current_sl.symbol
+            side = current_sl.side
+            quantity = current_sl.quantity
 
-            if not all([symbol, order_id, quantity, side]):
-                self.logger.error(f"Données SL incomplètes pour mise à jour {position_side}")
+            old_order_id = current_sl.order_id
+            if self._order_state.get(old_order_id) == "FILLED":
+                self.logger.warning("SL %s %s déjà exécuté - pas de remplacement", position_side, old_order_id)
                 return False
 
-            # Validation des types avant utilisation
-            if not isinstance(symbol, str):
-                self.logger.error(f"Symbol invalide: {symbol}")
-                return False
-
-            if not isinstance(side, str):
-                self.logger.error(f"Side invalide: {side}")
-                return False
+            event = threading.Event()
+            self._pending_cancels[old_order_id] = event
+            try:
+                # Remplacement en un seul appel: nouveau SL d'abord, puis annulation de l'ancien
+                result: Dict[str, Any] = {}
+
+                def replace_operation() -> bool:
+                    response = self.binance_client.replace_stop_market_order(
+                        symbol=symbol,
+                        cancel_order_id=old_order_id,
+                        side=side,
+                        quantity=_to_api_str(quantity),
+                        stop_price=_to_api_str(new_sl_price),
+                        position_side=position_side
+                    )
+                    if response:
+                        result.update(response)
+                    return bool(response)
+
+                if not self._retry_operation(replace_operation, f"Remplacement SL {position_side}", max_attempts=3):
+                    # L'ancien SL reste la protection active
+                    self.logger.error("❌ Échec création nouveau SL %s", position_side)
+                    return False
 
-            if order_id is None:
-                self.logger.error("Order ID manquant")
-                return False
+                new_sl_order = result["newOrderResponse"]
 
-            # Méthode 1: Essayer de modifier l'ordre existant
-            try:
-                # Annuler l'ancien SL
-                cancel_success = self.binance_client.cancel_order(symbol, int(order_id))
-                if cancel_success:
-                    self.logger.info(f"🚫 Ancien SL {position_side} annulé: {order_id}")
+                if result.get("cancelResult") == "SUCCESS":
+                    self.logger.info("🚫 Ancien SL %s annulé: %s", position_side, old_order_id)
                 else:
-                    self.logger.warning(f"❌ Échec annulation ancien SL {position_side}: {order_id}")
-
-            except Exception as cancel_error:
-                self.logger.warning(f"Erreur annulation SL: {cancel_error}")
+                    status = self._wait_for_order_status(old_order_id, event)
+                    if status == "FILLED":
+                        # L'ancien SL a fermé la position: le nouveau est orphelin
+                        self.logger.warning("SL %s %s exécuté pendant le remplacement - nouveau SL annulé", position_side, old_order_id)
+                        orphan_sl = OrderRef(int(new_sl_order["orderId"]), symbol, side, new_sl_price, quantity)
+                        self._cancel_order(orphan_sl, f"nouveau SL {position_side}")
+                        return False
+                    if status in ("CANCELED", "EXPIRED"):
+                        self.logger.info("🚫 Annulation SL %s %s confirmée par le stream (%s)", position_side, old_order_id, status)
+                    else:
+                        self.logger.warning("Annulation SL %s %s non confirmée - deux SL peuvent coexister", position_side, old_order_id)
 
-            # Créer le nouveau SL
-            position_side_binance = "LONG" if position_side == "LONG" else "SHORT"
+            finally:
+                self._pending_cancels.pop(old_order_id, None)
 
-            new_sl_order = self.binance_client.place_stop_market_order(
+            # Mettre à jour les données du SL
+            updated_sl = OrderRef(
+                order_id=int(new_sl_order["orderId"]),
                 symbol=symbol,
                 side=side,
-                quantity=str(quantity),
-                stop_price=str(new_sl_price),
-                position_side=position_side_binance
+                stop_price=new_sl_price,
+                quantity=quantity
             )
 
-            if new_sl_order:
-                # Mettre à jour les données du SL
-                updated_sl_data = {
-                    "orderId": new_sl_order.get("orderId"),
-                    "symbol": symbol,
-                    "side": side,
-                    "stopPrice": new_sl_price,
-                    "quantity": quantity
-                }
-
-                if position_side == "LONG":
-                    self.active_sl_long = updated_sl_data
-                else:
-                    self.active_sl_short = updated_sl_data
+            self._set_side(position_side, sl=updated_sl)
 
-                self.logger.info(f"✅ Nouveau SL {position_side} créé: {new_sl_order.get('orderId')} @ {new_sl_price}")
-                return True
-            else:
-                self.logger.error(f"❌ Échec création nouveau SL {position_side}")
-                return False
+            self.logger.info("✅ Nouveau SL %s créé: %s @ %s", position_side, new_sl_order.get('orderId'), new_sl_price)
+            return True
 
         except Exception as e:
-            self.logger.error(f"Erreur mise à jour ordre SL {position_side}: {e}", exc_info=True)
+            self.logger.error("Erreur mise à jour ordre SL %s: %s", position_side, e, exc_info=True)
             return False
 
+    def _wait_for_order_status(self, order_id: int, event: threading.Event) -> Optional[str]:
+        """
+        Attend le statut final d'un ordre sur le User Data Stream
+
+        L'attente n'est faite que hors du thread de la boucle d'événements,
+        qui est celui qui reçoit les messages du stream.
+
+        Args:
+            order_id: ID de l'ordre
+            event: Événement signalé à la réception du statut
+
+        Returns:
+            Statut connu (FILLED, CANCELED, EXPIRED) ou None
+        """
+        if order_id not in self._order_state and threading.current_thread() is not threading.main_thread():
+            event.wait(_CANCEL_CONFIRM_TIMEOUT)
+        return self._order_state.get(order_id)
+
+    def _record_order_status(self, order_id: int, status: str) -> None:
+        """
+        Mémorise le statut final d'un de nos ordres et réveille une annulation en attente
+
+        Args:
+            order_id: ID de l'ordre
+            status: Statut reçu (FILLED, CANCELED, EXPIRED)
+        """
+        self._order_state[order_id] = status
+        if len(self._order_state) > _ORDER_STATE_MAX_SIZE:
+            self._order_state.pop(next(iter(self._order_state)))  # Plus ancien statut
+
+        event = self._pending_cancels.get(order_id)
+        if event:
+            event.set()
+
     def process_candle_close_for_trailing_stop(self, current_price: float) -> None:
         """
         Traite une bougie fermée pour vérifier les conditions de trailing stop
 
+        Le traitement (appels REST) est délégué au thread de traitement pour
+        ne pas bloquer le thread WebSocket.
+
         Args:
             current_price: Prix de fermeture de la bougie
         """
-        self.logger.debug(f"process_candle_close_for_trailing_stop called, price={current_price}")
+        state = self._state
+        if state["LONG"].position is None and state["SHORT"].position is None:
+            return  # Aucune position: rien à suivre
+
+        self._enqueue_work(("trailing", current_price))
+
+    @trace
+    def _handle_trailing_stop(self, current_price: float) -> None:
+        """
+        Vérifie les conditions de trailing stop (thread de traitement)
 
+        Args:
+            current_price: Prix de fermeture de la bougie
+        """
         try:
             # Vérifier si trailing stop est activé
-            trailing_config = self.config.get("TRAILING_STOP", {})
-            if not trailing_config.get("ENABLED", False):
+            if not self._trailing_enabled:
                 return
 
-            # Vérifier position LONG
-            if self.active_position_long and self.active_sl_long:
-                if self._check_trailing_stop_condition("LONG", current_price):
-                    self.logger.info("🎯 Condition trailing LONG détectée - Ajustement SL")
-                    self._execute_trailing_stop_adjustment("LONG", current_price)
+            state = self._state
+            sides = [side for side in _SIDES if state[side].position and state[side].sl]
 
-            # Vérifier position SHORT
-            if self.active_position_short and self.active_sl_short:
-                if self._check_trailing_stop_condition("SHORT", current_price):
-                    self.logger.info("🎯 Condition trailing SHORT détectée - Ajustement SL")
-                    self._execute_trailing_stop_adjustment("SHORT", current_price)
+            self._run_for_sides(lambda side: self._process_trailing_stop_side(side, current_price), sides)
 
         except Exception as e:
-            self.logger.error(f"Erreur traitement bougie pour trailing stop: {e}", exc_info=True)
+            self.logger.error("Erreur traitement bougie pour trailing stop: %s", e, exc_info=True)
+
+    def _process_trailing_stop_side(self, position_side: str, current_price: float) -> None:
+        """
+        Vérifie et applique le trailing stop pour un côté
+
+        Args:
+            position_side: "LONG" ou "SHORT"
+            current_price: Prix de fermeture de la bougie
+        """
+        if self._check_trailing_stop_condition(position_side, current_price):
+            self.logger.info("🎯 Condition trailing %s détectée - Ajustement SL", position_side)
+            self._execute_trailing_stop_adjustment(position_side, current_price)
+
+    def _run_for_sides(self, handler: Callable[[str], None], sides: List[str]) -> None:
+        """
+        Exécute un traitement par côté, en parallèle quand LONG et SHORT sont actifs
+
+        Les appels REST étant bloquants, les deux côtés se chevauchent dans le
+        pool dédié au lieu de s'enchaîner; un seul côté est traité directement.
+
+        Args:
+            handler: Traitement à appliquer (reçoit "LONG" ou "SHORT")
+            sides: Côtés à traiter
+        """
+        if len(sides) < 2:
+            for side in sides:
+                handler(side)
+            return
+
+        futures = [self._side_executor.submit(handler, side) for side in sides]
+        for future in futures:
+            future.result()  # Propage une éventuelle exception à l'appelant
 
     def process_candle_close_for_dynamic_exit(self, candle_data: Dict[str, Any]) -> None:
         """
@@ -618,57 +1029,92 @@ class AllOrNothingService:
         Args:
             candle_data: Données de la bougie fermée
         """
-        self.logger.info("🕐 process_candle_close_for_dynamic_exit called - NEW CANDLE CLOSED")
+        state = self._state
+        if state["LONG"].position is None and state["SHORT"].position is None:
+            return  # Aucune position: rien à vérifier
+
+        self._enqueue_work(("dynamic", candle_data))
+
+    def _handle_dynamic_exit(self, candle_data: Dict[str, Any]) -> None:
+        """
+        Vérifie les conditions de sortie RSI dynamique (thread de traitement)
+
+        Args:
+            candle_data: Données de la bougie fermée
+        """
+        self.logger.info("🕐 _handle_dynamic_exit called - NEW CANDLE CLOSED")
 
         try:
             # Vérifier si le TP dynamique RSI est activé
-            dynamic_config = self.config.get("DYNAMIC_RSI_EXIT", {})
-            if not dynamic_config.get("ENABLED", False):
+            if not self._dynamic_exit_enabled:
                 self.logger.debug("❌ Dynamic RSI Exit disabled in config - skipping")
                 return
 
-            self.logger.info(f"✅ Dynamic RSI Exit ENABLED - checking positions")
+            state = self._state
+            sides = [side for side in _SIDES if state[side].position]
+            self.logger.info("✅ Dynamic RSI Exit ENABLED - checking positions (LONG=%s, SHORT=%s)",
+                             'LONG' in sides, 'SHORT' in sides)
 
-            symbol = config.SYMBOL
+            self._run_for_sides(lambda side: self._process_dynamic_exit_side(side, self._symbol), sides)
 
-            # Afficher l'état des positions actuelles
-            long_active = bool(self.active_position_long)
-            short_active = bool(self.active_position_short)
-            self.logger.info(f"📊 Position Status: LONG={long_active}, SHORT={short_active}")
+        except Exception as e:
+            self.logger.error("Erreur traitement bougie pour sortie dynamique: %s", e, exc_info=True)
 
-            # Vérifier la position LONG
-            if self.active_position_long:
-                self.logger.info("🔍 Checking LONG position for RSI exit conditions...")
-                if self._check_dynamic_rsi_exit_condition("LONG"):
-                    self.logger.info("🎯 Condition sortie RSI LONG détectée - Exécution sortie")
-                    success = self._execute_dynamic_rsi_exit("LONG", symbol)
-                    if success:
-                        self.logger.info("✅ LONG RSI exit executed successfully")
-                    else:
-                        self.logger.error("❌ LONG RSI exit failed")
-                else:
-                    self.logger.debug("⏳ LONG RSI exit conditions not met yet")
-
-            # Vérifier la position SHORT
-            if self.active_position_short:
-                self.logger.info("🔍 Checking SHORT position for RSI exit conditions...")
-                if self._check_dynamic_rsi_exit_condition("SHORT"):
-                    self.logger.info("🎯 Condition sortie RSI SHORT détectée - Exécution sortie")
-                    success = self._execute_dynamic_rsi_exit("SHORT", symbol)
-                    if success:
-                        self.logger.info("✅ SHORT RSI exit executed successfully")
-                    else:
-                        self.logger.error("❌ SHORT RSI exit failed")
+    def _enqueue_work(self, item: Optional[tuple]) -> None:
+        """
+        Dépose un traitement sans bloquer; file pleine: le plus ancien est abandonné
+
+        Args:
+            item: (type, données) ou None pour arrêter le thread de traitement
+        """
+        while True:
+            try:
+                self._work_queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    dropped = self._work_queue.get_nowait()
+                    self._work_queue.task_done()
+                    self.logger.warning("⚠️ File de traitement pleine - traitement %s abandonné", dropped[0] if dropped else None)
+                except queue.Empty:
+                    pass
+
+    def _candle_worker(self) -> None:
+        """Consomme les traitements de fermeture de bougie (appels REST bloquants)"""
+        while True:
+            item = self._work_queue.get()
+            try:
+                if item is None:
+                    return
+                kind, payload = item
+                if kind == "trailing":
+                    self._handle_trailing_stop(payload)
                 else:
-                    self.logger.debug("⏳ SHORT RSI exit conditions not met yet")
+                    self._handle_dynamic_exit(payload)
+            except Exception as e:
+                self.logger.error("Erreur thread de traitement AllOrNothing: %s", e, exc_info=True)
+            finally:
+                self._work_queue.task_done()
 
-            # Si aucune position active
-            if not self.active_position_long and not self.active_position_short:
-                self.logger.debug("📭 No active positions to check for RSI exit")
+    def _process_dynamic_exit_side(self, position_side: str, symbol: str) -> None:
+        """
+        Vérifie et exécute la sortie RSI dynamique pour un côté
 
-        except Exception as e:
-            self.logger.error(f"Erreur traitement bougie pour sortie dynamique: {e}", exc_info=True)
+        Args:
+            position_side: "LONG" ou "SHORT"
+            symbol: Symbole à trader
+        """
+        self.logger.info("🔍 Checking %s position for RSI exit conditions...", position_side)
+        if self._check_dynamic_rsi_exit_condition(position_side):
+            self.logger.info("🎯 Condition sortie RSI %s détectée - Exécution sortie", position_side)
+            if self._execute_dynamic_rsi_exit(position_side, symbol):
+                self.logger.info("✅ %s RSI exit executed successfully", position_side)
+            else:
+                self.logger.error("❌ %s RSI exit failed", position_side)
+        else:
+            self.logger.debug("⏳ %s RSI exit conditions not met yet", position_side)
 
+    @trace
     def _calculate_sl_price(self, signal_type: str) -> Optional[float]:
         """
         Calcule le prix du Stop Loss selon le signal et l'historique des bougies
@@ -679,31 +1125,28 @@ class AllOrNothingService:
         Returns:
             Prix du Stop Loss ou None si pas assez d'historique
         """
-        self.logger.debug(f"_calculate_sl_price called for {signal_type}")
-
-        lookback_candles = self.config.get("SL_LOOKBACK_CANDLES", 5)
-        sl_offset = self.config.get("SL_OFFSET_PERCENT", 0.001)
+        lookback_candles = self._sl_lookback
+        sl_offset = self._sl_offset
 
-        if len(self._candle_history) < lookback_candles:
-            self.logger.warning(f"Historique insuffisant pour SL: {len(self._candle_history)}/{lookback_candles}")
+        if self._ring_filled < lookback_candles:
+            self.logger.warning("Historique insuffisant pour SL: %s/%s", self._ring_filled, lookback_candles)
             return None
 
-        # Prendre les dernières bougies pour le calcul
-        recent_candles = self._candle_history[-lookback_candles:]
-
-        if signal_type == "LONG":
+        # Extrêmes de la fenêtre lus en tête des deques monotones
+        if _SIDE_SPECS[signal_type].sign > 0:
             # Pour LONG: SL = LOW minimum - offset
-            min_low = min(candle["low"] for candle in recent_candles)
+            min_low = self._sl_low_deque[0][1]
             sl_price = min_low * (1 - sl_offset)
-            self.logger.info(f"SL LONG calculé: {sl_price:.6f} (LOW min: {min_low:.6f} - {sl_offset*100}%)")
+            self.logger.info("SL LONG calculé: %.6f (LOW min: %.6f - %s%%)", sl_price, min_low, sl_offset*100)
         else:  # SHORT
             # Pour SHORT: SL = HIGH maximum + offset
-            max_high = max(candle["high"] for candle in recent_candles)
+            max_high = self._sl_high_deque[0][1]
             sl_price = max_high * (1 + sl_offset)
-            self.logger.info(f"SL SHORT calculé: {sl_price:.6f} (HIGH max: {max_high:.6f} + {sl_offset*100}%)")
+            self.logger.info("SL SHORT calculé: %.6f (HIGH max: %.6f + %s%%)", sl_price, max_high, sl_offset*100)
 
         return sl_price
 
+    @trace
     def _calculate_tp_price(self, entry_price: float, signal_type: str) -> float:
         """
         Calcule le prix du Take Profit selon le prix d'entrée
@@ -715,18 +1158,12 @@ class AllOrNothingService:
         Returns:
             Prix du Take Profit
         """
-        self.logger.debug(f"_calculate_tp_price called: {entry_price} for {signal_type}")
-
-        tp_percent = self.config.get("TP_PERCENT", 0.005)  # 0.5% par défaut
+        tp_price = entry_price * (1 + _SIDE_SPECS[signal_type].sign * self._tp_percent)
 
-        if signal_type == "LONG":
-            tp_price = entry_price * (1 + tp_percent)
-        else:  # SHORT
-            tp_price = entry_price * (1 - tp_percent)
-
-        self.logger.info(f"TP {signal_type} calculé: {tp_price:.6f} ({tp_percent*100}% du prix d'entrée {entry_price:.6f})")
+        self.logger.info("TP %s calculé: %.6f (%s%% du prix d'entrée %.6f)", signal_type, tp_price, self._tp_percent*100, entry_price)
         return tp_price
 
+    @trace
     def execute_signal(self, signal_type: str, symbol: str) -> bool:
         """
         Exécute un signal All Or Nothing avec création automatique des SL/TP
@@ -738,28 +1175,44 @@ class AllOrNothingService:
         Returns:
             True si l'exécution réussit, False sinon
         """
-        self.logger.debug(f"execute_signal called: {signal_type} on {symbol}")
-
-        # Vérifier si une position existe déjà pour ce côté
-        if signal_type == "LONG" and self.active_position_long:
-            self.logger.warning(f"Position LONG déjà active - Signal {signal_type} ignoré")
-            return False
-        elif signal_type == "SHORT" and self.active_position_short:
-            self.logger.warning(f"Position SHORT déjà active - Signal {signal_type} ignoré")
+        # Un seul appelant par côté: IDLE -> CREATING atomique (pas de fenêtre
+        # entre la vérification et le marquage pendant l'ordre d'entrée)
+        if not self._transition(signal_type, PosState.IDLE, PosState.CREATING):
+            self.logger.warning("Position %s déjà active - Signal %s ignoré", signal_type, signal_type)
             return False
 
+        opened = False
+        try:
+            opened = self._open_position(signal_type, symbol)
+            return opened
+        finally:
+            # ACTIVE seulement si la position existe encore (un SL exécuté pendant
+            # la création l'a déjà remise à zéro), sinon retour à IDLE
+            with self._state_lock:
+                final_phase = PosState.ACTIVE if opened and self._state[signal_type].position else PosState.IDLE
+                self._transition(signal_type, PosState.CREATING, final_phase)
+
+    def _open_position(self, signal_type: str, symbol: str) -> bool:
+        """
+        Ouvre la position (ordre d'entrée MARKET puis SL/TP) - phase CREATING
+
+        Args:
+            signal_type: "LONG" ou "SHORT"
+            symbol: Symbole à trader
+
+        Returns:
+            True si la position est ouverte et protégée, False sinon
+        """
         try:
             # 1. Calculer le prix SL préliminaire pour estimation de quantité
             preliminary_sl_price = self._calculate_sl_price(signal_type)
             if preliminary_sl_price is None:
-                self.logger.error(f"Impossible de calculer le SL préliminaire pour {signal_type}")
+                self.logger.error("Impossible de calculer le SL préliminaire pour %s", signal_type)
                 return False
 
             # 2. Préparer les données pour le calcul de quantité (mode PERCENTAGE)
             # Obtenir le prix actuel approximatif (dernière bougie)
-            current_price = None
-            if self._candle_history:
-                current_price = self._candle_history[-1]["close"]
+            current_price = self._last_close
 
             signal_data = {
                 "signal_type": signal_type.lower(),
@@ -770,119 +1223,98 @@ class AllOrNothingService:
             # 3. Exécuter l'ordre d'entrée MARKET
             quantity = self._get_trade_quantity(symbol, signal_data)
             if not quantity:
-                self.logger.error(f"Impossible d'obtenir la quantité pour {signal_type}")
+                self.logger.error("Impossible d'obtenir la quantité pour %s", signal_type)
                 return False
 
-            side = "BUY" if signal_type == "LONG" else "SELL"
-            position_side = "LONG" if signal_type == "LONG" else "SHORT"
+            spec = _SIDE_SPECS[signal_type]
+            side = spec.entry_side
+            position_side = signal_type
 
-            self.logger.info(f"🚀 Exécution signal {signal_type}: {side} {quantity} {symbol}")
+            self.logger.info("🚀 Exécution signal %s: %s %s %s", signal_type, side, quantity, symbol)
 
             entry_order = self.binance_client.place_order(
                 symbol=symbol,
                 side=side,
-                quantity=str(quantity),
+                quantity=_to_api_str(quantity),
                 order_type="MARKET",
                 position_side=position_side
             )
 
             if not entry_order:
-                self.logger.error(f"Échec ordre d'entrée {signal_type}")
+                self.logger.error("Échec ordre d'entrée %s", signal_type)
                 return False
 
-            # 4. Récupérer le prix d'exécution réel
-            entry_price = self._get_order_execution_price(entry_order)
-            if not entry_price:
-                self.logger.error(f"Impossible de récupérer le prix d'exécution pour {signal_type}")
-                return False
-
-            self.logger.info(f"✅ Ordre d'entrée {signal_type} exécuté: {entry_price:.6f}")
+            # 4. Récupérer le prix d'exécution réel en arrière-plan (aller-retour REST)
+            entry_price_future = self._fill_executor.submit(self._get_order_execution_price, entry_order)
 
-            # 5. RECALCULER LE RISQUE avec le prix d'exécution réel
-            self.logger.info(f"🔄 Recalcul du risque avec prix d'exécution réel: {entry_price:.6f}")
+            # 5. Le SL ne dépend que des extrêmes de la fenêtre (plus bas/plus hauts),
+            # pas du prix d'exécution: le SL préliminaire est le SL final. Pendant
+            # l'aller-retour, préchauffer le formatage (cache de précision)
+            sl_price = preliminary_sl_price
+            self._format_price_with_precision(sl_price, symbol)
 
-            # Mettre à jour l'historique avec la bougie courante si nécessaire
-            if self._candle_history and current_price:
-                # Remplacer la dernière bougie par une version avec le prix d'exécution réel
-                self._candle_history[-1]["close"] = entry_price
-
-            # Recalculer le SL avec les données actualisées
-            final_sl_price = self._calculate_sl_price(signal_type)
-            if final_sl_price is None:
-                self.logger.error(f"Impossible de recalculer le SL final pour {signal_type}")
+            entry_price = entry_price_future.result()
+            if not entry_price:
+                self.logger.error("Impossible de récupérer le prix d'exécution pour %s", signal_type)
                 return False
 
-            if abs(final_sl_price - preliminary_sl_price) > 0.001:  # Plus de 0.1% de différence
-                self.logger.info(f"⚠️ SL ajusté: {preliminary_sl_price:.6f} → {final_sl_price:.6f}")
-
-            # Utiliser le SL final pour les ordres
-            sl_price = final_sl_price
+            self.logger.info("✅ Ordre d'entrée %s exécuté: %.6f", signal_type, entry_price)
 
-            # BLOQUER IMMÉDIATEMENT LES SIGNAUX SUIVANTS - Position marquée comme active
-            if signal_type == "LONG":
-                self.active_position_long = {"status": "creating_sl_tp", "entry_price": entry_price}
-                # Initialiser la référence de trailing avec le prix d'entrée
-                self.trailing_reference_long = entry_price
-            else:
-                self.active_position_short = {"status": "creating_sl_tp", "entry_price": entry_price}
-                # Initialiser la référence de trailing avec le prix d'entrée
-                self.trailing_reference_short = entry_price
-
-            self.logger.debug(f"🔒 Position {signal_type} marquée active - signaux suivants bloqués")
-            self.logger.info(f"📍 Référence trailing {signal_type} initialisée: {entry_price}")
+            # 6. Réconcilier avec le prix d'exécution réel (l'historique des bougies
+            # n'est pas modifié: son close sert aussi aux indicateurs)
+            self.logger.debug("SL %s: %.6f (prix d'exécution %.6f, close bougie %s)",
+                              signal_type, sl_price, entry_price, current_price)
 
-            # 2. Créer le Stop Loss avec retry (5 tentatives max)
-            def create_sl_operation() -> bool:
-                return self._create_stop_loss(signal_type, symbol, quantity, sl_price)
+            # Un prix d'exécution déjà au-delà du SL invaliderait l'ordre STOP_MARKET
+            if (entry_price - sl_price) * spec.sign <= 0:
+                self.logger.warning("⚠️ Prix d'exécution %s au-delà du SL %s pour %s",
+                                    entry_price, sl_price, signal_type)
 
-            sl_success = self._retry_operation(create_sl_operation, f"Création SL {signal_type}")
-            if not sl_success:
-                self.logger.critical(f"🚫 ÉCHEC CRITIQUE: Impossible de créer SL pour {signal_type} - ARRÊT DU SYSTÈME")
-                # Nettoyer la position partiellement créée
-                if signal_type == "LONG":
-                    self.active_position_long = None
-                else:
-                    self.active_position_short = None
-                raise RuntimeError(f"Échec critique création SL {signal_type} après 5 tentatives")
+            # BLOQUER IMMÉDIATEMENT LES SIGNAUX SUIVANTS - Position marquée comme active
+            # (référence de trailing initialisée avec le prix d'entrée)
+            self._set_side(
+                signal_type,
+                position={"status": "creating_sl_tp", "entry_price": entry_price},
+                trailing_ref=entry_price
+            )
 
-            # 3. Créer le Take Profit SEULEMENT si TP dynamique RSI est DÉSACTIVÉ
-            dynamic_rsi_config = self.config.get("DYNAMIC_RSI_EXIT", {})
-            dynamic_rsi_enabled = dynamic_rsi_config.get("ENABLED", False)
+            self.logger.debug("🔒 Position %s marquée active - signaux suivants bloqués", signal_type)
+            self.logger.info("📍 Référence trailing %s initialisée: %s", signal_type, entry_price)
 
-            if dynamic_rsi_enabled:
-                self.logger.info(f"🎯 TP Dynamique RSI activé - AUCUN TP fixe créé pour {signal_type}")
-                tp_success = True  # Pas de TP fixe à créer
+            # 2. Take Profit fixe SEULEMENT si TP dynamique RSI est DÉSACTIVÉ
+            if self._dynamic_exit_enabled:
+                self.logger.info("🎯 TP Dynamique RSI activé - AUCUN TP fixe créé pour %s", signal_type)
+                tp_price = None
             else:
-                self.logger.info(f"📊 TP Dynamique RSI désactivé - Création TP fixe pour {signal_type}")
-
-                # Créer le TP fixe avec retry (5 tentatives max)
+                self.logger.info("📊 TP Dynamique RSI désactivé - Création TP fixe pour %s", signal_type)
                 tp_price = self._calculate_tp_price(entry_price, signal_type)
 
-                def create_tp_operation() -> bool:
-                    return self._create_take_profit(signal_type, symbol, quantity, tp_price)
-
-                tp_success = self._retry_operation(create_tp_operation, f"Création TP {signal_type}")
-                if not tp_success:
-                    self.logger.critical(f"🚫 ÉCHEC CRITIQUE: Impossible de créer TP pour {signal_type} - ARRÊT DU SYSTÈME")
-                    # Annuler le SL créé avant d'arrêter
-                    if signal_type == "LONG" and self.active_sl_long:
-                        self._cancel_order(self.active_sl_long, "SL LONG")
-                        self.active_sl_long = None
-                    elif signal_type == "SHORT" and self.active_sl_short:
-                        self._cancel_order(self.active_sl_short, "SL SHORT")
-                        self.active_sl_short = None
+            # 3. Créer SL et TP en une seule requête avec retry (5 tentatives max);
+            # une nouvelle tentative ne renvoie que les ordres encore manquants
+            def create_protection_operation() -> bool:
+                return self._create_protection_orders(signal_type, symbol, quantity, sl_price, tp_price)
 
+            if not self._retry_operation(create_protection_operation, f"Création SL/TP {signal_type}",
+                                         deadline_s=_PROTECTION_RETRY_DEADLINE):
+                created_sl = self._state[signal_type].sl
+                if created_sl is None:
+                    self.logger.critical("🚫 ÉCHEC CRITIQUE: Impossible de créer SL pour %s - ARRÊT DU SYSTÈME", signal_type)
                     # Nettoyer la position partiellement créée
-                    if signal_type == "LONG":
-                        self.active_position_long = None
-                    else:
-                        self.active_position_short = None
-                    raise RuntimeError(f"Échec critique création TP {signal_type} après 5 tentatives")
+                    self._set_side(signal_type, position=None)
+                    raise RuntimeError(f"Échec critique création SL {signal_type} après 5 tentatives")
+
+                self.logger.critical("🚫 ÉCHEC CRITIQUE: Impossible de créer TP pour %s - ARRÊT DU SYSTÈME", signal_type)
+                # Annuler le SL créé avant d'arrêter
+                self._cancel_order(created_sl, f"SL {signal_type}")
+
+                # Nettoyer la position partiellement créée
+                self._set_side(signal_type, position=None, sl=None)
+                raise RuntimeError(f"Échec critique création TP {signal_type} après 5 tentatives")
 
             # 4. Compléter les données de position (déjà marquée active plus tôt)
             complete_position_data = {
                 "orderId": entry_order.get("orderId"),
-                "symbol": symbol,
+                "symbol": self._intern_symbol(symbol),
                 "side": position_side,
                 "quantity": quantity,
                 "entry_price": entry_price,
@@ -890,27 +1322,22 @@ class AllOrNothingService:
                 "status": "active"  # Position complètement créée avec SL/TP
             }
 
-            if signal_type == "LONG":
-                if self.active_position_long:
-                    self.active_position_long.update(complete_position_data)
-            else:
-                if self.active_position_short:
-                    self.active_position_short.update(complete_position_data)
+            marked_position = self._state[signal_type].position
+            if marked_position:
+                self._set_side(signal_type, position={**marked_position, **complete_position_data})
 
-            self.logger.info(f"🎯 Position {signal_type} All Or Nothing créée avec SL/TP")
+            self.logger.info("🎯 Position %s All Or Nothing créée avec SL/TP", signal_type)
             return True
 
         except Exception as e:
-            self.logger.error(f"Erreur lors de l'exécution signal {signal_type}: {e}", exc_info=True)
+            self.logger.error("Erreur lors de l'exécution signal %s: %s", signal_type, e, exc_info=True)
 
             # Nettoyer la position partiellement créée en cas d'erreur
-            if signal_type == "LONG":
-                self.active_position_long = None
-            else:
-                self.active_position_short = None
+            self._set_side(signal_type, position=None)
 
             return False
 
+    @trace
     def _get_trade_quantity(self, symbol: str, signal_data: Optional[Dict[str, Any]] = None) -> Optional[float]:
         """
         Obtient la quantité de trading formatée selon la configuration
@@ -922,8 +1349,6 @@ class AllOrNothingService:
         Returns:
             Quantité formatée ou None si erreur
         """
-        self.logger.debug(f"_get_trade_quantity called for {symbol}")
-
         try:
             if self.trading_service:
                 return self.trading_service.get_initial_trade_quantity(symbol, signal_data)
@@ -931,9 +1356,10 @@ class AllOrNothingService:
                 self.logger.warning("TradingService non disponible - utilisation quantité par défaut")
                 return 0.001  # Quantité par défaut
         except Exception as e:
-            self.logger.error(f"Erreur obtention quantité: {e}", exc_info=True)
+            self.logger.error("Erreur obtention quantité: %s", e, exc_info=True)
             return None
 
+    @trace
     def _get_order_execution_price(self, order: Dict[str, Any]) -> Optional[float]:
         """
         Récupère le prix d'exécution d'un ordre
@@ -944,171 +1370,181 @@ class AllOrNothingService:
         Returns:
             Prix d'exécution ou None si non disponible
         """
-        self.logger.debug("_get_order_execution_price called")
-
         try:
             # Utiliser prioritairement get_order_status() comme CASCADE pour fiabilité
             order_id = order.get("orderId")
             symbol = order.get("symbol")
 
             if order_id and symbol:
-                self.logger.info(f"Récupération prix d'exécution via API - Order ID: {order_id}")
+                self.logger.info("Récupération prix d'exécution via API - Order ID: %s", order_id)
                 order_status = self.binance_client.get_order_status(symbol, int(order_id))
 
                 if order_status and order_status.get("status") == "FILLED":
                     execution_price = float(order_status.get("avgPrice", "0"))
                     executed_qty = float(order_status.get("executedQty", "0"))
 
-                    self.logger.info(f"✅ Prix ordre récupéré via API: {execution_price}, qty: {executed_qty}")
+                    self.logger.info("✅ Prix ordre récupéré via API: %s, qty: %s", execution_price, executed_qty)
 
                     if execution_price > 0.0:
                         return execution_price
                     else:
                         self.logger.warning("avgPrice API = 0.0 - ordre peut-être pas complètement traité")
                 else:
-                    self.logger.warning(f"Ordre non FILLED ou non trouvé: {order_status.get('status') if order_status else 'None'}")
+                    self.logger.warning("Ordre non FILLED ou non trouvé: %s", order_status.get('status') if order_status else 'None')
 
             # Fallback: vérifier avgPrice dans la réponse initiale
             avg_price = order.get("avgPrice", "0")
             if avg_price and avg_price != "0":
                 execution_price = float(avg_price)
                 if execution_price > 0.0:
-                    self.logger.info(f"Prix d'exécution récupéré (réponse initiale): {execution_price}")
+                    self.logger.info("Prix d'exécution récupéré (réponse initiale): %s", execution_price)
                     return execution_price
 
             self.logger.error("Prix d'exécution non disponible par aucune méthode")
             return None
 
         except Exception as e:
-            self.logger.error(f"Erreur récupération prix d'exécution: {e}", exc_info=True)
+            self.logger.error("Erreur récupération prix d'exécution: %s", e, exc_info=True)
             return None
 
-    def _create_stop_loss(self, signal_type: str, symbol: str, quantity: float, sl_price: float) -> bool:
+    @trace
+    def _create_protection_orders(self, signal_type: str, symbol: str, quantity: float, sl_price: float,
+                                  tp_price: Optional[float]) -> bool:
         """
-        Crée un ordre Stop Loss
+        Crée les ordres SL (et TP) manquants en une seule requête batchOrders
 
         Args:
             signal_type: "LONG" ou "SHORT"
             symbol: Symbole
             quantity: Quantité
             sl_price: Prix du Stop Loss
+            tp_price: Prix du Take Profit (None si TP dynamique RSI)
 
         Returns:
-            True si création réussie, False sinon
+            True si tous les ordres requis existent, False sinon
         """
-        self.logger.debug(f"_create_stop_loss called: {signal_type} SL={sl_price}")
-
         try:
-            # Format du prix selon la précision du symbole
-            formatted_sl_price = self._format_price_with_precision(sl_price, symbol)
-            if not formatted_sl_price:
-                return False
+            side_state = self._state[signal_type]
+            pending = []  # (champ d'état, paramètres de l'ordre)
 
-            # Pour LONG: SL = ordre SELL, pour SHORT: SL = ordre BUY
-            side = "SELL" if signal_type == "LONG" else "BUY"
-            position_side = "LONG" if signal_type == "LONG" else "SHORT"
+            if side_state.sl is None:
+                sl_request = self._stop_loss_request(signal_type, symbol, quantity, sl_price)
+                if not sl_request:
+                    return False
+                pending.append(("sl", sl_request))
 
-            sl_order = self.binance_client.place_stop_market_order(
-                symbol=symbol,
-                side=side,
-                quantity=str(quantity),
-                stop_price=str(formatted_sl_price),
-                position_side=position_side
-            )
+            if tp_price is not None and side_state.tp is None:
+                tp_request = self._take_profit_request(signal_type, symbol, quantity, tp_price)
+                if not tp_request:
+                    return False
+                pending.append(("tp", tp_request))
 
-            if sl_order:
-                sl_data = {
-                    "orderId": sl_order.get("orderId"),
-                    "symbol": symbol,
-                    "side": side,
-                    "stopPrice": formatted_sl_price,
-                    "quantity": quantity
-                }
+            if not pending:
+                return True
+
+            results = self.binance_client.place_batch_orders([request for _, request in pending])
+            if not results:
+                return False
 
-                if signal_type == "LONG":
-                    self.active_sl_long = sl_data
+            created: Dict[str, OrderRef] = {}
+            rejected = None
+            for (field, request), result in zip(pending, results):
+                if "orderId" not in result:
+                    self.logger.error("❌ Échec création %s %s: %s", field.upper(), signal_type, result.get("msg"))
+                    if result.get("code") in _NON_RETRYABLE_ORDER_CODES:
+                        rejected = f"{field.upper()} {result.get('code')} {result.get('msg')}"
+                    continue
+
+                created[field] = OrderRef(
+                    order_id=int(result["orderId"]),
+                    symbol=self._intern_symbol(symbol),
+                    side=request["side"],
+                    stop_price=float(request["stopPrice"]),
+                    quantity=quantity,
+                    price=float(request["price"]) if "price" in request else None
+                )
+                if field == "sl":
+                    self.logger.info("🛑 Stop Loss %s créé: %s", signal_type, request["stopPrice"])
                 else:
-                    self.active_sl_short = sl_data
+                    self.logger.info("🎯 Take Profit %s créé: %s", signal_type, request["price"])
 
-                self.logger.info(f"🛑 Stop Loss {signal_type} créé: {formatted_sl_price}")
-                return True
+            if created:
+                self._set_side(signal_type, **created)
 
-            return False
+            if rejected:
+                raise OrderRejectedError(rejected)
+
+            return len(created) == len(pending)
+
+        except OrderRejectedError:
+            raise
 
         except Exception as e:
-            self.logger.error(f"Erreur création Stop Loss {signal_type}: {e}", exc_info=True)
+            self.logger.error("Erreur création SL/TP %s: %s", signal_type, e, exc_info=True)
             return False
 
-    def _create_take_profit(self, signal_type: str, symbol: str, quantity: float, tp_price: float) -> bool:
+    def _stop_loss_request(self, signal_type: str, symbol: str, quantity: float,
+                           sl_price: float) -> Optional[Dict[str, str]]:
         """
-        Crée un ordre Take Profit
+        Prépare les paramètres de l'ordre Stop Loss (STOP_MARKET)
 
         Args:
             signal_type: "LONG" ou "SHORT"
             symbol: Symbole
             quantity: Quantité
-            tp_price: Prix du Take Profit
+            sl_price: Prix du Stop Loss
 
         Returns:
-            True si création réussie, False sinon
+            Paramètres de l'ordre ou None si le prix ne peut être formaté
         """
-        self.logger.debug(f"_create_take_profit called: {signal_type} TP={tp_price}")
-
-        try:
-            # Format du prix selon la précision du symbole
-            formatted_tp_price = self._format_price_with_precision(tp_price, symbol)
-            if not formatted_tp_price:
-                return False
-
-            # Calculer le prix de déclenchement avec offset
-            price_offset = self.config.get("PRICE_OFFSET", 0.001)
-            if signal_type == "LONG":
-                # LONG TP: trigger en dessous du prix limite
-                stop_price = formatted_tp_price * (1 - price_offset)
-            else:
-                # SHORT TP: trigger au dessus du prix limite
-                stop_price = formatted_tp_price * (1 + price_offset)
-
-            formatted_stop_price = self._format_price_with_precision(stop_price, symbol)
-            if not formatted_stop_price:
-                return False
-
-            # Pour LONG: TP = ordre SELL, pour SHORT: TP = ordre BUY
-            side = "SELL" if signal_type == "LONG" else "BUY"
-            position_side = "LONG" if signal_type == "LONG" else "SHORT"
-
-            tp_order = self.binance_client.place_take_profit_order(
-                symbol=symbol,
-                side=side,
-                quantity=str(quantity),
-                stop_price=str(formatted_stop_price),
-                price=str(formatted_tp_price),
-                position_side=position_side
-            )
+        # Format du prix selon la précision du symbole
+        formatted_sl_price = self._format_price_with_precision(sl_price, symbol)
+        if not formatted_sl_price:
+            return None
 
-            if tp_order:
-                tp_data = {
-                    "orderId": tp_order.get("orderId"),
-                    "symbol": symbol,
-                    "side": side,
-                    "price": formatted_tp_price,
-                    "stopPrice": formatted_stop_price,
-                    "quantity": quantity
-                }
+        return {
+            "symbol": symbol,
+            "side": _SIDE_SPECS[signal_type].exit_side,  # LONG: SL = SELL, SHORT: SL = BUY
+            "type": "STOP_MARKET",
+            "quantity": _to_api_str(quantity),
+            "stopPrice": _to_api_str(formatted_sl_price),
+            "positionSide": signal_type
+        }
 
-                if signal_type == "LONG":
-                    self.active_tp_long = tp_data
-                else:
-                    self.active_tp_short = tp_data
+    def _take_profit_request(self, signal_type: str, symbol: str, quantity: float,
+                             tp_price: float) -> Optional[Dict[str, str]]:
+        """
+        Prépare les paramètres de l'ordre Take Profit (TAKE_PROFIT limite)
 
-                self.logger.info(f"🎯 Take Profit {signal_type} créé: {formatted_tp_price}")
-                return True
+        Args:
+            signal_type: "LONG" ou "SHORT"
+            symbol: Symbole
+            quantity: Quantité
+            tp_price: Prix du Take Profit
 
-            return False
+        Returns:
+            Paramètres de l'ordre ou None si un prix ne peut être formaté
+        """
+        # Calculer le prix de déclenchement avec offset (LONG: en dessous du prix limite,
+        # SHORT: au dessus)
+        spec = _SIDE_SPECS[signal_type]
+        stop_price = tp_price * (1 - spec.sign * self._price_offset)
+
+        # Prix limite et déclenchement arrondis ensemble selon la précision du symbole
+        formatted = self._format_prices_with_precision([tp_price, stop_price], symbol)
+        if not formatted:
+            return None
+        formatted_tp_price, formatted_stop_price = formatted
 
-        except Exception as e:
-            self.logger.error(f"Erreur création Take Profit {signal_type}: {e}", exc_info=True)
-            return False
+        return {
+            "symbol": symbol,
+            "side": spec.exit_side,  # LONG: TP = SELL, SHORT: TP = BUY
+            "type": "TAKE_PROFIT",
+            "quantity": _to_api_str(quantity),
+            "stopPrice": _to_api_str(formatted_stop_price),
+            "price": _to_api_str(formatted_tp_price),
+            "positionSide": signal_type
+        }
 
     def _format_price_with_precision(self, price: float, symbol: str) -> Optional[float]:
         """
@@ -1121,154 +1557,302 @@ class AllOrNothingService:
         Returns:
             Prix formaté ou None si erreur
         """
-        self.logger.debug(f"_format_price_with_precision called: {price} for {symbol}")
-
         try:
-            # Utiliser binance_client.format_price() et convertir en float
+            # Précision chargée une seule fois par symbole (exchangeInfo)
+            if symbol != self._cached_symbol:
+                self._cache_price_tick(symbol)
+
+            # Arrondi au multiple du pas le plus proche, sans appel client
+            if symbol == self._cached_symbol:
+                return round(round(price / self._tick_size) * self._tick_size, self._price_decimals)
+
+            # Dernier recours: binance_client.format_price() converti en float
             formatted_price_str = self.binance_client.format_price(price, symbol)
             return float(formatted_price_str)
         except Exception as e:
-            self.logger.error(f"Erreur formatage prix: {e}", exc_info=True)
+            self.logger.error("Erreur formatage prix: %s", e, exc_info=True)
             return None
 
-    def _cache_symbol_precision(self) -> None:
-        """Cache les informations de précision du symbole actuel"""
-        self.logger.debug("_cache_symbol_precision called")
-        # Implémentation similaire à AccumulatorService si nécessaire
-        pass
+    def _format_prices_with_precision(self, prices: List[float], symbol: str) -> Optional[List[float]]:
+        """
+        Formate plusieurs prix du même symbole en une seule étape vectorisée
 
-    def _recover_existing_state(self) -> None:
-        """Récupère l'état existant au démarrage du service"""
-        self.logger.debug("_recover_existing_state called")
-        self.logger.info("AllOrNothing: Recovery non implémenté (positions simples)")
-        # Pour AllOrNothing, on peut laisser la recovery simple car les positions sont temporaires
+        Args:
+            prices: Prix à formater
+            symbol: Symbole pour la précision
 
-    def handle_order_execution_from_websocket(self, order_data: Dict[str, Any]) -> None:
+        Returns:
+            Prix formatés (même ordre) ou None si erreur
         """
-        Gère l'exécution d'ordres depuis le WebSocket User Data Stream
+        if symbol != self._cached_symbol:
+            self._cache_price_tick(symbol)
+        if symbol != self._cached_symbol:
+            formatted = [self._format_price_with_precision(price, symbol) for price in prices]
+            return None if None in formatted else formatted
+
+        tick = self._tick_size
+        return np.round(np.round(np.asarray(prices) / tick) * tick, self._price_decimals).tolist()
+
+    def _intern_symbol(self, symbol: str) -> str:
+        """
+        Retourne la forme internée du symbole (calculée une seule fois)
 
         Args:
-            order_data: Données d'exécution d'ordre
+            symbol: Symbole à normaliser
+
+        Returns:
+            Symbole interné, partagé par tous les ordres
+        """
+        interned = self._symbol_interned.get(symbol)
+        if interned is None:
+            interned = sys.intern(symbol)
+            self._symbol_interned[symbol] = interned
+        return interned
+
+    @trace
+    def _cache_symbol_precision(self) -> None:
+        """Met en cache les informations de précision pour éviter appels répétés"""
+        # Vérifier si déjà en cache pour ce symbole
+        if self._cached_symbol == self._symbol:
+            return
+
+        self._cache_price_tick(self._symbol)
+
+    @trace
+    def _cache_price_tick(self, symbol: str) -> None:
         """
-        self.logger.debug("handle_order_execution_from_websocket called")
+        Charge le pas de prix du symbole (TradingService, sinon exchangeInfo)
 
+        Args:
+            symbol: Symbole dont la précision est mise en cache
+        """
         try:
-            if order_data.get("X") != "FILLED":
-                return  # Seuls les ordres exécutés nous intéressent
+            tick_size = None
+            if self.trading_service:
+                precision_info = self.trading_service.get_symbol_precision(symbol)
+                if precision_info:
+                    tick_size = repr(precision_info["price_filter"]["tick_size"])
+            else:
+                symbol_info = self.binance_client.get_symbol_info(symbol)
+                for filter_info in (symbol_info or {}).get("filters", []):
+                    if filter_info.get("filterType") == "PRICE_FILTER":
+                        tick_size = filter_info.get("tickSize")
 
-            order_id = order_data.get("i")
+            if not tick_size or Decimal(tick_size) <= 0:
+                self.logger.warning("Impossible de mettre en cache les informations de précision")
+                return
 
-            # Vérifier si c'est un SL ou TP qui s'est exécuté
-            if order_id and self._is_sl_or_tp_executed(str(order_id)):
-                self.logger.info(f"🔄 SL/TP All Or Nothing exécuté: {order_id}")
-                # Reset de la position concernée
-                self._reset_position_for_order(str(order_id))
+            tick = Decimal(tick_size).normalize()
+            self._tick_size = float(tick)
+            self._price_decimals = max(0, -tick.as_tuple().exponent)
+            self._cached_symbol = self._intern_symbol(symbol)
 
+            self.logger.info("Cache formatage AllOrNothing: tick_size=%s, décimales=%s", tick, self._price_decimals)
         except Exception as e:
-            self.logger.error(f"Erreur traitement exécution WebSocket: {e}", exc_info=True)
+            self.logger.error("Erreur mise en cache précision %s: %s", symbol, e, exc_info=True)
 
-    def _is_sl_or_tp_executed(self, order_id: str) -> bool:
+    @trace
+    def _recover_existing_state(self) -> None:
         """
-        Vérifie si l'ordre exécuté est un de nos SL/TP
-
-        Args:
-            order_id: ID de l'ordre exécuté
+        Récupère l'état existant au démarrage du service
 
-        Returns:
-            True si c'est un de nos SL/TP
+        Recharge les SL/TP sauvegardés puis les réconcilie avec un seul appel
+        get_open_orders: un côté n'est restauré que si tous ses ordres sont
+        encore ouverts, sinon l'ordre orphelin restant est annulé.
         """
-        # Vérifier parmi tous les SL/TP actifs
-        all_orders = [
-            self.active_sl_long, self.active_sl_short,
-            self.active_tp_long, self.active_tp_short
-        ]
+        data = self._load_state()
+        if not data:
+            self.logger.info("AllOrNothing: aucun état sauvegardé à restaurer")
+            return
 
-        for order in all_orders:
-            if order and str(order.get("orderId")) == str(order_id):
-                return True
+        try:
+            saved_state = {side: PositionState.from_dict(data.get(side)) for side in _SIDES}
+            if all(side_state == EMPTY_SIDE for side_state in saved_state.values()):
+                self.logger.info("AllOrNothing: état sauvegardé vide")
+                return
 
-        return False
+            symbols = {
+                self._intern_symbol(order.symbol)
+                for side_state in saved_state.values()
+                for order in (side_state.sl, side_state.tp) if order
+            }
+
+            open_order_ids = set()
+            for symbol in symbols:
+                open_orders = self.binance_client.get_open_orders(symbol)
+                if open_orders is None:
+                    # Réconciliation impossible: garder le fichier d'état intact pour un prochain démarrage
+                    self.logger.warning("AllOrNothing: ordres ouverts %s indisponibles - état sauvegardé conservé, restauration ignorée", symbol)
+                    return
+                for open_order in open_orders:
+                    open_order_ids.add(int(open_order.get("orderId", 0)))
+
+            restored = {}
+            orphan_orders: List[OrderRef] = []
+            for side, side_state in saved_state.items():
+                position, sl_data = side_state.position, side_state.sl
+                side_orders = [order for order in (sl_data, side_state.tp) if order]
+
+                if position and sl_data and all(order.order_id in open_order_ids for order in side_orders):
+                    # Réinterner le symbole rechargé depuis le JSON
+                    if position.get("symbol"):
+                        position["symbol"] = self._intern_symbol(position["symbol"])
+                    for order in side_orders:
+                        order.symbol = self._intern_symbol(order.symbol)
+                    restored[side] = side_state
+                    self.logger.info("📥 Position %s All Or Nothing restaurée (SL: %s)", side, sl_data.order_id)
+                else:
+                    # Position fermée pendant l'arrêt: annuler les ordres restés ouverts
+                    orphan_orders.extend(order for order in side_orders if order.order_id in open_order_ids)
+                    if position:
+                        self.logger.info("🔄 Position %s sauvegardée fermée pendant l'arrêt - ignorée", side)
+
+            if orphan_orders:
+                self._cancel_orders(orphan_orders, "ordres orphelins")
+
+            with self._state_update():
+                self._state = {side: restored.get(side, EMPTY_SIDE) for side in _SIDES}
 
-    def _reset_position_for_order(self, order_id: str) -> None:
+        except Exception as e:
+            self.logger.error("Erreur restauration état AllOrNothing: %s", e, exc_info=True)
+
+    def handle_order_execution_from_websocket(self, order_data: Dict[str, Any]) -> None:
         """
-        Reset de la position concernée par l'ordre exécuté
+        Gère l'exécution d'ordres depuis le WebSocket User Data Stream
 
         Args:
-            order_id: ID de l'ordre exécuté
+            order_data: Données d'exécution d'ordre
         """
-        self.logger.debug(f"_reset_position_for_order called: {order_id}")
+        try:
+            # Aucun SL/TP actif ni annulation attendue: rien ne peut nous concerner
+            if not self._order_index and not self._pending_cancels:
+                return
 
-        # Reset LONG si SL/TP LONG exécuté
-        if ((self.active_sl_long and str(self.active_sl_long.get("orderId")) == str(order_id)) or
-            (self.active_tp_long and str(self.active_tp_long.get("orderId")) == str(order_id))):
+            # Un seul accès O(1) à l'index de nos SL/TP (clés int ; "i" arrive en chaîne
+            # depuis UserDataStreamManager)
+            order_id = int(order_data.get("i") or 0)
+            owner = self._order_index.get(order_id)
+            if owner is None and order_id not in self._pending_cancels:
+                return  # Ordre étranger à ce service (cas le plus fréquent)
 
-            self.logger.info("🔄 Reset position LONG All Or Nothing")
+            status = order_data.get("X")
+            if status not in _TERMINAL_ORDER_STATUSES:
+                return
+
+            # Suivre les statuts finaux de nos SL/TP (confirmation des remplacements)
+            self._record_order_status(order_id, status)
+
+            if status != "FILLED":
+                return  # Seuls les ordres exécutés déclenchent un reset
+
+            # Vérifier si c'est un SL ou TP qui s'est exécuté
+            if owner:
+                self.logger.info("🔄 SL/TP All Or Nothing exécuté: %s", order_id)
+                # Reset de la position concernée
+                self._reset_position_for_order(order_id, owner)
 
-            # Annuler l'ordre opposé avant reset
-            if self.active_sl_long and str(self.active_sl_long.get("orderId")) == str(order_id) and self.active_tp_long:
-                # SL exécuté, annuler TP
-                self._cancel_order(self.active_tp_long, "TP LONG")
-            elif self.active_tp_long and str(self.active_tp_long.get("orderId")) == str(order_id) and self.active_sl_long:
-                # TP exécuté, annuler SL
-                self._cancel_order(self.active_sl_long, "SL LONG")
+        except Exception as e:
+            self.logger.error("Erreur traitement exécution WebSocket: %s", e, exc_info=True)
 
-            self.active_position_long = None
-            self.active_sl_long = None
-            self.active_tp_long = None
+    @trace
+    def _reset_position_for_order(self, order_id: int, owner: tuple) -> None:
+        """
+        Reset de la position concernée par l'ordre exécuté
 
-        # Reset SHORT si SL/TP SHORT exécuté
-        if ((self.active_sl_short and str(self.active_sl_short.get("orderId")) == str(order_id)) or
-            (self.active_tp_short and str(self.active_tp_short.get("orderId")) == str(order_id))):
+        Args:
+            order_id: ID de l'ordre exécuté
+            owner: (côté, "SL"/"TP") issu de l'index des ordres
+        """
+        side, kind = owner
+        side_state = self._state[side]
 
-            self.logger.info("🔄 Reset position SHORT All Or Nothing")
+        self.logger.info("🔄 Reset position %s All Or Nothing", side)
 
-            # Annuler l'ordre opposé avant reset
-            if self.active_sl_short and str(self.active_sl_short.get("orderId")) == str(order_id) and self.active_tp_short:
-                # SL exécuté, annuler TP
-                self._cancel_order(self.active_tp_short, "TP SHORT")
-            elif self.active_tp_short and str(self.active_tp_short.get("orderId")) == str(order_id) and self.active_sl_short:
-                # TP exécuté, annuler SL
-                self._cancel_order(self.active_sl_short, "SL SHORT")
+        # Annuler l'ordre opposé avant reset
+        if kind == "SL" and side_state.tp:
+            # SL exécuté, annuler TP
+            self._cancel_order(side_state.tp, f"TP {side}")
+        elif kind == "TP" and side_state.sl:
+            # TP exécuté, annuler SL
+            self._cancel_order(side_state.sl, f"SL {side}")
 
-            self.active_position_short = None
-            self.active_sl_short = None
-            self.active_tp_short = None
+        self._set_side(side, position=None, sl=None, tp=None)
 
-    def _cancel_order(self, order_data: Dict[str, Any], order_type: str) -> bool:
+    def _cancel_order(self, order: OrderRef, order_type: str) -> bool:
         """
         Annule un ordre sur Binance
 
         Args:
-            order_data: Données de l'ordre à annuler
+            order: Ordre à annuler
             order_type: Type d'ordre pour les logs
 
         Returns:
             True si annulation réussie, False sinon
         """
         try:
-            order_id = order_data.get("orderId")
-            symbol = order_data.get("symbol")
+            order_id = order.order_id
+            symbol = order.symbol  # Déjà interné à la création de l'ordre
 
-            if not order_id or not symbol:
-                self.logger.warning(f"Données incomplètes pour annulation {order_type}: {order_data}")
-                return False
-
-            self.logger.info(f"🚫 Annulation {order_type}: {order_id}")
+            self.logger.info("🚫 Annulation %s: %s", order_type, order_id)
 
             # Utiliser l'API Binance pour annuler l'ordre
-            result = self.binance_client.cancel_order(symbol, int(order_id))
+            result = self.binance_client.cancel_order(symbol, order_id)
 
             if result:
-                self.logger.info(f"✅ {order_type} annulé avec succès: {order_id}")
+                self.logger.info("✅ %s annulé avec succès: %s", order_type, order_id)
                 return True
             else:
-                self.logger.warning(f"❌ Échec annulation {order_type}: {order_id}")
+                self.logger.warning("❌ Échec annulation %s: %s", order_type, order_id)
                 return False
 
         except Exception as e:
-            self.logger.error(f"Erreur annulation {order_type}: {e}", exc_info=True)
+            self.logger.error("Erreur annulation %s: %s", order_type, e, exc_info=True)
             return False
 
+    def _cancel_orders(self, orders: List[OrderRef], order_type: str) -> bool:
+        """
+        Annule plusieurs ordres avec une requête groupée par symbole
+
+        Args:
+            orders: Ordres à annuler
+            order_type: Type d'ordres pour les logs
+
+        Returns:
+            True si tous les ordres ont été annulés, False sinon
+        """
+        by_symbol: Dict[str, List[OrderRef]] = {}
+        for order in orders:
+            by_symbol.setdefault(order.symbol, []).append(order)
+
+        all_cancelled = True
+        for symbol, symbol_orders in by_symbol.items():
+            if len(symbol_orders) == 1:
+                all_cancelled &= self._cancel_order(symbol_orders[0], order_type)
+                continue
+
+            try:
+                order_ids = [order.order_id for order in symbol_orders]
+                self.logger.info("🚫 Annulation %s: %s", order_type, order_ids)
+
+                results = self.binance_client.cancel_batch_orders(symbol, order_ids)
+                if not results:
+                    self.logger.warning("❌ Échec annulation %s: %s", order_type, order_ids)
+                    all_cancelled = False
+                    continue
+
+                for order_id, result in zip(order_ids, results):
+                    if "orderId" in result:
+                        self.logger.info("✅ %s annulé avec succès: %s", order_type, order_id)
+                    else:
+                        self.logger.warning("❌ Échec annulation %s %s: %s", order_type, order_id, result.get("msg"))
+                        all_cancelled = False
+
+            except Exception as e:
+                self.logger.error("Erreur annulation %s: %s", order_type, e, exc_info=True)
+                all_cancelled = False
+
+        return all_cancelled
+
     def get_strategy_status(self) -> Dict[str, Any]:
         """
         Retourne l'état actuel de la stratégie All Or Nothing
@@ -1276,34 +1860,40 @@ class AllOrNothingService:
         Returns:
             Dictionnaire avec l'état des positions
         """
+        # Lecture sans verrou: un seul instantané cohérent du dict d'état
+        state = self._state
+        long_state, short_state = state["LONG"], state["SHORT"]
+
         return {
             "strategy": "ALL_OR_NOTHING",
-            "long_active": self.active_position_long is not None,
-            "short_active": self.active_position_short is not None,
-            "long_sl_active": self.active_sl_long is not None,
-            "short_sl_active": self.active_sl_short is not None,
-            "long_tp_active": self.active_tp_long is not None,
-            "short_tp_active": self.active_tp_short is not None,
-            "candle_history_size": len(self._candle_history)
+            "long_active": long_state.position is not None,
+            "short_active": short_state.position is not None,
+            "long_sl_active": long_state.sl is not None,
+            "short_sl_active": short_state.sl is not None,
+            "long_tp_active": long_state.tp is not None,
+            "short_tp_active": short_state.tp is not None,
+            "candle_history_size": self._ring_filled
         }
 
+    @trace
     def cleanup(self) -> None:
         """Nettoyage des ressources du service"""
-        self.logger.debug("cleanup called")
-
         # Préserver les ordres SL/TP actifs lors de l'arrêt
-        if self.active_sl_long or self.active_tp_long:
-            self.logger.info("⚠️ Position LONG All Or Nothing préservée lors de l'arrêt")
-
-        if self.active_sl_short or self.active_tp_short:
-            self.logger.info("⚠️ Position SHORT All Or Nothing préservée lors de l'arrêt")
-
-        # Reset des états sans annuler les ordres
-        self.active_position_long = None
-        self.active_position_short = None
-        self.active_sl_long = None
-        self.active_sl_short = None
-        self.active_tp_long = None
-        self.active_tp_short = None
+        for side, side_state in self._state.items():
+            if side_state.sl or side_state.tp:
+                self.logger.info("⚠️ Position %s All Or Nothing préservée lors de l'arrêt", side)
+
+        # Arrêter le thread de traitement puis plus aucun traitement parallèle
+        self._enqueue_work(None)
+        self._worker_thread.join(timeout=_CANCEL_CONFIRM_TIMEOUT)
+        self._side_executor.shutdown(wait=False)
+        self._fill_executor.shutdown(wait=False)
+        # Terminer la dernière sauvegarde en attente avant l'arrêt
+        self._save_executor.shutdown(wait=True)
+
+        # Reset des états sans annuler les ordres (un seul échange atomique)
+        # L'état sur disque est conservé pour la restauration au prochain démarrage
+        with self._state_update(persist=False):
+            self._state = {side: EMPTY_SIDE for side in _SIDES}
 
         self.logger.info("AllOrNothingService nettoyé")
\ No newline at end of file
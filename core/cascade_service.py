@@ -3,14 +3,25 @@ Service de cascade trading
 Responsabilité unique : Gestion du système de cascade avec alternance LONG/SHORT
 """
 import asyncio
-import time
-from typing import Dict, Optional, Any, List
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, FrozenSet, Optional, Any, Tuple
 from enum import Enum
-from decimal import Decimal, ROUND_DOWN
+from decimal import Decimal
 
 import config
 from api.binance_client import BinanceAPIClient
-from core.logger import get_module_logger
+from core.logger import get_module_logger, trace
+from core.tp_service import TPSide
+
+_ZERO = Decimal(0)
+_QTY_FALLBACK_QUANT = Decimal("0.001")
+
+# Délai de regroupement des mises à jour TP après exécution (secondes)
+_TP_UPDATE_DELAY = 0.05
 
 
 class CascadeState(Enum):
@@ -22,9 +33,99 @@ class CascadeState(Enum):
     STOPPED = "stopped"  # Cascade arrêtée (limite atteinte ou erreur)
 
 
+@dataclass(slots=True, frozen=True)
+class CascadeOrder:
+    """Ordre STOP_MARKET suivi par la cascade (hedge initial ou ordre cascade en attente)"""
+    order_id: int
+    side: str
+    position_side: str
+    quantity: str
+    stop_price: str
+
+    @classmethod
+    def from_response(cls, data: Dict[str, Any]) -> "CascadeOrder":
+        """
+        Construit l'ordre suivi depuis la réponse REST de placement
+
+        Args:
+            data: Réponse de place_stop_market_order
+
+        Returns:
+            CascadeOrder
+        """
+        return cls(
+            order_id=int(data["orderId"]),
+            side=data.get("side", "").upper(),
+            position_side=data.get("positionSide", ""),
+            quantity=data.get("origQty", ""),
+            stop_price=data.get("stopPrice", "")
+        )
+
+
+_PROGRESSION_MODES = frozenset({"DOUBLE", "STEP"})
+
+# Côté d'ordre Binance <-> booléen is_buy (validé une fois à l'entrée WebSocket)
+_ORDER_SIDE_IS_BUY = {"BUY": True, "SELL": False}
+_ORDER_SIDES = ("SELL", "BUY")
+
+# Attributs mis à jour par une exécution, indexés par is_buy (SELL → SHORT, BUY → LONG)
+_POSITION_SIDES = ("SHORT", "LONG")
+_QTY_ATTRS = ("current_short_quantity", "current_long_quantity")
+_PRICE_ATTRS = ("initial_short_price", "initial_long_price")
+
+# Côté de l'ordre de fermeture par (positionSide, quantité > 0) ; absent si rien à fermer de ce côté
+_CLOSE_SIDES = {("LONG", True): "SELL", ("SHORT", False): "BUY"}
+
+# Côté du prochain ordre cascade, indexé par "plus de LONG que de SHORT"
+_CASCADE_TARGETS = ("LONG", "SHORT")
+
+
+def _next_cascade_quantity(double_mode: bool, leader: Decimal, follower: Decimal, step: Decimal) -> Decimal:
+    """
+    Quantité du prochain ordre cascade (calcul pur, sans état ni log)
+    
+    DOUBLE : 2 × leader - follower ; STEP : leader + step - follower.
+    
+    Args:
+        double_mode: True pour le mode DOUBLE, False pour le mode STEP
+        leader: Quantité du côté opposé (majoritaire)
+        follower: Quantité actuelle du côté de l'ordre
+        step: Pas du mode STEP
+        
+    Returns:
+        Quantité à commander (jamais négative)
+    """
+    quantity = (leader + leader if double_mode else leader + step) - follower
+    return quantity if quantity > _ZERO else _ZERO
+
+
+# Ensembles d'états de départ pour CascadeService._cas_state
+_WAITING_HEDGE = frozenset({CascadeState.WAITING_HEDGE})
+_ACTIVE_STATES = frozenset({CascadeState.WAITING_HEDGE, CascadeState.ACTIVE})
+_IDLE_STATES = frozenset({CascadeState.INACTIVE, CascadeState.WAITING_TP, CascadeState.STOPPED})
+
+
 class CascadeService:
     """Service de gestion du système de cascade trading"""
     
+    # Attributs fixes (accès par offset, sans __dict__ par instance), dans l'ordre de __init__
+    __slots__ = (
+        "logger", "binance_client", "tp_service", "trading_service",
+        "state", "_state_lock",
+        "initial_long_price", "initial_short_price",
+        "current_long_quantity", "current_short_quantity",
+        "cascade_orders_count", "pending_orders", "_order_handlers", "initial_step_size",
+        "initial_hedge_order", "initial_order_info", "_recent_fills",
+        "_cascade_legs", "_cascade_legs_key", "_cascade_schedule",
+        "_symbol_precision_cache", "_cached_symbol",
+        "_price_quant", "_qty_quant", "_price_decimals", "_qty_decimals",
+        "_exec_queue", "_exec_consumer", "_loop", "_loop_thread_id",
+        "_tp_dirty", "_tp_worker", "_tp_executed_side",
+        "_reset_executor", "_suspect_desync", "_display_cache_key", "_display_cache_value",
+        "_symbol", "_cascade_enabled", "_tp_enabled", "_max_orders", "_progression_mode",
+        "_retry_max_attempts", "_retry_delay_seconds",
+    )
+    
     def __init__(self, binance_client: BinanceAPIClient, tp_service=None) -> None:
         """Initialise le service cascade"""
         self.logger = get_module_logger("CascadeService")
@@ -32,38 +133,106 @@ class CascadeService:
         self.tp_service = tp_service
         self.trading_service = None  # Référence pour formatage dynamique
         
-        # État du système cascade
+        # État du système cascade (transitions conditionnelles via _cas_state)
         self.state: CascadeState = CascadeState.INACTIVE
+        self._state_lock = threading.Lock()
         
-        # Prix de référence (définis lors du trade initial + hedge)
-        self.initial_long_price: Optional[float] = None
-        self.initial_short_price: Optional[float] = None
+        # Prix de référence (définis lors du trade initial + hedge), en Decimal exact
+        self.initial_long_price: Optional[Decimal] = None
+        self.initial_short_price: Optional[Decimal] = None
         
-        # Quantités cumulatives des positions
-        self.current_long_quantity: float = 0.0
-        self.current_short_quantity: float = 0.0
+        # Quantités cumulatives des positions (Decimal : 2*L - S sans erreur binaire)
+        self.current_long_quantity: Decimal = _ZERO
+        self.current_short_quantity: Decimal = _ZERO
         
         # Compteur d'ordres cascade créés
         self.cascade_orders_count: int = 0
         
-        # Liste des ordres cascade en attente
-        self.pending_orders: List[Dict[str, Any]] = []
+        # Ordres cascade en attente indexés par ID (int), dans l'ordre de création
+        self.pending_orders: Dict[int, CascadeOrder] = {}
+        
+        # Traitement à appliquer par ID d'ordre suivi (int) : hedge initial et ordres cascade en attente
+        self._order_handlers: Dict[int, Callable[..., Awaitable[None]]] = {}
         
         # Taille du pas pour le mode STEP (sera définie au démarrage)
-        self.initial_step_size: float = 0.0
+        self.initial_step_size: Decimal = _ZERO
         
-        # Ordre hedge initial à surveiller
-        self.initial_hedge_order: Optional[Dict[str, Any]] = None
+        # Ordre hedge initial à surveiller (son order_id est la clé de _order_handlers)
+        self.initial_hedge_order: Optional[CascadeOrder] = None
         
         # Informations de l'ordre initial pour récupération du prix
         self.initial_order_info: Optional[Dict[str, Any]] = None
         
+        # Dernières exécutions FILLED non suivies (orderId → (prix moyen, quantité)),
+        # pour retrouver le prix de l'ordre initial sans requête REST
+        self._recent_fills: Dict[int, Tuple[Decimal, Decimal]] = {}
+        
+        # Ordres cascade pré-spécialisés par sens (côté, positionSide et stop formaté figés),
+        # indexés par "plus de LONG que de SHORT" : (jambe LONG, jambe SHORT).
+        # Reconstruits uniquement si les prix de référence changent
+        self._cascade_legs: Optional[Tuple[Callable[[str], None], Callable[[str], None]]] = None
+        self._cascade_legs_key: Optional[Tuple[Optional[Decimal], Optional[Decimal]]] = None
+        
+        # Séquence cascade pré-calculée à l'activation : (LONG, SHORT) attendus → (plus de LONG, quantité formatée).
+        # Utilisée tant que les exécutions suivent le plan, sinon calcul à partir des positions réelles
+        self._cascade_schedule: Dict[Tuple[Decimal, Decimal], Tuple[bool, str]] = {}
+        
         # Cache des informations de formatage pour éviter appels répétés
         self._symbol_precision_cache: Optional[Dict[str, Any]] = None
         self._cached_symbol: Optional[str] = None
         
+        # Quantificateurs Decimal (tick/step) et décimales, calculés une fois par symbole
+        self._price_quant: Optional[Decimal] = None
+        self._qty_quant: Optional[Decimal] = None
+        self._price_decimals: int = 2
+        self._qty_decimals: int = 3
+        
+        # Exécutions hedge/cascade traitées dans l'ordre d'arrivée par une seule tâche
+        # consommatrice (créée au premier message, dans la boucle d'événements capturée)
+        self._exec_queue: Optional[asyncio.Queue] = None
+        self._exec_consumer: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        
+        # Mises à jour TP après exécution regroupées par une tâche dédiée (une seule pour une rafale)
+        self._tp_dirty: Optional[asyncio.Event] = None
+        self._tp_worker: Optional[asyncio.Task] = None
+        self._tp_executed_side: str = ""
+        
+        # Pool dédié au reset sur TP : fermeture des positions et annulation des ordres en parallèle
+        self._reset_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="CascadeReset")
+        
+        # Positions réelles possiblement différentes des quantités locales (démarrage, nouveau trade,
+        # échec de fermeture) : la fermeture interroge alors Binance même si LONG=SHORT=0 localement
+        self._suspect_desync: bool = True
+        
+        # Dernier affichage cascade rendu et valeurs dont il dépend
+        self._display_cache_key: tuple = ()
+        self._display_cache_value: str = ""
+        
+        # Paramètres de configuration lus à chaque message WebSocket (voir _reload_config)
+        self._symbol: str = config.SYMBOL
+        self._cascade_enabled: bool = False
+        self._tp_enabled: bool = False
+        self._max_orders: int = 0
+        self._progression_mode: str = "STEP"
+        self._retry_max_attempts: int = 0
+        self._retry_delay_seconds: float = 0
+        self._reload_config()
+        
         self.logger.debug("CascadeService initialisé")
     
+    def _reload_config(self) -> None:
+        """Capture une seule fois les paramètres de config utilisés sur le chemin WebSocket"""
+        self._symbol = config.SYMBOL
+        self._cascade_enabled = bool(config.CASCADE_CONFIG["ENABLED"])
+        self._tp_enabled = bool(config.TP_CONFIG["ENABLED"])
+        self._max_orders = int(config.CASCADE_CONFIG["MAX_ORDERS"])
+        self._progression_mode = config.TRADING_CONFIG["PROGRESSION_MODE"]
+        self._retry_max_attempts = config.RECONNECTION_CONFIG["MAX_ATTEMPTS"]
+        self._retry_delay_seconds = config.RECONNECTION_CONFIG["DELAY_SECONDS"]
+    
+    @trace
     def handle_order_execution_from_websocket(self, execution_data: Dict[str, Any]) -> None:
         """
         Gère les exécutions d'ordres reçues via WebSocket User Data Stream
@@ -71,58 +240,139 @@ class CascadeService:
         Args:
             execution_data: Données d'exécution du WebSocket
         """
-        self.logger.debug("handle_order_execution_from_websocket called")
-        
         try:
-            order_id = str(execution_data.get("i"))  # Order ID
-            symbol = execution_data.get("s")         # Symbol
-            side = execution_data.get("S")           # Side (BUY/SELL)
-            executed_qty = float(execution_data.get("z", "0"))  # Executed quantity (cumulative)
-            execution_price = float(execution_data.get("L", "0"))  # Last executed price
-            order_status = execution_data.get("X", "UNKNOWN")  # Order status
-            position_side = execution_data.get("ps", "BOTH")  # Position side
+            g = execution_data.get
             
-            self.logger.info(f"📨 WebSocket: Ordre {order_status} {symbol} {side} {executed_qty} @ {execution_price} ID:{order_id}")
-            self.logger.info(f"🎯 État cascade actuel: {self.state}, Hedge order: {self.initial_hedge_order}")
+            # Ne traiter que les ordres FILLED (filtre avant toute conversion)
+            order_status = g("X", "UNKNOWN")  # Order status
+            if order_status != "FILLED":
+                self.logger.debug("Ordre non FILLED ignoré: %s ID:%s", order_status, g("i"))
+                return
             
             # Vérifier si c'est notre symbole
-            if symbol != config.SYMBOL:
-                self.logger.debug(f"Ordre non concerné (symbole différent): {symbol}")
-                return
-                
-            # Ne traiter que les ordres FILLED
-            if order_status != "FILLED":
-                self.logger.debug(f"Ordre non FILLED ignoré: {order_status} ID:{order_id}")
+            symbol = g("s")  # Symbol
+            if symbol != self._symbol:
+                self.logger.debug("Ordre non concerné (symbole différent): %s", symbol)
                 return
             
-            # Vérifier que les données critiques ne sont pas None
-            if not side or executed_qty is None or execution_price is None:
-                self.logger.error(f"Données d'exécution incomplètes: side={side}, qty={executed_qty}, price={execution_price}")
+            order_id = int(g("i", 0))                   # Order ID
+            side = g("S")                               # Side (BUY/SELL)
+            executed_qty = Decimal(g("z", "0"))         # Executed quantity (cumulative)
+            execution_price = Decimal(g("L", "0"))      # Last executed price
+            
+            self.logger.debug("📨 WebSocket: Ordre %s %s %s %s @ %s ID:%s",
+                              order_status, symbol, side, executed_qty, execution_price, order_id)
+            self.logger.debug("🎯 État cascade actuel: %s, Hedge order: %s", self.state, self.initial_hedge_order)
+            
+            # Valider le côté une fois ici : les traitements reçoivent directement is_buy
+            if side not in _ORDER_SIDE_IS_BUY:
+                self.logger.error("Données d'exécution incomplètes: side=%s, qty=%s, price=%s",
+                                  side, executed_qty, execution_price)
                 return
             
-            # Traiter selon le type d'ordre
-            if self._is_hedge_order(order_id):
-                self.logger.info("🎯 Ordre hedge initial détecté - Traitement en cours...")
-                self.logger.info(f"State cascade: {self.state}")
-                self.logger.info(f"Hedge order défini: {self.initial_hedge_order}")
-                
-                # Traitement immédiat du hedge en mode async
-                asyncio.create_task(self._process_hedge_execution_async(side, executed_qty, execution_price))
-                
-            elif self._is_cascade_order(order_id):
-                self.logger.info("🔄 Ordre cascade détecté")
-                
-                # Traitement immédiat du cascade en mode async
-                asyncio.create_task(self._process_cascade_execution_async(side, executed_qty, execution_price, order_id))
+            # Hedge initial ou ordre cascade : traitement par la tâche consommatrice (ordre d'arrivée conservé)
+            handler = self._order_handlers.get(order_id)
+            if handler is not None:
+                self._enqueue_execution((handler, _ORDER_SIDE_IS_BUY[side], executed_qty, execution_price, order_id))
                 
             else:
-                self.logger.info(f"❓ Ordre non suivi par le système cascade: {order_id}")
-                self.logger.info(f"📊 État cascade: {self.state}")
-                self.logger.info(f"📋 Hedge order: {self.initial_hedge_order}")
-                self.logger.info(f"📋 Pending orders count: {len(self.pending_orders)}")
+                # Mémoriser l'exécution (ex. ordre initial, dont le FILLED peut précéder start_cascade)
+                average_price = Decimal(g("ap", "0")) or execution_price
+                self._remember_fill(order_id, average_price, executed_qty)
+                
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info("❓ Ordre non suivi par le système cascade: %s", order_id)
+                    self.logger.info("📊 État cascade: %s", self.state)
+                    self.logger.info("📋 Hedge order: %s", self.initial_hedge_order)
+                    self.logger.info("📋 Pending orders count: %d", len(self.pending_orders))
                 
         except Exception as e:
-            self.logger.error(f"Erreur lors du traitement exécution WebSocket: {e}", exc_info=True)
+            self.logger.error("Erreur lors du traitement exécution WebSocket: %s", e, exc_info=True)
+    
+    def _remember_fill(self, order_id: int, price: Decimal, quantity: Decimal) -> None:
+        """
+        Mémorise une exécution reçue par WebSocket (table bornée aux 32 dernières)
+        
+        Args:
+            order_id: ID de l'ordre
+            price: Prix moyen d'exécution
+            quantity: Quantité exécutée cumulée
+        """
+        fills = self._recent_fills
+        fills[order_id] = (price, quantity)
+        if len(fills) > 32:
+            del fills[next(iter(fills))]
+    
+    def _enqueue_execution(self, item: tuple) -> None:
+        """
+        Transmet une exécution à la tâche consommatrice, depuis n'importe quel thread
+        
+        Le premier appel doit venir de la boucle d'événements, qui est alors capturée.
+        
+        Args:
+            item: (traitement, is_buy, quantity, price, order_id)
+        """
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self._loop_thread_id = threading.get_ident()
+        
+        if threading.get_ident() == self._loop_thread_id:
+            self._put_execution(item)
+        else:
+            self._loop.call_soon_threadsafe(self._put_execution, item)
+    
+    def _put_execution(self, item: tuple) -> None:
+        """
+        Dépose une exécution dans la file (boucle d'événements uniquement)
+        
+        Args:
+            item: (traitement, is_buy, quantity, price, order_id)
+        """
+        if self._exec_consumer is None or self._exec_consumer.done():
+            self._exec_queue = asyncio.Queue(maxsize=256)
+            self._exec_consumer = self._loop.create_task(self._consume_executions())
+        
+        try:
+            self._exec_queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.logger.error("File des exécutions cascade pleine - exécution ignorée: %s", item)
+    
+    async def _consume_executions(self) -> None:
+        """Traite les exécutions hedge/cascade une par une, dans l'ordre de réception"""
+        queue = self._exec_queue
+        while True:
+            handler, *args = await queue.get()
+            try:
+                await handler(*args)
+            except Exception as e:
+                self.logger.error("Erreur traitement exécution %s: %s", handler.__name__, e, exc_info=True)
+            finally:
+                queue.task_done()
+    
+    def _schedule_tp_update(self, executed_side: str) -> None:
+        """
+        Demande une mise à jour de tous les TP, regroupée avec celles qui suivent de près
+        (boucle d'événements uniquement)
+        
+        Args:
+            executed_side: Côté du dernier ordre exécuté (BUY ou SELL)
+        """
+        if self._tp_worker is None or self._tp_worker.done():
+            self._tp_dirty = asyncio.Event()
+            self._tp_worker = self._loop.create_task(self._tp_update_worker())
+        
+        self._tp_executed_side = executed_side
+        self._tp_dirty.set()
+    
+    async def _tp_update_worker(self) -> None:
+        """Applique les mises à jour TP demandées, au plus une fois par fenêtre de _TP_UPDATE_DELAY"""
+        dirty = self._tp_dirty
+        while True:
+            await dirty.wait()
+            await asyncio.sleep(_TP_UPDATE_DELAY)
+            # Les demandes arrivées pendant le délai sont couvertes par cette mise à jour
+            dirty.clear()
+            self._update_tp_after_cascade(self._tp_executed_side)
     
     def set_trading_service_reference(self, trading_service) -> None:
         """
@@ -134,6 +384,9 @@ class CascadeService:
         self.trading_service = trading_service
         self.logger.debug("Référence TradingService définie dans CascadeService")
         
+        # Rafraîchir les paramètres capturés
+        self._reload_config()
+        
         # Précharger le cache de précision pour le symbole actuel
         self._cache_symbol_precision()
     
@@ -144,7 +397,7 @@ class CascadeService:
         Returns:
             True si cascade active, False sinon
         """
-        return self.state in [CascadeState.WAITING_HEDGE, CascadeState.ACTIVE]
+        return self.state in _ACTIVE_STATES
     
     def start_cascade(
         self, 
@@ -160,17 +413,21 @@ class CascadeService:
         """
         self.logger.debug("start_cascade called")
         
-        if not config.CASCADE_CONFIG["ENABLED"]:
+        # Nouveau trade ouvert hors du suivi local (même si la cascade est désactivée)
+        self._suspect_desync = True
+        
+        if not self._cascade_enabled:
             self.logger.info("Système cascade désactivé dans la configuration")
             return
         
-        if self.is_cascade_active():
+        # Réserver la cascade : un seul démarrage possible hors cascade active
+        if not self._cas_state(_IDLE_STATES, CascadeState.WAITING_HEDGE):
             self.logger.warning("Cascade déjà active - ignoré")
             return
         
         try:
-            # Réinitialiser l'état
-            self._reset_cascade_state()
+            # Réinitialiser l'état (en restant en attente hedge)
+            self._reset_cascade_state(CascadeState.WAITING_HEDGE)
             
             # Stocker les IDs d'ordres pour récupération ultérieure des prix
             initial_order_id = initial_order.get("orderId")
@@ -179,43 +436,76 @@ class CascadeService:
             hedge_order_id = hedge_order.get("orderId")
             hedge_side = hedge_order.get("side", "").upper()
             
-            self.logger.info(f"Cascade démarrée - Initial: {initial_side} ID:{initial_order_id}, Hedge: {hedge_side} ID:{hedge_order_id}")
+            self.logger.info("Cascade démarrée - Initial: %s ID:%s, Hedge: %s ID:%s", initial_side, initial_order_id, hedge_side, hedge_order_id)
             
             # Stocker les informations pour récupération des prix après exécution
             self.initial_order_info = {
                 "id": initial_order_id,
                 "side": initial_side,
-                "symbol": config.SYMBOL
+                "symbol": self._symbol
             }
             
-            # Stocker l'ordre hedge à surveiller
-            self.initial_hedge_order = hedge_order
+            # Ordre initial déjà exécuté dans la réponse (ex. newOrderRespType=RESULT) :
+            # son prix est connu sans attendre l'événement WebSocket ni interroger l'API
+            if initial_order_id is not None and initial_order.get("status") == "FILLED":
+                average_price = Decimal(initial_order.get("avgPrice") or "0")
+                if average_price > 0:
+                    self._remember_fill(int(initial_order_id), average_price, Decimal(initial_order.get("executedQty") or "0"))
             
-            # Démarrer en mode attente hedge
-            self.state = CascadeState.WAITING_HEDGE
+            # Stocker l'ordre hedge à surveiller
+            if hedge_order_id is not None:
+                self.initial_hedge_order = CascadeOrder.from_response(hedge_order)
+                self._order_handlers[self.initial_hedge_order.order_id] = self._process_hedge_execution
             
             self.logger.info("✅ Cascade initialisée - En attente d'exécution via WebSocket")
-            self.logger.info(f"🔄 Prix de référence: LONG={self.initial_long_price}, SHORT={self.initial_short_price}")
-            self.logger.info(f"Positions: LONG={self.current_long_quantity}, SHORT={self.current_short_quantity}")
+            self.logger.info("🔄 Prix de référence: LONG=%s, SHORT=%s", self.initial_long_price, self.initial_short_price)
+            self.logger.info("Positions: LONG=%s, SHORT=%s", self.current_long_quantity, self.current_short_quantity)
             
         except Exception as e:
-            self.logger.error(f"Erreur lors du démarrage cascade: {e}", exc_info=True)
+            self.logger.error("Erreur lors du démarrage cascade: %s", e, exc_info=True)
             self._reset_cascade_state()
     
-    def _reset_cascade_state(self) -> None:
-        """Remet à zéro l'état de la cascade"""
+    def _cas_state(self, expected: FrozenSet[CascadeState], new: CascadeState) -> bool:
+        """
+        Passe à l'état new seulement si l'état courant est dans expected (compare-and-set)
+        
+        Args:
+            expected: États de départ acceptés
+            new: Nouvel état
+            
+        Returns:
+            True si la transition a eu lieu, False sinon
+        """
+        with self._state_lock:
+            if self.state in expected:
+                self.state = new
+                return True
+        self.logger.debug("Transition %s → %s refusée", self.state.value, new.value)
+        return False
+    
+    def _reset_cascade_state(self, state: CascadeState = CascadeState.INACTIVE) -> None:
+        """
+        Remet à zéro l'état de la cascade
+        
+        Args:
+            state: État cascade après remise à zéro
+        """
         self.logger.debug("_reset_cascade_state called")
         
-        self.state = CascadeState.INACTIVE
+        self.state = state
         self.initial_long_price = None
         self.initial_short_price = None
-        self.current_long_quantity = 0.0
-        self.current_short_quantity = 0.0
-        self.initial_step_size = 0.0
+        self.current_long_quantity = _ZERO
+        self.current_short_quantity = _ZERO
+        self.initial_step_size = _ZERO
         self.cascade_orders_count = 0
         self.pending_orders.clear()
+        self._order_handlers.clear()
         self.initial_hedge_order = None
         self.initial_order_info = None
+        self._cascade_legs = None
+        self._cascade_legs_key = None
+        self._cascade_schedule.clear()
         
         self.logger.info("État cascade réinitialisé")
     
@@ -239,27 +529,34 @@ class CascadeService:
                 self.logger.error("Informations ordre initial manquantes")
                 return
 
-            # Récupérer le statut de l'ordre initial
-            order_status = self.binance_client.get_order_status(symbol, int(order_id))
-
-            if order_status and order_status.get("status") == "FILLED":
-                executed_price = float(order_status.get("avgPrice", "0"))
-                executed_qty = float(order_status.get("executedQty", "0"))
+            # Exécution déjà reçue par WebSocket ; sinon (événement manqué) statut via REST
+            ws_fill = self._recent_fills.pop(int(order_id), None)
+            if ws_fill is not None:
+                executed_price, executed_qty = ws_fill
+                source = "WebSocket"
+            else:
+                order_status = self.binance_client.get_order_status(symbol, int(order_id))
+                if not order_status or order_status.get("status") != "FILLED":
+                    return
+                executed_price = Decimal(order_status.get("avgPrice", "0"))
+                executed_qty = Decimal(order_status.get("executedQty", "0"))
+                source = "API"
 
-                self.logger.info(f"✅ Prix ordre initial récupéré: {order_side} {executed_qty} @ {executed_price}")
+            if executed_price > 0:
+                self.logger.info("✅ Prix ordre initial récupéré: %s %s @ %s", order_side, executed_qty, executed_price)
 
                 # Définir le prix et la quantité selon le côté
                 if order_side == "BUY":
                     self.initial_long_price = executed_price
                     self.current_long_quantity = executed_qty
-                    self.logger.info(f"Prix LONG initial défini via API: {executed_price}")
+                    self.logger.info("Prix LONG initial défini via %s: %s", source, executed_price)
                 else:
                     self.initial_short_price = executed_price
                     self.current_short_quantity = executed_qty
-                    self.logger.info(f"Prix SHORT initial défini via API: {executed_price}")
+                    self.logger.info("Prix SHORT initial défini via %s: %s", source, executed_price)
 
         except Exception as e:
-            self.logger.error(f"Erreur lors de la récupération du prix initial: {e}", exc_info=True)
+            self.logger.error("Erreur lors de la récupération du prix initial: %s", e, exc_info=True)
     
     async def _create_next_cascade_order_with_retry(self, retry_count: int = 0) -> None:
         """
@@ -268,8 +565,8 @@ class CascadeService:
         Args:
             retry_count: Nombre de tentatives déjà effectuées
         """
-        max_attempts = config.RECONNECTION_CONFIG["MAX_ATTEMPTS"]
-        delay_seconds = config.RECONNECTION_CONFIG["DELAY_SECONDS"]
+        max_attempts = self._retry_max_attempts
+        delay_seconds = self._retry_delay_seconds
         
         try:
             # Appeler la méthode originale de création d'ordre
@@ -282,15 +579,15 @@ class CascadeService:
             # Cas 1: Fonds insuffisants → Arrêter cascade et attendre TP
             if "margin is insufficient" in error_msg or "insufficient" in error_msg:
                 self.logger.warning("💰 Fonds insuffisants détectés - Arrêt cascade et attente TP")
-                self.logger.warning(f"   Erreur Binance: {str(e)}")
-                self.logger.info(f"   Positions actuelles: LONG={self.current_long_quantity:.3f}, SHORT={self.current_short_quantity:.3f}")
+                self.logger.warning("   Erreur Binance: %s", str(e))
+                self.logger.info("   Positions actuelles: LONG=%.3f, SHORT=%.3f", self.current_long_quantity, self.current_short_quantity)
                 self.logger.info("🔄 État cascade → WAITING_TP (TP restent actifs)")
                 
                 # Passer en mode attente TP
-                self.state = CascadeState.WAITING_TP
+                self._cas_state(_ACTIVE_STATES, CascadeState.WAITING_TP)
                 
                 # Nettoyer les ordres pending mais garder les TP actifs
-                self.pending_orders.clear()
+                self._forget_pending_orders()
                 
                 self.logger.info("⏳ Cascade en attente - Le système reprendra au prochain signal après TP")
                 return
@@ -299,10 +596,10 @@ class CascadeService:
             else:
                 if retry_count < max_attempts:
                     retry_count += 1
-                    self.logger.warning(f"⚠️ Échec création cascade (tentative {retry_count}/{max_attempts}): {e}")
-                    self.logger.warning(f"   Type d'erreur: {type(e).__name__}")
-                    self.logger.warning(f"   Message complet: {str(e)}")
-                    self.logger.info(f"🔄 Retry dans {delay_seconds}s...")
+                    self.logger.warning("⚠️ Échec création cascade (tentative %s/%s): %s", retry_count, max_attempts, e)
+                    self.logger.warning("   Type d'erreur: %s", type(e).__name__)
+                    self.logger.warning("   Message complet: %s", str(e))
+                    self.logger.info("🔄 Retry dans %ss...", delay_seconds)
                     
                     # Attendre avant retry
                     await asyncio.sleep(delay_seconds)
@@ -311,10 +608,9 @@ class CascadeService:
                     await self._create_next_cascade_order_with_retry(retry_count)
                 else:
                     # Max attempts atteint → Arrêter cascade
-                    self.logger.error(f"❌ Échec création cascade après {max_attempts} tentatives - Arrêt")
-                    self.logger.error(f"Dernière erreur: {e}", exc_info=True)
+                    self.logger.error("❌ Échec création cascade après %s tentatives - Arrêt", max_attempts)
+                    self.logger.error("Dernière erreur: %s", e, exc_info=True)
                     
-                    self.state = CascadeState.STOPPED
                     self.stop_cascade("Échecs répétés création ordres")
     
     def _update_tp_after_cascade(self, executed_side: str) -> None:
@@ -324,66 +620,53 @@ class CascadeService:
         Args:
             executed_side: Côté de l'ordre cascade exécuté (BUY ou SELL)
         """
-        self.logger.debug(f"_update_tp_after_cascade called: {executed_side}")
+        self.logger.debug("_update_tp_after_cascade called: %s", executed_side)
         
         if not self.tp_service:
             self.logger.debug("Service TP non disponible")
             return
         
         try:
-            from core.tp_service import TPSide
+            self.logger.info("🔄 Cascade %s exécutée - Mise à jour TOUS les TP avec +0.1%%", executed_side)
             
-            self.logger.info(f"🔄 Cascade {executed_side} exécutée - Mise à jour TOUS les TP avec +0.1%")
-            
-            # Mettre à jour TP LONG s'il existe et qu'on a une position LONG
+            # TP LONG (incrémente le compteur de position) puis TP SHORT, en une seule mise à jour groupée
+            updates = []
             if self.current_long_quantity > 0:
-                success_long = self.tp_service.create_or_update_tp(
-                    side=TPSide.LONG,
-                    quantity=self.current_long_quantity,
-                    increment_position=True  # True = incrémenter compteur position
-                )
-                
-                if success_long:
-                    self.logger.info(f"✅ TP LONG mis à jour avec +0.1% après cascade (quantité: {self.current_long_quantity})")
-                else:
-                    self.logger.warning(f"⚠️ Échec mise à jour TP LONG après cascade")
-            
-            # Mettre à jour TP SHORT s'il existe et qu'on a une position SHORT
+                updates.append((TPSide.LONG, self.current_long_quantity, True))
             if self.current_short_quantity > 0:
-                success_short = self.tp_service.create_or_update_tp(
-                    side=TPSide.SHORT,
-                    quantity=self.current_short_quantity,
-                    increment_position=False  # False = ne pas incrémenter (déjà fait pour LONG)
-                )
-                
-                if success_short:
-                    self.logger.info(f"✅ TP SHORT mis à jour avec -0.1% après cascade (quantité: {self.current_short_quantity})")
+                updates.append((TPSide.SHORT, self.current_short_quantity, False))
+            
+            if not updates:
+                return
+            
+            for tp_side, success in self.tp_service.create_or_update_tp_batch(updates).items():
+                quantity = self.current_long_quantity if tp_side == TPSide.LONG else self.current_short_quantity
+                if success:
+                    self.logger.info("✅ TP %s mis à jour après cascade (quantité: %s)", tp_side.value, quantity)
                 else:
-                    self.logger.warning(f"⚠️ Échec mise à jour TP SHORT après cascade")
+                    self.logger.warning("⚠️ Échec mise à jour TP %s après cascade", tp_side.value)
                 
         except Exception as e:
-            self.logger.error(f"Erreur lors de la mise à jour TP après cascade: {e}", exc_info=True)
+            self.logger.error("Erreur lors de la mise à jour TP après cascade: %s", e, exc_info=True)
     
-    def _create_tp_for_hedge_execution(self, side: str, quantity: float) -> None:
+    def _create_tp_for_hedge_execution(self, is_buy: bool, quantity: Decimal) -> None:
         """
         Met à jour les TP quand le hedge s'exécute : TP existant +0.1% et nouveau TP hedge
         
         Args:
-            side: Côté de l'ordre hedge exécuté (BUY ou SELL)
+            is_buy: True si le hedge exécuté est un BUY, False pour SELL
             quantity: Quantité de l'ordre hedge exécuté
         """
-        self.logger.debug(f"_create_tp_for_hedge_execution called: {side} {quantity}")
+        self.logger.debug("_create_tp_for_hedge_execution called: %s %s", _ORDER_SIDES[is_buy], quantity)
         
         if not self.tp_service:
             self.logger.debug("Service TP non disponible")
             return
         
         try:
-            from core.tp_service import TPSide
-            
-            self.logger.info(f"🔄 Hedge {side} exécuté - Mise à jour TP avec increment +0.1%")
+            self.logger.info("🔄 Hedge %s exécuté - Mise à jour TP avec increment +0.1%%", _ORDER_SIDES[is_buy])
             
-            if side == "BUY":
+            if is_buy:
                 # Hedge BUY exécuté → position LONG augmentée
                 existing_tp_side = TPSide.SHORT  # TP existant (si on avait SHORT initial)
                 new_tp_side = TPSide.LONG        # Nouveau TP pour position LONG du hedge
@@ -397,154 +680,194 @@ class CascadeService:
                 existing_quantity = self.current_long_quantity
                 new_quantity = self.current_short_quantity
             
-            # 1. Mettre à jour le TP existant avec +0.1% (incrément)
+            # 1. TP existant avec +0.1% (incrément), 2. TP du nouveau côté hedge, en un seul envoi groupé
+            updates = []
             if existing_quantity > 0:
-                success_existing = self.tp_service.create_or_update_tp(
-                    side=existing_tp_side,
-                    quantity=existing_quantity,
-                    increment_position=True  # True = incrémenter compteur position
-                )
-                
-                if success_existing:
-                    self.logger.info(f"✅ TP {existing_tp_side.value} existant mis à jour avec +0.1% (quantité: {existing_quantity})")
+                updates.append((existing_tp_side, existing_quantity, True))
+            if new_quantity > 0:
+                updates.append((new_tp_side, new_quantity, False))
+            
+            if not updates:
+                return
+            
+            results = self.tp_service.create_or_update_tp_batch(updates)
+            
+            if existing_tp_side in results:
+                if results[existing_tp_side]:
+                    self.logger.info("✅ TP %s existant mis à jour avec +0.1%% (quantité: %s)", existing_tp_side.value, existing_quantity)
                 else:
-                    self.logger.warning(f"⚠️ Échec mise à jour TP {existing_tp_side.value} existant")
+                    self.logger.warning("⚠️ Échec mise à jour TP %s existant", existing_tp_side.value)
             
-            # 2. Créer TP pour le nouveau côté hedge avec -0.1% 
-            if new_quantity > 0:
-                success_new = self.tp_service.create_or_update_tp(
-                    side=new_tp_side,
-                    quantity=new_quantity,
-                    increment_position=False  # False = ne pas incrémenter (déjà fait pour côté existant)
-                )
-                
-                if success_new:
-                    self.logger.info(f"✅ TP {new_tp_side.value} créé pour hedge avec -0.1% (quantité: {new_quantity})")
+            if new_tp_side in results:
+                if results[new_tp_side]:
+                    self.logger.info("✅ TP %s créé pour hedge avec -0.1%% (quantité: %s)", new_tp_side.value, new_quantity)
                 else:
-                    self.logger.warning(f"⚠️ Échec création TP {new_tp_side.value} pour hedge")
+                    self.logger.warning("⚠️ Échec création TP %s pour hedge", new_tp_side.value)
                 
         except Exception as e:
-            self.logger.error(f"Erreur lors de la mise à jour TP pour hedge: {e}", exc_info=True)
+            self.logger.error("Erreur lors de la mise à jour TP pour hedge: %s", e, exc_info=True)
     
-    def _calculate_cascade_quantity(self, target_side: str) -> float:
+    def _calculate_cascade_quantity(self, long_heavier: bool) -> Decimal:
         """
         Calcule la quantité du prochain ordre cascade selon le mode de progression
         
         Args:
-            target_side: "LONG" ou "SHORT" - côté de l'ordre à créer
+            long_heavier: True si plus de LONG que de SHORT (ordre SHORT), False sinon (ordre LONG)
             
         Returns:
             Quantité à commander
         """
-        self.logger.debug(f"_calculate_cascade_quantity called for {target_side}")
+        self.logger.debug("_calculate_cascade_quantity called: long_heavier=%s", long_heavier)
         
         try:
-            progression_mode = config.TRADING_CONFIG["PROGRESSION_MODE"]
-            self.logger.debug(f"Mode de progression: {progression_mode}")
+            if self._progression_mode not in _PROGRESSION_MODES:
+                self.logger.error("Mode de progression invalide: %s", self._progression_mode)
+                return _ZERO
             
-            if progression_mode == "DOUBLE":
-                # Logique actuelle : doublage
-                if target_side == "SHORT":
-                    # Plus de LONG → Créer SHORT
-                    # Quantité = 2 * current_long_quantity - current_short_quantity
-                    quantity = (2 * self.current_long_quantity) - self.current_short_quantity
-                    self.logger.info(f"Mode DOUBLE SHORT: (2 × {self.current_long_quantity}) - {self.current_short_quantity} = {quantity}")
-                else:  # target_side == "LONG"
-                    # Plus de SHORT → Créer LONG
-                    # Quantité = 2 * current_short_quantity - current_long_quantity
-                    quantity = (2 * self.current_short_quantity) - self.current_long_quantity
-                    self.logger.info(f"Mode DOUBLE LONG: (2 × {self.current_short_quantity}) - {self.current_long_quantity} = {quantity}")
-                    
-            elif progression_mode == "STEP":
-                # Nouvelle logique : incrémentation par pas
-                if target_side == "SHORT":
-                    # Objectif : current_long_quantity + step
-                    target_quantity = self.current_long_quantity + self.initial_step_size
-                    # Quantité à commander = target - quantité actuelle du même côté
-                    quantity = target_quantity - self.current_short_quantity
-                    self.logger.info(f"Mode STEP SHORT: target={target_quantity} (LONG:{self.current_long_quantity} + step:{self.initial_step_size}) - current_SHORT:{self.current_short_quantity} = {quantity}")
-                else:  # target_side == "LONG"
-                    # Objectif : current_short_quantity + step  
-                    target_quantity = self.current_short_quantity + self.initial_step_size
-                    # Quantité à commander = target - quantité actuelle du même côté
-                    quantity = target_quantity - self.current_long_quantity
-                    self.logger.info(f"Mode STEP LONG: target={target_quantity} (SHORT:{self.current_short_quantity} + step:{self.initial_step_size}) - current_LONG:{self.current_long_quantity} = {quantity}")
-                    
-            else:
-                self.logger.error(f"Mode de progression invalide: {progression_mode}")
-                return 0
-                
-            return max(quantity, 0)  # S'assurer que la quantité n'est pas négative
+            # Côté à rattraper (leader) et côté renforcé par l'ordre (follower), sans branche
+            long_qty, short_qty = self.current_long_quantity, self.current_short_quantity
+            leader, follower = ((short_qty, long_qty), (long_qty, short_qty))[long_heavier]
+            
+            quantity = _next_cascade_quantity(self._progression_mode == "DOUBLE", leader, follower, self.initial_step_size)
+            self.logger.info("Mode %s %s: leader=%s follower=%s step=%s → %s", self._progression_mode, _CASCADE_TARGETS[long_heavier], leader, follower, self.initial_step_size, quantity)
+            return quantity
             
         except Exception as e:
-            self.logger.error(f"Erreur lors du calcul de quantité cascade: {e}", exc_info=True)
-            return 0
+            self.logger.error("Erreur lors du calcul de quantité cascade: %s", e, exc_info=True)
+            return _ZERO
+    
+    def _build_cascade_schedule(self) -> None:
+        """
+        Pré-calcule la séquence des ordres cascade à partir des positions actuelles
+        
+        Applique la règle d'alternance MAX_ORDERS fois en supposant chaque ordre
+        exécuté en totalité ; chaque étape est indexée par les positions attendues
+        et porte sa quantité déjà formatée selon les règles du symbole. Les positions
+        avancent de cette quantité formatée (arrondie au step), celle réellement exécutée.
+        """
+        self._cascade_schedule.clear()
+        
+        if self._progression_mode not in _PROGRESSION_MODES:
+            return
+        
+        double_mode = self._progression_mode == "DOUBLE"
+        long_qty, short_qty = self.current_long_quantity, self.current_short_quantity
+        
+        for _ in range(self._max_orders):
+            long_heavier = long_qty > short_qty
+            leader, follower = ((short_qty, long_qty), (long_qty, short_qty))[long_heavier]
+            quantity = _next_cascade_quantity(double_mode, leader, follower, self.initial_step_size)
+            formatted_quantity = self._format_cascade_quantity(quantity) if quantity > 0 else None
+            if not formatted_quantity:
+                break
+            
+            self._cascade_schedule[(long_qty, short_qty)] = (long_heavier, formatted_quantity)
+            filled_quantity = Decimal(formatted_quantity)
+            if long_heavier:
+                short_qty += filled_quantity
+            else:
+                long_qty += filled_quantity
+        
+        self.logger.info("Séquence cascade pré-calculée: %d ordres (mode %s)", len(self._cascade_schedule), self._progression_mode)
     
     async def _create_next_cascade_order(self) -> None:
         """Crée le prochain ordre cascade selon la logique d'alternance"""
         self.logger.debug("_create_next_cascade_order called")
         
         try:
-            # Déterminer quel type d'ordre créer (alternance)
-            if self.current_long_quantity > self.current_short_quantity:
-                # Plus de LONG → Créer SHORT
-                next_side = "SELL"
-                next_position_side = "SHORT"
-                stop_price = self.initial_short_price
-                next_quantity = self._calculate_cascade_quantity("SHORT")
-            else:
-                # Plus de SHORT → Créer LONG
-                next_side = "BUY"
-                next_position_side = "LONG"
-                stop_price = self.initial_long_price
-                next_quantity = self._calculate_cascade_quantity("LONG")
-            
-            
-            if next_quantity <= 0:
-                self.logger.error(f"Quantité cascade invalide: {next_quantity}")
-                return
-            
-            # Vérifier que stop_price est valide
-            if stop_price is None or stop_price <= 0:
-                self.logger.error(f"Prix de stop invalide: {stop_price}")
-                self.logger.error("Les prix de référence ne sont pas correctement initialisés")
+            legs = self._get_cascade_legs()
+            if legs is None:
                 return
             
-            # Formater la quantité selon les règles du symbole
-            formatted_quantity = self._format_cascade_quantity(next_quantity)
-            
-            if not formatted_quantity:
-                self.logger.error("Impossible de formater la quantité cascade")
-                return
-            
-            # Formater le prix selon les règles du symbole
-            formatted_stop_price = self._format_cascade_price(stop_price)
-            
-            # Créer l'ordre STOP_MARKET
-            self.logger.info(f"📋 Création ordre cascade: {next_side} {formatted_quantity} @ {formatted_stop_price}")
-            
-            cascade_order = self.binance_client.place_stop_market_order(
-                symbol=config.SYMBOL,
-                side=next_side,
-                quantity=formatted_quantity,
-                stop_price=formatted_stop_price,  # Utiliser prix formaté
-                position_side=next_position_side
-            )
-            
-            if cascade_order:
-                # Ajouter à la liste des ordres en attente
-                self.pending_orders.append(cascade_order)
-                self.cascade_orders_count += 1
-                
-                self.logger.info(f"✅ Ordre cascade créé - ID: {cascade_order.get('orderId')}")
+            # Ordre prévu par la séquence pré-calculée si les positions correspondent au plan
+            planned = self._cascade_schedule.get((self.current_long_quantity, self.current_short_quantity))
+            if planned is not None:
+                long_heavier, formatted_quantity = planned
+                self.logger.debug("Ordre cascade planifié: %s %s", _CASCADE_TARGETS[long_heavier], formatted_quantity)
             else:
-                self.logger.error("❌ Échec de création de l'ordre cascade")
-                self._handle_cascade_order_failure(next_side, formatted_quantity, stop_price)
+                # Déterminer quel type d'ordre créer (alternance) : plus de LONG → SHORT, sinon LONG
+                long_heavier = self.current_long_quantity > self.current_short_quantity
+                next_quantity = self._calculate_cascade_quantity(long_heavier)
+                
+                if next_quantity <= 0:
+                    self.logger.error("Quantité cascade invalide: %s", next_quantity)
+                    return
+                
+                # Formater la quantité selon les règles du symbole
+                formatted_quantity = self._format_cascade_quantity(next_quantity)
+                if not formatted_quantity:
+                    self.logger.error("Impossible de formater la quantité cascade")
+                    return
+            
+            legs[long_heavier](formatted_quantity)
                 
         except Exception as e:
-            self.logger.error(f"Erreur lors de la création de l'ordre cascade: {e}", exc_info=True)
+            self.logger.error("Erreur lors de la création de l'ordre cascade: %s", e, exc_info=True)
+    
+    def _get_cascade_legs(self) -> Optional[Tuple[Callable[[str], None], Callable[[str], None]]]:
+        """
+        Retourne les ordres cascade spécialisés par sens, construits une fois par jeu de prix de référence
+        
+        Returns:
+            (jambe LONG, jambe SHORT) attendant la quantité formatée, ou None si prix invalides
+        """
+        key = (self.initial_long_price, self.initial_short_price)
+        if self._cascade_legs is not None and self._cascade_legs_key == key:
+            return self._cascade_legs
+        
+        # Vérifier que les prix de stop sont valides
+        for stop_price in key:
+            if stop_price is None or stop_price <= 0:
+                self.logger.error("Prix de stop invalide: %s", stop_price)
+                self.logger.error("Les prix de référence ne sont pas correctement initialisés")
+                return None
+        
+        # Formater les prix une seule fois selon les règles du symbole
+        self._cascade_legs = (
+            functools.partial(
+                self._place_cascade_order, "BUY", "LONG", self._format_cascade_price(self.initial_long_price)
+            ),
+            functools.partial(
+                self._place_cascade_order, "SELL", "SHORT", self._format_cascade_price(self.initial_short_price)
+            ),
+        )
+        self._cascade_legs_key = key
+        return self._cascade_legs
+    
+    def _place_cascade_order(self, side: str, position_side: str, formatted_stop_price: str, formatted_quantity: str) -> None:
+        """
+        Place un ordre cascade STOP_MARKET avec les paramètres figés du sens
+        
+        Args:
+            side: Côté de l'ordre (BUY/SELL)
+            position_side: LONG ou SHORT
+            formatted_stop_price: Prix de stop déjà formaté
+            formatted_quantity: Quantité à commander, déjà formatée
+        """
+        # Créer l'ordre STOP_MARKET
+        self.logger.info("📋 Création ordre cascade: %s %s @ %s", side, formatted_quantity, formatted_stop_price)
+        
+        cascade_order = self.binance_client.place_stop_market_order(
+            symbol=self._symbol,
+            side=side,
+            quantity=formatted_quantity,
+            stop_price=formatted_stop_price,
+            position_side=position_side
+        )
+        
+        if cascade_order:
+            # Ajouter aux ordres en attente
+            order_id = int(cascade_order["orderId"])
+            self.pending_orders[order_id] = CascadeOrder(order_id, side, position_side, formatted_quantity, formatted_stop_price)
+            self._order_handlers[order_id] = self._process_cascade_execution
+            self.cascade_orders_count += 1
+            
+            self.logger.info("✅ Ordre cascade créé - ID: %s", order_id)
+        else:
+            self.logger.error("❌ Échec de création de l'ordre cascade")
+            self._handle_cascade_order_failure(side, formatted_quantity, formatted_stop_price)
     
-    def _handle_cascade_order_failure(self, side: str, quantity: str, stop_price: float) -> None:
+    def _handle_cascade_order_failure(self, side: str, quantity: str, stop_price: str) -> None:
         """
         Gère les échecs de création d'ordres cascade - Arrête juste les cascades sans reset complet
         
@@ -553,17 +876,18 @@ class CascadeService:
             quantity: Quantité formatée
             stop_price: Prix de stop utilisé
         """
-        self.logger.debug(f"_handle_cascade_order_failure called: {side} {quantity} @ {stop_price}")
-        self.logger.warning(f"⚠️ Échec création ordre cascade {side} - Arrêt des cascades uniquement")
+        self.logger.debug("_handle_cascade_order_failure called: %s %s @ %s", side, quantity, stop_price)
+        self.logger.warning("⚠️ Échec création ordre cascade %s - Arrêt des cascades uniquement", side)
         
         # Ajouter des métriques pour debugging
-        self.logger.info(f"État au moment de l'échec:")
-        self.logger.info(f"  Ordres créés: {self.cascade_orders_count}/{config.CASCADE_CONFIG['MAX_ORDERS']}")
-        self.logger.info(f"  Positions: LONG={self.current_long_quantity} SHORT={self.current_short_quantity}")
-        self.logger.info(f"  Prix références: LONG={self.initial_long_price} SHORT={self.initial_short_price}")
+        self.logger.info("État au moment de l'échec:")
+        self.logger.info("  Ordres créés: %s/%s", self.cascade_orders_count, self._max_orders)
+        self.logger.info("  Positions: LONG=%s SHORT=%s", self.current_long_quantity, self.current_short_quantity)
+        self.logger.info("  Prix références: LONG=%s SHORT=%s", self.initial_long_price, self.initial_short_price)
         
         # Simplement arrêter la cascade - LES POSITIONS ET TP RESTENT ACTIFS
-        self.state = CascadeState.STOPPED
+        if not self._cas_state(_ACTIVE_STATES, CascadeState.STOPPED):
+            return
         
         self.logger.info("🔄 Cascade arrêtée - Positions et TP restent actifs pour atteindre les TP")
     
@@ -574,13 +898,13 @@ class CascadeService:
         if not self.trading_service:
             return
             
-        symbol = config.SYMBOL
+        symbol = self._symbol
         
         # Vérifier si déjà en cache pour ce symbole
         if self._cached_symbol == symbol and self._symbol_precision_cache:
             return
         
-        self.logger.debug(f"Mise en cache des informations de précision pour {symbol}")
+        self.logger.debug("Mise en cache des informations de précision pour %s", symbol)
         
         # Récupérer et mettre en cache
         precision_info = self.trading_service.get_symbol_precision(symbol)
@@ -591,11 +915,49 @@ class CascadeService:
             tick_size = precision_info["price_filter"]["tick_size"]
             step_size = precision_info["lot_size"]["step_size"]
             
-            self.logger.info(f"Cache formatage Cascade: tick_size={tick_size}, step_size={step_size}")
+            # Pré-calcul des quantificateurs pour éviter Decimal(str(...)) à chaque ordre
+            self._price_quant = Decimal(str(tick_size)) if tick_size else None
+            self._qty_quant = Decimal(str(step_size)) if step_size else None
+            self._price_decimals = self._decimal_places(self._price_quant, 2)
+            self._qty_decimals = self._decimal_places(self._qty_quant, 3)
+            
+            self.logger.info("Cache formatage Cascade: tick_size=%s, step_size=%s", tick_size, step_size)
         else:
             self.logger.warning("Impossible de mettre en cache les informations de précision")
     
-    def _format_cascade_quantity(self, quantity: float) -> Optional[str]:
+    @staticmethod
+    def _decimal_places(quant: Optional[Decimal], default: int) -> int:
+        """
+        Nombre de décimales d'un pas Decimal (tick_size ou step_size)
+        
+        Args:
+            quant: Pas de cotation
+            default: Valeur si le pas est absent ou non fini
+            
+        Returns:
+            Nombre de décimales
+        """
+        if quant is None:
+            return default
+        exponent = quant.normalize().as_tuple().exponent
+        return max(0, -exponent) if isinstance(exponent, int) else default
+    
+    @staticmethod
+    def _quantize_down(value: Decimal, quant: Decimal) -> Decimal:
+        """
+        Arrondit vers le bas au multiple de quant le plus proche
+        
+        Args:
+            value: Valeur à arrondir
+            quant: Pas (tick_size ou step_size) pré-calculé
+            
+        Returns:
+            Valeur arrondie
+        """
+        # La division entière Decimal tronque vers zéro, comme ROUND_DOWN
+        return (value // quant) * quant
+    
+    def _format_cascade_quantity(self, quantity: Decimal) -> Optional[str]:
         """
         Formate la quantité cascade avec cache optimisé
         
@@ -605,31 +967,26 @@ class CascadeService:
         Returns:
             Quantité formatée ou None
         """
-        self.logger.debug(f"_format_cascade_quantity called: {quantity}")
+        self.logger.debug("_format_cascade_quantity called: %s", quantity)
         
         try:
-            # Utiliser le cache optimisé
-            if self._symbol_precision_cache and self.trading_service:
-                step_size = self._symbol_precision_cache["lot_size"]["step_size"]
-                formatted = self.trading_service._format_quantity(quantity, step_size)
-                
-                if float(formatted) <= 0:
-                    return None
-                return formatted
-            
-            # Fallback : formatage fixe
-            formatted = f"{quantity:.3f}".rstrip('0').rstrip('.')
+            # Utiliser le quantificateur et le nombre de décimales pré-calculés
+            if self._qty_quant is not None:
+                rounded = self._quantize_down(quantity, self._qty_quant)
+            else:
+                # Fallback : 3 décimales fixes
+                rounded = quantity.quantize(_QTY_FALLBACK_QUANT)
             
-            if float(formatted) <= 0:
+            if rounded <= 0:
                 return None
-                
-            return formatted
+            
+            return f"{rounded:.{self._qty_decimals}f}"
             
         except Exception as e:
-            self.logger.error(f"Erreur formatage quantité cascade: {e}", exc_info=True)
+            self.logger.error("Erreur formatage quantité cascade: %s", e, exc_info=True)
             return None
     
-    def _format_cascade_price(self, price: float) -> str:
+    def _format_cascade_price(self, price: Decimal) -> str:
         """
         Formate un prix avec cache optimisé
         
@@ -639,19 +996,18 @@ class CascadeService:
         Returns:
             Prix formaté
         """
-        self.logger.debug(f"_format_cascade_price called: {price}")
+        self.logger.debug("_format_cascade_price called: %s", price)
         
         try:
-            # Utiliser le cache optimisé
-            if self._symbol_precision_cache and self.trading_service:
-                tick_size = self._symbol_precision_cache["price_filter"]["tick_size"]
-                return self.trading_service._format_price(price, tick_size)
+            # Utiliser les quantificateurs pré-calculés
+            if self._price_quant is not None:
+                return f"{self._quantize_down(price, self._price_quant):.{self._price_decimals}f}"
             
             # Fallback : formatage fixe avec 2 décimales
             return f"{price:.2f}"
             
         except Exception as e:
-            self.logger.error(f"Erreur formatage prix cascade: {e}", exc_info=True)
+            self.logger.error("Erreur formatage prix cascade: %s", e, exc_info=True)
             return f"{price:.2f}"
     
     def get_cascade_status(self) -> Dict[str, Any]:
@@ -665,7 +1021,7 @@ class CascadeService:
             "state": self.state.value,
             "is_active": self.is_cascade_active(),
             "orders_count": self.cascade_orders_count,
-            "max_orders": config.CASCADE_CONFIG["MAX_ORDERS"],
+            "max_orders": self._max_orders,
             "current_long_quantity": self.current_long_quantity,
             "current_short_quantity": self.current_short_quantity,
             "initial_long_price": self.initial_long_price,
@@ -680,14 +1036,15 @@ class CascadeService:
         Args:
             reason: Raison de l'arrêt
         """
-        self.logger.info(f"Arrêt cascade demandé: {reason}")
+        self.logger.info("Arrêt cascade demandé: %s", reason)
+        
+        if not self._cas_state(_ACTIVE_STATES, CascadeState.STOPPED):
+            self.logger.debug("Cascade non active - rien à arrêter")
+            return
+        
+        # Annuler les ordres en attente si nécessaire
+        # TODO: Implémenter annulation des ordres
         
-        if self.is_cascade_active():
-            self.state = CascadeState.STOPPED
-            
-            # Annuler les ordres en attente si nécessaire
-            # TODO: Implémenter annulation des ordres
-            
         self.logger.info("Cascade arrêtée")
     
     def format_cascade_display(self) -> str:
@@ -700,6 +1057,21 @@ class CascadeService:
         if not self.is_cascade_active():
             return ""
         
+        # La chaîne ne dépend que de ces valeurs : réutiliser le dernier rendu si inchangées
+        key = (self.state, self.cascade_orders_count, self._max_orders,
+               self.current_long_quantity, self.current_short_quantity, len(self.pending_orders))
+        if key != self._display_cache_key:
+            self._display_cache_value = self._render_cascade_display()
+            self._display_cache_key = key
+        return self._display_cache_value
+    
+    def _render_cascade_display(self) -> str:
+        """
+        Construit la chaîne d'affichage de l'état cascade
+        
+        Returns:
+            Chaîne formatée pour l'affichage
+        """
         status = self.get_cascade_status()
         
         if self.state == CascadeState.WAITING_HEDGE:
@@ -718,305 +1090,130 @@ class CascadeService:
         
         return "CASCADE: ❓ État inconnu"
     
-    def _is_hedge_order(self, order_id: str) -> bool:
-        """
-        Vérifie si un ordre ID correspond au hedge initial
-        
-        Args:
-            order_id: ID de l'ordre à vérifier
-            
-        Returns:
-            True si c'est le hedge, False sinon
-        """
-        if not self.initial_hedge_order:
-            self.logger.debug(f"❌ _is_hedge_order: pas de hedge initial défini (order_id={order_id})")
-            return False
-        
-        hedge_id = str(self.initial_hedge_order.get("orderId", ""))
-        is_hedge = hedge_id == order_id
-        
-        self.logger.info(f"🔍 _is_hedge_order: hedge_id={hedge_id}, order_id={order_id}, is_hedge={is_hedge}, state={self.state}")
-        
-        return is_hedge
+    def _forget_hedge_order(self) -> None:
+        """Arrête le suivi de l'ordre hedge initial"""
+        if self.initial_hedge_order is not None:
+            self._order_handlers.pop(self.initial_hedge_order.order_id, None)
+        self.initial_hedge_order = None
     
-    def _is_cascade_order(self, order_id: str) -> bool:
-        """
-        Vérifie si un ordre ID correspond à un ordre cascade
-        
-        Args:
-            order_id: ID de l'ordre à vérifier
-            
-        Returns:
-            True si c'est un ordre cascade, False sinon
-        """
-        for order in self.pending_orders:
-            if str(order.get("orderId", "")) == order_id:
-                return True
-        return False
+    def _forget_pending_orders(self) -> None:
+        """Vide les ordres cascade en attente et arrête leur suivi"""
+        for order_id in self.pending_orders:
+            self._order_handlers.pop(order_id, None)
+        self.pending_orders.clear()
     
-    def _process_hedge_execution_sync(self, side: str, quantity: float, price: float) -> None:
+    async def _process_hedge_execution(self, is_buy: bool, quantity: Decimal, price: Decimal, order_id: int) -> None:
         """
-        Traite l'exécution du hedge initial via WebSocket (version synchrone)
+        Traite l'exécution du hedge initial via WebSocket
         
         Args:
-            side: Côté de l'ordre (BUY/SELL)
+            is_buy: True pour un ordre BUY, False pour SELL
             quantity: Quantité exécutée
             price: Prix d'exécution
+            order_id: ID de l'ordre hedge exécuté
         """
-        try:
-            self.logger.info(f"🎯 Traitement exécution hedge WebSocket: {side} {quantity} @ {price}")
-            
-            # Mettre à jour les prix et quantités
-            if side == "BUY":
-                self.initial_long_price = price
-                self.current_long_quantity += quantity
+        self.logger.info("🎯 Traitement exécution hedge WebSocket: %s %s @ %s ID:%s", _ORDER_SIDES[is_buy], quantity, price, order_id)
+        
+        # Récupérer d'abord le prix de l'ordre initial si pas encore défini
+        await self._retrieve_initial_order_price_async()
+        
+        # Mettre à jour les prix et quantités du hedge : hedge BUY → prix LONG de référence, SELL → SHORT
+        price_attr = _PRICE_ATTRS[is_buy]
+        if getattr(self, price_attr) is None:
+            setattr(self, price_attr, price)
+            self.logger.info("Prix %s hedge défini: %s", _POSITION_SIDES[is_buy], price)
+        qty_attr = _QTY_ATTRS[is_buy]
+        setattr(self, qty_attr, getattr(self, qty_attr) + quantity)
+        
+        # Définir le step_size pour le mode STEP (basé sur la quantité du signal initial)
+        if self.initial_step_size == 0:
+            # Le signal initial a une quantité de base, le hedge en a 2x (par défaut)
+            # On prend la plus petite quantité qui correspond au signal initial
+            if self.current_long_quantity > 0 and self.current_short_quantity > 0:
+                self.initial_step_size = min(self.current_long_quantity, self.current_short_quantity)
+                self.logger.info("Step size défini pour mode STEP: %s (quantité signal initial)", self.initial_step_size)
             else:
-                self.initial_short_price = price
-                self.current_short_quantity += quantity
-            
-            # Créer/mettre à jour les TP pour hedge
-            if self.tp_service and config.TP_CONFIG["ENABLED"]:
-                self._create_tp_for_hedge_execution(side, quantity)
-            
-            # Passer en mode cascade active
-            self.state = CascadeState.ACTIVE
-            self.initial_hedge_order = None
-            
-            # Créer le premier ordre cascade (sera créé lors de la prochaine opportunité async)
-            self.logger.info("🔄 Cascade prête - Premier ordre cascade sera créé")
-            
-            self.logger.info(f"✅ Hedge traité via WebSocket - Cascade active")
-            
-        except Exception as e:
-            self.logger.error(f"Erreur traitement hedge WebSocket: {e}", exc_info=True)
-    
-    async def _process_hedge_execution_async(self, side: str, quantity: float, price: float) -> None:
-        """
-        Traite l'exécution du hedge initial via WebSocket (version async)
+                # Si on n'a qu'un côté, utiliser la moitié (car le hedge fait 2x le signal)
+                total_quantity = self.current_long_quantity + self.current_short_quantity
+                self.initial_step_size = total_quantity / 3  # Signal = 1x, Hedge = 2x, donc total/3
+                self.logger.info("Step size estimé pour mode STEP: %s", self.initial_step_size)
+        
+        
+        # Créer/mettre à jour les TP pour hedge
+        if self.tp_service and self._tp_enabled:
+            self._create_tp_for_hedge_execution(is_buy, quantity)
+            # Mettre à jour TOUS les TP avec +0.1% après exécution hedge (regroupé)
+            self._schedule_tp_update(_ORDER_SIDES[is_buy])
+        
+        # Passer en mode cascade active (sauf si la cascade a été arrêtée entre-temps)
+        if not self._cas_state(_WAITING_HEDGE, CascadeState.ACTIVE):
+            self.logger.warning("Hedge exécuté hors attente hedge (état %s) - cascade non activée", self.state.value)
+            self._forget_hedge_order()
+            return
+        self._forget_hedge_order()
         
-        Args:
-            side: Côté de l'ordre (BUY/SELL)
-            quantity: Quantité exécutée
-            price: Prix d'exécution
-        """
-        try:
-            self.logger.info(f"🎯 Traitement exécution hedge WebSocket ASYNC: {side} {quantity} @ {price}")
-            
-            # Récupérer d'abord le prix de l'ordre initial si pas encore défini
-            await self._retrieve_initial_order_price_async()
-            
-            # Mettre à jour les prix et quantités du hedge
-            if side == "BUY":
-                # Hedge BUY exécuté → définir le prix LONG de référence 
-                if self.initial_long_price is None:
-                    self.initial_long_price = price
-                    self.logger.info(f"Prix LONG hedge défini: {price}")
-                self.current_long_quantity += quantity
-            else:
-                # Hedge SELL exécuté → définir le prix SHORT de référence
-                if self.initial_short_price is None:
-                    self.initial_short_price = price
-                    self.logger.info(f"Prix SHORT hedge défini: {price}")
-                self.current_short_quantity += quantity
-            
-            # Définir le step_size pour le mode STEP (basé sur la quantité du signal initial)
-            if self.initial_step_size == 0.0:
-                # Le signal initial a une quantité de base, le hedge en a 2x (par défaut)
-                # On prend la plus petite quantité qui correspond au signal initial
-                if self.current_long_quantity > 0 and self.current_short_quantity > 0:
-                    self.initial_step_size = min(self.current_long_quantity, self.current_short_quantity)
-                    self.logger.info(f"Step size défini pour mode STEP: {self.initial_step_size} (quantité signal initial)")
-                else:
-                    # Si on n'a qu'un côté, utiliser la moitié (car le hedge fait 2x le signal)
-                    total_quantity = self.current_long_quantity + self.current_short_quantity
-                    self.initial_step_size = total_quantity / 3  # Signal = 1x, Hedge = 2x, donc total/3
-                    self.logger.info(f"Step size estimé pour mode STEP: {self.initial_step_size}")
-            
-            
-            # Créer/mettre à jour les TP pour hedge
-            if self.tp_service and config.TP_CONFIG["ENABLED"]:
-                self._create_tp_for_hedge_execution(side, quantity)
-                # Mettre à jour TOUS les TP avec +0.1% après exécution hedge
-                self._update_tp_after_cascade(side)
-            
-            # Passer en mode cascade active
-            self.state = CascadeState.ACTIVE
-            self.initial_hedge_order = None
-            
-            # Vérifier que les prix sont bien initialisés avant de créer l'ordre cascade
-            self.logger.info(f"📊 Prix avant création cascade: LONG={self.initial_long_price}, SHORT={self.initial_short_price}")
-            
-            if self.initial_long_price is None or self.initial_short_price is None:
-                self.logger.error("❌ Prix de référence manquants - impossible de créer l'ordre cascade")
-                self.logger.error(f"   LONG: {self.initial_long_price}, SHORT: {self.initial_short_price}")
-                return
-            
-            # Créer le premier ordre cascade immédiatement (version async avec retry)
-            self.logger.info("🔄 Création du premier ordre cascade...")
-            await self._create_next_cascade_order_with_retry()
-            
-            self.logger.info(f"✅ Hedge traité via WebSocket ASYNC - Cascade active avec premier ordre créé")
-            
-        except Exception as e:
-            self.logger.error(f"Erreur traitement hedge WebSocket ASYNC: {e}", exc_info=True)
-            
-    def _process_cascade_execution_sync(self, side: str, quantity: float, price: float, order_id: str) -> None:
-        """
-        Traite l'exécution d'un ordre cascade via WebSocket (version synchrone)
+        # Vérifier que les prix sont bien initialisés avant de créer l'ordre cascade
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("📊 Prix avant création cascade: LONG=%s, SHORT=%s", self.initial_long_price, self.initial_short_price)
         
-        Args:
-            side: Côté de l'ordre (BUY/SELL) 
-            quantity: Quantité exécutée
-            price: Prix d'exécution
-            order_id: ID de l'ordre exécuté
-        """
-        try:
-            self.logger.info(f"🔄 Traitement exécution cascade WebSocket: {side} {quantity} @ {price}")
-            
-            # Retirer l'ordre de la liste pending
-            self.pending_orders = [order for order in self.pending_orders if str(order.get("orderId", "")) != order_id]
-            
-            # Mettre à jour les quantités
-            if side == "BUY":
-                self.current_long_quantity += quantity
-            else:
-                self.current_short_quantity += quantity
-            
-            self.cascade_orders_count += 1
-            
-            # Mettre à jour les TP
-            if self.tp_service and config.TP_CONFIG["ENABLED"]:
-                self._update_tp_after_cascade(side)
-            
-            # Créer l'ordre cascade suivant si sous la limite
-            if self.cascade_orders_count < config.CASCADE_CONFIG["MAX_ORDERS"]:
-                self.logger.info("🔄 Prochain ordre cascade sera créé lors de la prochaine bougie")
-            else:
-                self.logger.info("Limite d'ordres cascade atteinte")
-                self.state = CascadeState.STOPPED
-            
-            self.logger.info(f"✅ Cascade {side} traitée via WebSocket - Total ordres: {self.cascade_orders_count}")
-            
-        except Exception as e:
-            self.logger.error(f"Erreur traitement cascade WebSocket: {e}", exc_info=True)
-            
-    async def _process_cascade_execution_async(self, side: str, quantity: float, price: float, order_id: str) -> None:
-        """
-        Traite l'exécution d'un ordre cascade via WebSocket (version async)
+        if self.initial_long_price is None or self.initial_short_price is None:
+            self.logger.error("❌ Prix de référence manquants - impossible de créer l'ordre cascade")
+            self.logger.error("   LONG: %s, SHORT: %s", self.initial_long_price, self.initial_short_price)
+            return
         
-        Args:
-            side: Côté de l'ordre (BUY/SELL) 
-            quantity: Quantité exécutée
-            price: Prix d'exécution
-            order_id: ID de l'ordre exécuté
-        """
-        try:
-            self.logger.info(f"🔄 Traitement exécution cascade WebSocket ASYNC: {side} {quantity} @ {price}")
-            
-            # Retirer l'ordre de la liste pending
-            self.pending_orders = [order for order in self.pending_orders if str(order.get("orderId", "")) != order_id]
-            
-            # Mettre à jour les quantités
-            if side == "BUY":
-                self.current_long_quantity += quantity
-            else:
-                self.current_short_quantity += quantity
-            
-            self.cascade_orders_count += 1
-            
-            # Mettre à jour les TP
-            if self.tp_service and config.TP_CONFIG["ENABLED"]:
-                self._update_tp_after_cascade(side)
-            
-            # Créer l'ordre cascade suivant si sous la limite
-            if self.cascade_orders_count < config.CASCADE_CONFIG["MAX_ORDERS"]:
-                self.logger.info("🔄 Création ordre cascade suivant...")
-                await self._create_next_cascade_order_with_retry()
-            else:
-                self.logger.info("Limite d'ordres cascade atteinte")
-                self.state = CascadeState.STOPPED
-            
-            self.logger.info(f"✅ Cascade {side} traitée via WebSocket ASYNC - Total ordres: {self.cascade_orders_count}")
-            
-        except Exception as e:
-            self.logger.error(f"Erreur traitement cascade WebSocket ASYNC: {e}", exc_info=True)
-
-    async def _process_hedge_execution_websocket(self, side: str, quantity: float, price: float) -> None:
-        """
-        Traite l'exécution du hedge initial via WebSocket
+        # Pré-calculer la séquence des ordres à partir des positions initiales
+        self._build_cascade_schedule()
         
-        Args:
-            side: Côté de l'ordre (BUY/SELL)
-            quantity: Quantité exécutée
-            price: Prix d'exécution
-        """
+        # Créer le premier ordre cascade immédiatement (version async avec retry)
+        self.logger.info("🔄 Création du premier ordre cascade...")
         try:
-            self.logger.info(f"🎯 Traitement exécution hedge WebSocket: {side} {quantity} @ {price}")
-            
-            # Mettre à jour les prix et quantités
-            if side == "BUY":
-                self.initial_long_price = price
-                self.current_long_quantity += quantity
-            else:
-                self.initial_short_price = price
-                self.current_short_quantity += quantity
-            
-            # Créer/mettre à jour les TP pour hedge
-            if self.tp_service and config.TP_CONFIG["ENABLED"]:
-                self._create_tp_for_hedge_execution(side, quantity)
-            
-            # Passer en mode cascade active
-            self.state = CascadeState.ACTIVE
-            self.initial_hedge_order = None
-            
-            # Créer le premier ordre cascade avec retry
             await self._create_next_cascade_order_with_retry()
-            
-            self.logger.info(f"✅ Hedge traité via WebSocket - Cascade active")
-            
         except Exception as e:
-            self.logger.error(f"Erreur traitement hedge WebSocket: {e}", exc_info=True)
+            self.logger.error("Erreur traitement hedge WebSocket: %s", e, exc_info=True)
+            return
+        
+        self.logger.info("✅ Hedge traité via WebSocket - Cascade active avec premier ordre créé")
     
-    async def _process_cascade_execution_websocket(self, side: str, quantity: float, price: float, order_id: str) -> None:
+    async def _process_cascade_execution(self, is_buy: bool, quantity: Decimal, price: Decimal, order_id: int) -> None:
         """
         Traite l'exécution d'un ordre cascade via WebSocket
         
         Args:
-            side: Côté de l'ordre (BUY/SELL) 
+            is_buy: True pour un ordre BUY, False pour SELL
             quantity: Quantité exécutée
             price: Prix d'exécution
             order_id: ID de l'ordre exécuté
         """
-        try:
-            self.logger.info(f"🔄 Traitement exécution cascade WebSocket: {side} {quantity} @ {price}")
-            
-            # Retirer l'ordre de la liste pending
-            self.pending_orders = [order for order in self.pending_orders if str(order.get("orderId", "")) != order_id]
-            
-            # Mettre à jour les quantités
-            if side == "BUY":
-                self.current_long_quantity += quantity
-            else:
-                self.current_short_quantity += quantity
-            
-            self.orders_executed_count += 1
-            
-            # Mettre à jour les TP
-            if self.tp_service and config.TP_CONFIG["ENABLED"]:
-                self._update_tp_after_cascade(side)
-            
-            # Créer l'ordre cascade suivant si sous la limite
-            if self.cascade_orders_count < config.CASCADE_CONFIG["MAX_ORDERS"]:
+        self.logger.info("🔄 Traitement exécution cascade WebSocket: %s %s @ %s", _ORDER_SIDES[is_buy], quantity, price)
+        
+        # Retirer l'ordre des ordres en attente
+        self.pending_orders.pop(order_id, None)
+        self._order_handlers.pop(order_id, None)
+        
+        # Mettre à jour les quantités
+        qty_attr = _QTY_ATTRS[is_buy]
+        setattr(self, qty_attr, getattr(self, qty_attr) + quantity)
+        
+        self.cascade_orders_count += 1
+        
+        # Mettre à jour les TP (regroupé avec les exécutions rapprochées)
+        if self.tp_service and self._tp_enabled:
+            self._schedule_tp_update(_ORDER_SIDES[is_buy])
+        
+        # Créer l'ordre cascade suivant si sous la limite
+        if self.cascade_orders_count < self._max_orders:
+            self.logger.info("🔄 Création ordre cascade suivant...")
+            try:
                 await self._create_next_cascade_order_with_retry()
-            else:
-                self.logger.info("Limite d'ordres cascade atteinte")
-                self.state = CascadeState.STOPPED
-            
-            self.logger.info(f"✅ Cascade {side} traitée via WebSocket - Total ordres: {self.cascade_orders_count}")
-            
-        except Exception as e:
-            self.logger.error(f"Erreur traitement cascade WebSocket: {e}", exc_info=True)
-    
+            except Exception as e:
+                self.logger.error("Erreur traitement cascade WebSocket: %s", e, exc_info=True)
+                return
+        else:
+            self.logger.info("Limite d'ordres cascade atteinte")
+            self._cas_state(_ACTIVE_STATES, CascadeState.STOPPED)
+        
+        self.logger.info("✅ Cascade %s traitée via WebSocket - Total ordres: %s", _ORDER_SIDES[is_buy], self.cascade_orders_count)
+
     def handle_tp_execution(self, executed_side: str) -> None:
         """
         Gère l'exécution d'un TP avec reset complet du système pour nouveau cycle
@@ -1024,123 +1221,184 @@ class CascadeService:
         Args:
             executed_side: Côté du TP exécuté ("LONG" ou "SHORT")
         """
-        self.logger.debug(f"handle_tp_execution called: {executed_side}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("handle_tp_execution called: %s", executed_side)
         
         # Cas spécial: Si on était en WAITING_TP, c'est que le système attendait ce TP
         if self.state == CascadeState.WAITING_TP:
-            self.logger.info(f"💰 TP {executed_side} exécuté - Résolution de l'attente fonds insuffisants")
+            self.logger.info("💰 TP %s exécuté - Résolution de l'attente fonds insuffisants", executed_side)
         
-        self.logger.info(f"🎯 TP {executed_side} exécuté - Démarrage du reset complet du système")
+        self.logger.info("🎯 TP %s exécuté - Démarrage du reset complet du système", executed_side)
         
         try:
-            # 1. Fermer TOUTES les positions ouvertes (pas seulement le côté du TP exécuté)
-            self._close_all_positions()
-            
-            # 2. Annuler TOUS les ordres en attente (LONG et SHORT)
-            self._cancel_all_pending_orders()
-            
-            # 3. Annuler l'ordre hedge initial s'il existe encore
-            if self.initial_hedge_order:
-                hedge_order_id = self.initial_hedge_order.get("orderId")
-                if hedge_order_id:
-                    cancel_result = self.binance_client.cancel_order(config.SYMBOL, int(hedge_order_id))
-                    if cancel_result:
-                        self.logger.info(f"Ordre hedge initial {hedge_order_id} annulé")
-                    self.initial_hedge_order = None
-            
-            # 4. Reset complet des variables du système cascade
-            self.current_long_quantity = 0.0
-            self.current_short_quantity = 0.0
+            # 1. Fermer TOUTES les positions ouvertes (pas seulement le côté du TP exécuté) et
+            # 2. annuler TOUS les ordres en attente (cascade LONG/SHORT et hedge initial) :
+            # appels REST indépendants, lancés en parallèle
+            futures = [
+                self._reset_executor.submit(self._close_all_positions),
+                self._reset_executor.submit(self._cancel_all_pending_orders),
+            ]
+            for future in futures:
+                future.result()
+            
+            # 3. Reset complet des variables du système cascade
+            self.current_long_quantity = _ZERO
+            self.current_short_quantity = _ZERO
             self.initial_long_price = None
             self.initial_short_price = None
-            self.pending_orders.clear()
+            self._forget_pending_orders()
+            self._forget_hedge_order()
             self.cascade_orders_count = 0
             
-            # 5. Passer en état STOPPED pour permettre nouveau signal
+            # 4. Passer en état STOPPED pour permettre nouveau signal
             self.state = CascadeState.STOPPED
             
             self.logger.info("✅ Reset complet terminé - Système prêt pour nouveau signal")
             
         except Exception as e:
-            self.logger.error(f"Erreur lors du reset complet système: {e}", exc_info=True)
+            self.logger.error("Erreur lors du reset complet système: %s", e, exc_info=True)
     
     def _close_all_positions(self) -> None:
         """
         Ferme toutes les positions ouvertes (LONG et SHORT) après vérification des positions réelles
         """
+        # Rien d'ouvert localement depuis la dernière fermeture vérifiée : pas d'appel REST
+        if (not self._suspect_desync and not self.current_long_quantity
+                and not self.current_short_quantity):
+            self.logger.debug("Aucune position locale depuis la dernière fermeture vérifiée - vérification REST ignorée")
+            return
+        
         self.logger.info("Vérification et fermeture des positions réelles ouvertes")
         
         try:
             # Récupérer les positions réelles depuis Binance
-            positions = self.binance_client.get_position_info(config.SYMBOL)
+            positions = self.binance_client.get_position_info(self._symbol)
             if not positions:
                 self.logger.warning("Impossible de récupérer les positions - abandon fermeture")
+                self._suspect_desync = True
                 return
             
-            # Parcourir les positions et fermer celles qui ont une quantité > 0
-            for position in positions:
-                position_side = position.get("positionSide", "")
-                position_amt = float(position.get("positionAmt", "0"))
-                
-                # Ignorer les positions avec quantité nulle
-                if abs(position_amt) == 0:
-                    continue
-                
-                self.logger.info(f"Position {position_side} détectée: {position_amt}")
+            # Ne garder que les positions non nulles : (positionSide, quantité signée), un seul parsing par position
+            active_positions = [
+                (position_side, position_amt)
+                for position_side, position_amt in (
+                    (position.get("positionSide", ""), Decimal(position.get("positionAmt", "0")))
+                    for position in positions
+                )
+                if position_amt
+            ]
+            
+            # Préparer les ordres de fermeture MARKET
+            all_closed = True
+            closes = []
+            for position_side, position_amt in active_positions:
+                self.logger.info("Position %s détectée: %s", position_side, position_amt)
                 
-                # Déterminer l'ordre de fermeture
-                if position_side == "LONG" and position_amt > 0:
-                    side = "SELL"
-                    quantity = position_amt
-                elif position_side == "SHORT" and position_amt < 0:
-                    side = "BUY"
-                    quantity = abs(position_amt)  # Convertir en positif
-                else:
+                # Déterminer l'ordre de fermeture (LONG positif → SELL, SHORT négatif → BUY)
+                side = _CLOSE_SIDES.get((position_side, position_amt > 0))
+                if side is None:
                     continue
+                quantity = abs(position_amt)  # Convertir en positif
                 
-                # Formatter et placer l'ordre de fermeture
                 formatted_quantity = self._format_cascade_quantity(quantity)
                 if formatted_quantity:
-                    order = self.binance_client.place_order(
-                        symbol=config.SYMBOL,
-                        side=side,
-                        quantity=formatted_quantity,
-                        order_type="MARKET",
-                        position_side=position_side
-                    )
+                    closes.append((position_side, side, formatted_quantity))
+                else:
+                    self.logger.error("Erreur formatage quantité %s: %s", position_side, quantity)
+                    all_closed = False
+            
+            # Fermer LONG et SHORT en une seule requête groupée (2 ordres au plus en mode Hedge)
+            if closes:
+                responses = self.binance_client.place_batch_orders([
+                    {
+                        "symbol": self._symbol,
+                        "side": side,
+                        "type": "MARKET",
+                        "quantity": formatted_quantity,
+                        "positionSide": position_side
+                    }
+                    for position_side, side, formatted_quantity in closes
+                ]) or [{}] * len(closes)
+                
+                place_order = self.binance_client.place_order
+                for (position_side, side, formatted_quantity), order in zip(closes, responses):
+                    # Repli ordre par ordre uniquement pour les échecs de l'envoi groupé
+                    if order.get("orderId") is None:
+                        order = place_order(
+                            symbol=self._symbol,
+                            side=side,
+                            quantity=formatted_quantity,
+                            order_type="MARKET",
+                            position_side=position_side
+                        )
                     if order:
-                        self.logger.info(f"✅ Position {position_side} fermée: {formatted_quantity}")
+                        self.logger.info("✅ Position %s fermée: %s", position_side, formatted_quantity)
                     else:
-                        self.logger.error(f"❌ Échec fermeture position {position_side}")
-                else:
-                    self.logger.error(f"Erreur formatage quantité {position_side}: {quantity}")
+                        self.logger.error("❌ Échec fermeture position %s", position_side)
+                        all_closed = False
+            
+            # Positions réelles vérifiées et toutes fermées : l'état local fait foi jusqu'au prochain trade
+            self._suspect_desync = not all_closed
                     
         except Exception as e:
-            self.logger.error(f"Erreur lors de la fermeture des positions: {e}", exc_info=True)
+            self.logger.error("Erreur lors de la fermeture des positions: %s", e, exc_info=True)
+            self._suspect_desync = True
     
     def _cancel_all_pending_orders(self) -> None:
         """
-        Annule tous les ordres en attente (LONG et SHORT)
+        Annule tous les ordres en attente (cascade LONG et SHORT, hedge initial) par requêtes
+        groupées de 10, puis ordre par ordre pour ceux que l'annulation groupée n'a pas traités
         """
-        self.logger.info(f"Annulation de tous les ordres en attente ({len(self.pending_orders)})")
+        # Copie des IDs pour éviter modification pendant itération
+        orders_to_cancel = list(self.pending_orders)
+        if self.initial_hedge_order is not None:
+            orders_to_cancel.append(self.initial_hedge_order.order_id)
+        
+        self.logger.info("Annulation de tous les ordres en attente (%s)", len(orders_to_cancel))
         
         try:
-            orders_to_cancel = self.pending_orders.copy()  # Copie pour éviter modification pendant itération
-            
-            for order in orders_to_cancel:
-                order_id = order.get("orderId")
-                if order_id:
-                    cancel_result = self.binance_client.cancel_order(config.SYMBOL, int(order_id))
-                    if cancel_result:
-                        self.pending_orders.remove(order)
-                        self.logger.info(f"Ordre cascade {order_id} annulé")
+            failed_ids = []
+            for start in range(0, len(orders_to_cancel), 10):
+                batch = orders_to_cancel[start:start + 10]
+                results = self.binance_client.cancel_batch_orders(self._symbol, batch)
+                if results is None:
+                    failed_ids.extend(batch)
+                    continue
+                
+                for order_id, result in zip(batch, results):
+                    if "orderId" in result:
+                        self._forget_cancelled_order(order_id)
                     else:
-                        self.logger.warning(f"Échec annulation ordre {order_id}")
+                        failed_ids.append(order_id)
+            
+            # Repli ordre par ordre uniquement pour les échecs de l'annulation groupée
+            for order_id in failed_ids:
+                cancel_result = self.binance_client.cancel_order(self._symbol, order_id)
+                if cancel_result:
+                    self._forget_cancelled_order(order_id)
+                else:
+                    self.logger.warning("Échec annulation ordre %s", order_id)
                         
         except Exception as e:
-            self.logger.error(f"Erreur lors de l'annulation des ordres: {e}", exc_info=True)
+            self.logger.error("Erreur lors de l'annulation des ordres: %s", e, exc_info=True)
+    
+    def _forget_cancelled_order(self, order_id: int) -> None:
+        """
+        Arrête le suivi d'un ordre annulé (ordre cascade ou hedge initial)
+        
+        Args:
+            order_id: ID de l'ordre annulé
+        """
+        hedge_order = self.initial_hedge_order
+        if hedge_order is not None and order_id == hedge_order.order_id:
+            self._forget_hedge_order()
+            self.logger.info("Ordre hedge initial %s annulé", order_id)
+        else:
+            self.pending_orders.pop(order_id, None)
+            self._order_handlers.pop(order_id, None)
+            self.logger.info("Ordre cascade %s annulé", order_id)
     
-    def _cancel_pending_order(self, order: Dict[str, Any]) -> None:
+    def _cancel_pending_order(self, order: CascadeOrder) -> None:
         """
         Annule un ordre en attente
         
@@ -1148,13 +1406,14 @@ class CascadeService:
             order: Ordre à annuler
         """
         try:
-            order_id = order.get("orderId")
+            order_id = order.order_id
             if order_id:
-                cancel_result = self.binance_client.cancel_order(config.SYMBOL, int(order_id))
+                cancel_result = self.binance_client.cancel_order(self._symbol, order_id)
                 if cancel_result:
-                    self.pending_orders.remove(order)
-                    self.logger.info(f"Ordre cascade {order_id} annulé suite à l'exécution TP")
+                    self.pending_orders.pop(order_id, None)
+                    self._order_handlers.pop(order_id, None)
+                    self.logger.info("Ordre cascade %s annulé suite à l'exécution TP", order_id)
                 else:
-                    self.logger.warning(f"Échec annulation ordre cascade {order_id}")
+                    self.logger.warning("Échec annulation ordre cascade %s", order_id)
         except Exception as e:
-            self.logger.error(f"Erreur annulation ordre cascade: {e}", exc_info=True)
\ No newline at end of file
+            self.logger.error("Erreur annulation ordre cascade: %s", e, exc_info=True)
\ No newline at end of file
@@ -2,11 +2,12 @@
 Module de logging centralisé
 Responsabilité unique : Configuration et gestion des logs
 """
+import functools
 import logging
 import logging.handlers
 import os
 import sys
-from typing import Optional
+from typing import Any, Callable, Optional
 
 import config
 
@@ -26,6 +27,11 @@ def setup_logging() -> logging.Logger:
     
     logger.setLevel(getattr(logging, config.LOGGING_CONFIG["LEVEL"]))
     
+    # Le format n'utilise ni thread ni processus: ne pas les collecter à chaque enregistrement
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
     # Supprimer les handlers existants pour éviter les doublons
     if logger.handlers:
         logger.handlers.clear()
@@ -91,4 +97,32 @@ def get_module_logger(module_name: str) -> logging.Logger:
         logger.parent = parent_logger
         logger.setLevel(parent_logger.level)
     
-    return logger
\ No newline at end of file
+    return logger
+
+
+# Traces d'entrée de méthodes (@trace): actives seulement si BOT_TRACE=1 au démarrage
+TRACE_ENABLED = os.getenv("BOT_TRACE") == "1"
+
+
+def trace(method: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Décorateur de trace d'entrée d'une méthode (self.logger.debug)
+    
+    Sans BOT_TRACE=1, la méthode est retournée telle quelle à l'import:
+    aucun coût d'appel ni formatage quand la trace est désactivée.
+    
+    Args:
+        method: Méthode d'une classe disposant de self.logger
+        
+    Returns:
+        Méthode tracée ou méthode d'origine
+    """
+    if not TRACE_ENABLED:
+        return method
+    
+    @functools.wraps(method)
+    def traced(self: Any, *args: Any, **kwargs: Any) -> Any:
+        self.logger.debug("%s called: args=%s kwargs=%s", method.__name__, args, kwargs)
+        return method(self, *args, **kwargs)
+    
+    return traced
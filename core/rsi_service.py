@@ -19,6 +19,12 @@ class RSIService:
         """Initialise le service RSI"""
         self.logger = get_module_logger("RSIService")
         self.market_data_client = MarketDataClient()
+
+        # État incrémental (lissage de Wilder) mis à jour en O(1) à chaque bougie fermée
+        self._incremental_avg_gain: Dict[int, float] = {}
+        self._incremental_avg_loss: Dict[int, float] = {}
+        self._incremental_prev_close: Optional[float] = None
+        self._incremental_rsi: Optional[Dict[str, Dict]] = None
         
         self.logger.debug("RSIService initialisé")
     
@@ -151,6 +157,144 @@ class RSIService:
             self.logger.error(f"Erreur lors du calcul RSI: {e}", exc_info=True)
             return None
     
+    def seed_incremental_rsi(self, symbol: str, interval: str) -> bool:
+        """
+        Initialise l'état RSI incrémental à partir de l'historique (un seul appel REST)
+
+        Les moyennes de gains/pertes finales sont calculées exactement comme
+        RSI.calculate (EMA alpha=1/période), sur les bougies fermées uniquement.
+
+        Args:
+            symbol: Symbole de trading
+            interval: Intervalle de temps
+
+        Returns:
+            True si l'état est initialisé
+        """
+        self.logger.debug("seed_incremental_rsi called: %s %s", symbol, interval)
+
+        try:
+            periods = self._get_rsi_periods()
+            required_candles = self._get_required_candles(periods)
+
+            historical_data = self.market_data_client.get_historical_data(
+                symbol, interval, required_candles + 1
+            )
+            if historical_data is None or len(historical_data) < 2:
+                self.logger.error("Impossible d'initialiser le RSI incrémental: historique indisponible")
+                return False
+
+            # Exclure la dernière ligne (bougie en cours)
+            if config.SIGNAL_CONFIG["RSI_ON_HA"]:
+                close_prices = HeikinAshi.compute(historical_data)['HA_close'].iloc[:-1]
+            else:
+                close_prices = historical_data['close'].iloc[:-1]
+
+            delta = close_prices.diff()
+            gain = delta.where(delta > 0, 0.0)
+            loss = -delta.where(delta < 0, 0.0)
+
+            for period in periods:
+                self._incremental_avg_gain[period] = float(gain.ewm(alpha=1/period, adjust=False).mean().iloc[-1])
+                self._incremental_avg_loss[period] = float(loss.ewm(alpha=1/period, adjust=False).mean().iloc[-1])
+
+            self._incremental_prev_close = float(close_prices.iloc[-1])
+            self._incremental_rsi = self._classify_incremental_rsi(periods)
+
+            self.logger.info("RSI incrémental initialisé sur %d bougies pour %s", len(close_prices), symbol)
+            return True
+
+        except Exception as e:
+            self.logger.error("Erreur initialisation RSI incrémental: %s", e, exc_info=True)
+            self._incremental_prev_close = None
+            self._incremental_rsi = None
+            return False
+
+    def update_incremental_rsi_values(self, open_price: Optional[float], high: float, low: float,
+                                      close_price: float) -> Optional[Dict[str, Dict]]:
+        """
+        Met à jour le RSI incrémental avec une bougie fermée (lissage de Wilder)
+
+        AG = AG + (gain - AG) / n et AL = AL + (perte - AL) / n, puis
+        RSI = 100 - 100 / (1 + AG / AL).
+
+        Args:
+            open_price: Ouverture (None si inconnue)
+            high: Plus haut
+            low: Plus bas
+            close_price: Clôture
+
+        Returns:
+            RSI classifiés (même format que calculate_rsi_for_symbol) ou None si non initialisé
+        """
+        if self._incremental_prev_close is None:
+            return None
+
+        if config.SIGNAL_CONFIG["RSI_ON_HA"]:
+            if open_price is None:
+                # Impossible de calculer le close HA: forcer une réinitialisation
+                self.logger.warning("Bougie sans open - RSI incrémental HA invalidé")
+                self._incremental_prev_close = None
+                self._incremental_rsi = None
+                return None
+            close = (open_price + high + low + close_price) / 4
+        else:
+            close = close_price
+
+        delta = close - self._incremental_prev_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        for period in self._incremental_avg_gain:
+            self._incremental_avg_gain[period] += (gain - self._incremental_avg_gain[period]) / period
+            self._incremental_avg_loss[period] += (loss - self._incremental_avg_loss[period]) / period
+
+        self._incremental_prev_close = close
+        self._incremental_rsi = self._classify_incremental_rsi(list(self._incremental_avg_gain))
+        return self._incremental_rsi
+
+    def get_incremental_rsi(self) -> Optional[Dict[str, Dict]]:
+        """
+        Retourne les derniers RSI incrémentaux classifiés
+
+        Returns:
+            RSI classifiés ou None si l'état incrémental n'est pas initialisé
+        """
+        return self._incremental_rsi
+
+    def _classify_incremental_rsi(self, periods: List[int]) -> Dict[str, Dict]:
+        """
+        Classe les RSI issus de l'état incrémental selon les seuils configurés
+
+        Args:
+            periods: Périodes RSI à classer
+
+        Returns:
+            Dictionnaire au format de calculate_rsi_for_symbol
+        """
+        classified_rsi = {}
+
+        for period in periods:
+            avg_gain = self._incremental_avg_gain[period]
+            avg_loss = self._incremental_avg_loss[period]
+
+            if avg_loss > 0:
+                rsi_value: Optional[float] = 100 - (100 / (1 + avg_gain / avg_loss))
+            elif avg_gain > 0:
+                rsi_value = 100.0
+            else:
+                rsi_value = None  # Aucune variation: RSI indéfini
+
+            thresholds = config.SIGNAL_CONFIG["RSI_THRESHOLDS"][period]
+            classified_rsi[f"RSI_{period}"] = {
+                "value": round(rsi_value, 2) if rsi_value is not None else None,
+                "classification": RSI.classify_rsi_level(rsi_value, thresholds["OVERSOLD"], thresholds["OVERBOUGHT"]),
+                "oversold_threshold": thresholds["OVERSOLD"],
+                "overbought_threshold": thresholds["OVERBOUGHT"]
+            }
+
+        return classified_rsi
+
     def format_rsi_display(self, rsi_data: Dict[str, Dict]) -> str:
         """
         Formate les données RSI pour l'affichage
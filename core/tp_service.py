@@ -2,13 +2,17 @@
 Service de gestion des Take Profit
 Responsabilité unique : Gestion des ordres TP avec mise à jour automatique
 """
-from typing import Dict, Optional, Any
+import logging
+from typing import Dict, Optional, Any, List, Set, Tuple
 from enum import Enum
 
 import config
 from api.binance_client import BinanceAPIClient
 from core.logger import get_module_logger
 
+# Espacement maximal de la vérification REST de secours des TP : 2**3 = une bougie sur 8
+_TP_CHECK_MAX_BACKOFF_EXP = 3
+
 
 class TPSide(Enum):
     """Côtés des TP"""
@@ -49,6 +53,11 @@ class TPService:
         self._symbol_precision_cache: Optional[Dict[str, Any]] = None
         self._cached_symbol: Optional[str] = None
         
+        # Backoff de la vérification REST de secours : vérifications consécutives sans
+        # changement et nombre de bougies à sauter avant la prochaine
+        self._idle_tp_checks: int = 0
+        self._tp_checks_to_skip: int = 0
+        
         self.logger.debug("TPService initialisé")
     
     def set_trading_service_reference(self, trading_service) -> None:
@@ -121,12 +130,15 @@ class TPService:
         Returns:
             True si succès, False sinon
         """
-        self.logger.debug(f"create_or_update_tp called: {side.value} {quantity} increment={increment_position}")
+        self.logger.debug("create_or_update_tp called: %s %s increment=%s", side.value, quantity, increment_position)
         
         if not config.TP_CONFIG["ENABLED"] or not self.tp_distance:
             self.logger.debug("TP désactivé ou pas encore initialisé")
             return False
         
+        # TP modifié : reprendre la vérification de secours à chaque bougie
+        self._reset_tp_check_backoff()
+        
         try:
             # Incrémenter le compteur de position si demandé (à partir du hedge - position 2)
             if increment_position:
@@ -170,6 +182,102 @@ class TPService:
             self.logger.error(f"Erreur lors de la gestion TP {side.value}: {e}", exc_info=True)
             return False
     
+    def create_or_update_tp_batch(self, updates: List[Tuple[TPSide, float, bool]]) -> Dict[TPSide, bool]:
+        """
+        Crée ou met à jour plusieurs TP avec une annulation groupée puis un placement groupé
+        
+        Équivalent à des appels successifs à create_or_update_tp (même ordre
+        d'incrément du compteur de position), mais en deux requêtes au lieu
+        de deux par côté. Sans précision du symbole en cache, ces appels
+        successifs sont effectivement utilisés.
+        
+        Args:
+            updates: (côté, quantité totale, increment_position) dans l'ordre de traitement
+            
+        Returns:
+            Succès par côté
+        """
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("create_or_update_tp_batch called: %s", [(side.value, quantity, inc) for side, quantity, inc in updates])
+        
+        results = {side: False for side, _, _ in updates}
+        
+        if not config.TP_CONFIG["ENABLED"] or not self.tp_distance:
+            self.logger.debug("TP désactivé ou pas encore initialisé")
+            return results
+        
+        # place_batch_orders ne reformate pas les paramètres : sans précision du symbole,
+        # le formatage de repli peut être hors tick/step et faire rejeter tout le lot
+        if not self._symbol_precision_cache or not self.trading_service:
+            self.logger.warning("Précision du symbole non disponible - TP placés un par un")
+            for side, quantity, increment_position in updates:
+                results[side] = self.create_or_update_tp(side, quantity, increment_position)
+            return results
+        
+        # TP modifiés : reprendre la vérification de secours à chaque bougie
+        self._reset_tp_check_backoff()
+        
+        try:
+            # Calculer les niveaux dans l'ordre, chaque incrément s'appliquant aux côtés suivants
+            planned: List[Tuple[TPSide, float, float]] = []
+            for side, quantity, increment_position in updates:
+                if increment_position:
+                    self.position_count += 1
+                    self.logger.info(f"Position count incrémenté à: {self.position_count}")
+                
+                tp_level = self._calculate_tp_level(side)
+                if tp_level is None:
+                    self.logger.error(f"Impossible de calculer le niveau TP pour {side.value}")
+                    continue
+                planned.append((side, quantity, tp_level))
+            
+            if not planned:
+                return results
+            
+            # Annuler en une requête les anciens TP des côtés concernés
+            old_order_ids = []
+            for side, _, _ in planned:
+                active_tp = self.active_tp_long if side == TPSide.LONG else self.active_tp_short
+                if active_tp and active_tp.get("orderId"):
+                    old_order_ids.append(int(active_tp["orderId"]))
+                if side == TPSide.LONG:
+                    self.active_tp_long = None
+                else:
+                    self.active_tp_short = None
+            
+            if old_order_ids:
+                if self.binance_client.cancel_batch_orders(config.SYMBOL, old_order_ids) is None:
+                    self.logger.warning(f"Échec de l'annulation groupée des TP {old_order_ids}")
+            
+            # Placer les nouveaux TP en une requête
+            responses = self.binance_client.place_batch_orders(
+                [self._tp_order_request(side, quantity, tp_level) for side, quantity, tp_level in planned]
+            )
+            if responses is None:
+                self.logger.error("❌ Échec du placement groupé des TP")
+                return results
+            
+            for (side, quantity, tp_level), tp_order in zip(planned, responses):
+                if tp_order.get("orderId") is None:
+                    self.logger.error(f"❌ Échec de création du TP {side.value}: {tp_order.get('msg')}")
+                    continue
+                
+                if side == TPSide.LONG:
+                    self.active_tp_long = tp_order
+                    self.current_long_quantity = quantity
+                else:
+                    self.active_tp_short = tp_order
+                    self.current_short_quantity = quantity
+                
+                results[side] = True
+                self.logger.info(f"✅ TP {side.value} créé/mis à jour - ID: {tp_order.get('orderId')} @ {tp_level} (position #{self.position_count})")
+            
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la gestion groupée des TP: {e}", exc_info=True)
+            return results
+    
     def _calculate_tp_level(self, side: TPSide) -> Optional[float]:
         """
         Calcule le niveau TP avec nouvelle logique linéaire
@@ -180,7 +288,7 @@ class TPService:
         Returns:
             Niveau TP calculé
         """
-        self.logger.debug(f"_calculate_tp_level called: {side.value} position={self.position_count}")
+        self.logger.debug("_calculate_tp_level called: %s position=%s", side.value, self.position_count)
         
         if not self.initial_price or not self.hedge_stop_price or not self.tp_distance:
             self.logger.error("Prix de référence manquants pour calcul TP")
@@ -193,11 +301,11 @@ class TPService:
         if side.value == self.initial_signal_side:
             # TP pour le côté du signal initial - utilise prix initial
             reference_price = self.initial_price
-            self.logger.debug(f"TP {side.value} côté signal - référence: prix initial {reference_price}")
+            self.logger.debug("TP %s côté signal - référence: prix initial %s", side.value, reference_price)
         elif side.value == self.hedge_side:
             # TP pour le côté du hedge - utilise prix hedge
             reference_price = self.hedge_stop_price
-            self.logger.debug(f"TP {side.value} côté hedge - référence: prix hedge {reference_price}")
+            self.logger.debug("TP %s côté hedge - référence: prix hedge %s", side.value, reference_price)
         else:
             self.logger.error(f"Côté TP {side.value} ne correspond ni au signal ni au hedge")
             return None
@@ -236,7 +344,7 @@ class TPService:
         Returns:
             Résultat de l'ordre ou None
         """
-        self.logger.debug(f"_place_tp_order called: {side.value} {quantity} @ {tp_level}")
+        self.logger.debug("_place_tp_order called: %s %s @ %s", side.value, quantity, tp_level)
         
         try:
             # Configurer les paramètres selon le côté
@@ -278,6 +386,35 @@ class TPService:
             self.logger.error(f"Erreur lors du placement TP: {e}", exc_info=True)
             return None
     
+    def _tp_order_request(self, side: TPSide, quantity: float, tp_level: float) -> Dict[str, Any]:
+        """
+        Construit les paramètres d'un ordre TAKE_PROFIT pour un envoi groupé
+        
+        Args:
+            side: Côté du TP
+            quantity: Quantité de l'ordre
+            tp_level: Niveau de déclenchement TP
+            
+        Returns:
+            Paramètres de l'ordre (prix et quantité formatés)
+        """
+        if side == TPSide.LONG:
+            order_side = "SELL"  # Vendre la position LONG
+            stop_price = tp_level * (1 - config.TP_CONFIG["PRICE_OFFSET"])
+        else:
+            order_side = "BUY"  # Racheter la position SHORT
+            stop_price = tp_level * (1 + config.TP_CONFIG["PRICE_OFFSET"])
+        
+        return {
+            "symbol": config.SYMBOL,
+            "side": order_side,
+            "type": "TAKE_PROFIT",
+            "quantity": self._format_tp_quantity(quantity),
+            "stopPrice": self._format_tp_price(stop_price),
+            "price": self._format_tp_price(tp_level),
+            "positionSide": side.value
+        }
+    
     def _cancel_tp_order(self, tp_order: Dict[str, Any]) -> bool:
         """
         Annule un ordre TP existant
@@ -343,44 +480,42 @@ class TPService:
         try:
             executed_side = None
             
+            if not self.active_tp_long and not self.active_tp_short:
+                return None
+            
+            # Vérification espacée tant que rien ne change (le User Data Stream reste le chemin principal)
+            if self._tp_checks_to_skip > 0:
+                self._tp_checks_to_skip -= 1
+                return None
+            
+            # Un seul appel openOrders pour les deux côtés : seuls les TP absents
+            # de la liste des ordres ouverts sont interrogés individuellement
+            open_orders = self.binance_client.get_open_orders(config.SYMBOL)
+            if open_orders is None:
+                # Erreur REST (déjà journalisée par le client) : nouvelle tentative à la prochaine bougie
+                return None
+            open_order_ids = {int(order["orderId"]) for order in open_orders if order.get("orderId")}
+            
             # Vérifier TP LONG
             if self.active_tp_long:
                 long_order_id = self.active_tp_long.get("orderId")
-                if long_order_id:
-                    order_status = self.binance_client.get_order_status(config.SYMBOL, int(long_order_id))
-                    if order_status and order_status.get("status") == "FILLED":
-                        self.logger.info(f"TP LONG exécuté - ID: {long_order_id}")
-                        executed_side = "LONG"
-                        self.active_tp_long = None
-                        self.current_long_quantity = 0.0
-                        
-                        # Annuler le TP SHORT s'il existe
-                        if self.active_tp_short:
-                            self._cancel_tp_order(self.active_tp_short)
-                            self.active_tp_short = None
-                            self.logger.info("TP SHORT annulé suite à l'exécution du TP LONG")
+                if long_order_id and self._is_tp_filled(int(long_order_id), open_order_ids):
+                    self.logger.info(f"TP LONG exécuté - ID: {long_order_id}")
+                    executed_side = "LONG"
             
             # Vérifier TP SHORT
             if self.active_tp_short and executed_side is None:
                 short_order_id = self.active_tp_short.get("orderId")
-                if short_order_id:
-                    order_status = self.binance_client.get_order_status(config.SYMBOL, int(short_order_id))
-                    if order_status and order_status.get("status") == "FILLED":
-                        self.logger.info(f"TP SHORT exécuté - ID: {short_order_id}")
-                        executed_side = "SHORT"
-                        self.active_tp_short = None
-                        self.current_short_quantity = 0.0
-                        
-                        # Annuler le TP LONG s'il existe
-                        if self.active_tp_long:
-                            self._cancel_tp_order(self.active_tp_long)
-                            self.active_tp_long = None
-                            self.logger.info("TP LONG annulé suite à l'exécution du TP SHORT")
+                if short_order_id and self._is_tp_filled(int(short_order_id), open_order_ids):
+                    self.logger.info(f"TP SHORT exécuté - ID: {short_order_id}")
+                    executed_side = "SHORT"
             
             if executed_side:
-                self.logger.info(f"✅ TP {executed_side} exécuté avec succès - Nettoyage automatique effectué")
-                # Reset complet du système TP pour permettre nouveau cycle
-                self._reset_tp_system()
+                self._finalize_tp_execution(TPSide(executed_side))
+            else:
+                # Aucun changement : doubler l'intervalle jusqu'au plafond
+                self._idle_tp_checks = min(self._idle_tp_checks + 1, _TP_CHECK_MAX_BACKOFF_EXP)
+                self._tp_checks_to_skip = (1 << self._idle_tp_checks) - 1
                 
             return executed_side
             
@@ -388,6 +523,96 @@ class TPService:
             self.logger.error(f"Erreur lors de la vérification TP: {e}", exc_info=True)
             return None
     
+    def handle_order_execution_from_websocket(self, execution_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Détecte l'exécution d'un TP à partir d'un événement User Data Stream
+        
+        Évite d'attendre la vérification REST de la bougie suivante ;
+        check_tp_execution_and_cleanup reste le filet de sécurité si l'événement est manqué.
+        
+        Args:
+            execution_data: Données d'exécution du WebSocket (ordre FILLED)
+            
+        Returns:
+            Côté du TP exécuté ("LONG" ou "SHORT") ou None si l'ordre n'est pas un TP actif
+        """
+        if not config.TP_CONFIG["ENABLED"]:
+            return None
+        
+        if execution_data.get("X") != "FILLED" or execution_data.get("s") != config.SYMBOL:
+            return None
+        
+        try:
+            order_id = int(execution_data.get("i", 0))
+            
+            if self.active_tp_long and int(self.active_tp_long.get("orderId") or 0) == order_id:
+                executed_side = TPSide.LONG
+            elif self.active_tp_short and int(self.active_tp_short.get("orderId") or 0) == order_id:
+                executed_side = TPSide.SHORT
+            else:
+                return None
+            
+            self.logger.info(f"TP {executed_side.value} exécuté (WebSocket) - ID: {order_id}")
+            self._finalize_tp_execution(executed_side)
+            return executed_side.value
+            
+        except Exception as e:
+            self.logger.error(f"Erreur lors du traitement WebSocket TP: {e}", exc_info=True)
+            return None
+    
+    def _finalize_tp_execution(self, executed_side: TPSide) -> None:
+        """
+        Annule le TP opposé puis réinitialise le système TP après une exécution
+        
+        Args:
+            executed_side: Côté du TP exécuté
+        """
+        if executed_side == TPSide.LONG:
+            self.active_tp_long = None
+            self.current_long_quantity = 0.0
+            
+            # Annuler le TP SHORT s'il existe
+            if self.active_tp_short:
+                self._cancel_tp_order(self.active_tp_short)
+                self.active_tp_short = None
+                self.logger.info("TP SHORT annulé suite à l'exécution du TP LONG")
+        else:
+            self.active_tp_short = None
+            self.current_short_quantity = 0.0
+            
+            # Annuler le TP LONG s'il existe
+            if self.active_tp_long:
+                self._cancel_tp_order(self.active_tp_long)
+                self.active_tp_long = None
+                self.logger.info("TP LONG annulé suite à l'exécution du TP SHORT")
+        
+        self.logger.info(f"✅ TP {executed_side.value} exécuté avec succès - Nettoyage automatique effectué")
+        # Reset complet du système TP pour permettre nouveau cycle
+        self._reset_tp_system()
+    
+    def _reset_tp_check_backoff(self) -> None:
+        """Remet la vérification REST de secours des TP à chaque bougie"""
+        self._idle_tp_checks = 0
+        self._tp_checks_to_skip = 0
+    
+    def _is_tp_filled(self, order_id: int, open_order_ids: Set[int]) -> bool:
+        """
+        Indique si un ordre TP a été exécuté
+        
+        Args:
+            order_id: ID de l'ordre TP
+            open_order_ids: IDs des ordres encore ouverts (instantané openOrders)
+            
+        Returns:
+            True si l'ordre est FILLED, False s'il est encore ouvert ou clôturé autrement
+        """
+        if order_id in open_order_ids:
+            return False
+        
+        # Ordre sorti du carnet : confirmer qu'il s'agit d'une exécution (et non d'une annulation)
+        order_status = self.binance_client.get_order_status(config.SYMBOL, order_id)
+        return bool(order_status and order_status.get("status") == "FILLED")
+    
     def _reset_tp_system(self) -> None:
         """
         Reset complet du système TP pour nouveau cycle
@@ -415,6 +640,8 @@ class TPService:
             self.current_long_quantity = 0.0
             self.current_short_quantity = 0.0
             
+            self._reset_tp_check_backoff()
+            
             self.logger.info("✅ Système TP réinitialisé - Prêt pour nouveau signal")
             
         except Exception as e:
@@ -143,15 +143,15 @@ class AllOrNothingStrategy(BaseStrategy):
         """
         try:
             # Extraire les données nécessaires de la bougie
-            candle_info = {
-                "high": float(candle_data.get("h", 0)),
-                "low": float(candle_data.get("l", 0)),
-                "close": float(candle_data.get("c", 0)),
-                "volume": float(candle_data.get("v", 0))
-            }
-
-            # Prix de fermeture pour monitoring
-            close_price = candle_info["close"]
+            # Tuple (open, high, low, close, volume): chemin rapide de update_candle_history
+            close_price = float(candle_data.get("c", 0))
+            candle_info = (
+                float(candle_data.get("o", 0)),
+                float(candle_data.get("h", 0)),
+                float(candle_data.get("l", 0)),
+                close_price,
+                float(candle_data.get("v", 0))
+            )
 
             # Mettre à jour l'historique pour calcul SL
             self.all_or_nothing_service.update_candle_history(candle_info)
@@ -9,6 +9,11 @@ import signal
 from typing import Dict, Any, Optional
 import datetime
 
+try:
+    import uvloop
+except ImportError:  # uvloop optionnel (indisponible sous Windows): boucle asyncio standard sinon
+    uvloop = None
+
 import config
 from api.binance_client import BinanceAPIClient
 from core.display import DataDisplay
@@ -313,14 +318,10 @@ class BinanceTradingBot:
                 print(f"{tp_display}")
             
             # Vérifier si des TP ont été exécutés et effectuer le nettoyage automatique
+            # (filet de sécurité : les exécutions sont normalement reçues par le User Data Stream)
             executed_tp = self.tp_service.check_tp_execution_and_cleanup()
             if executed_tp:
-                print(f"🎯 TP {executed_tp} EXÉCUTÉ - Reset complet en cours...")
-                # Notifier le service cascade qu'un TP a été exécuté (fermeture complète)
-                self.cascade_service.handle_tp_execution(executed_tp)
-                # Reset du service de signaux pour permettre nouveau cycle
-                self.signal_service.reset_signal()
-                print("✅ SYSTÈME RÉINITIALISÉ - Prêt pour nouveau signal")
+                self._handle_tp_executed(executed_tp)
                 
         except Exception as e:
             self.logger.error(f"Erreur lors de la détection de signaux: {e}", exc_info=True)
@@ -364,12 +365,32 @@ class BinanceTradingBot:
         self.logger.debug("_handle_order_execution called")
         
         try:
+            # TP exécuté : fermeture complète sans attendre la vérification de la bougie suivante
+            executed_tp = self.tp_service.handle_order_execution_from_websocket(execution_data)
+            if executed_tp:
+                self._handle_tp_executed(executed_tp)
+                return
+            
             # Transmettre à CascadeService pour traitement
             self.cascade_service.handle_order_execution_from_websocket(execution_data)
             
         except Exception as e:
             self.logger.error(f"Erreur lors du traitement de l'exécution d'ordre: {e}", exc_info=True)
     
+    def _handle_tp_executed(self, executed_tp: str) -> None:
+        """
+        Réinitialise la cascade et les signaux après l'exécution d'un TP
+        
+        Args:
+            executed_tp: Côté du TP exécuté ("LONG" ou "SHORT")
+        """
+        print(f"🎯 TP {executed_tp} EXÉCUTÉ - Reset complet en cours...")
+        # Notifier le service cascade qu'un TP a été exécuté (fermeture complète)
+        self.cascade_service.handle_tp_execution(executed_tp)
+        # Reset du service de signaux pour permettre nouveau cycle
+        self.signal_service.reset_signal()
+        print("✅ SYSTÈME RÉINITIALISÉ - Prêt pour nouveau signal")
+    
     def _display_account_balance(self) -> None:
         """Récupère et affiche la balance du compte"""
         self.logger.debug("_display_account_balance called")
@@ -527,6 +548,10 @@ class BinanceTradingBot:
 
 def main() -> None:
     """Point d'entrée principal avec timeout d'arrêt"""
+    # Boucle d'événements libuv pour les flux WebSocket, si disponible
+    if uvloop is not None:
+        uvloop.install()
+    
     try:
         bot = BinanceTradingBot()
         
@@ -3,11 +3,15 @@ WebSocket Manager pour Binance User Data Stream
 Responsabilité unique : Écoute en temps réel des exécutions d'ordres
 """
 import asyncio
-import json
 import websockets
 from typing import Dict, Any, Optional, Callable
 import time
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson optionnel: décodage JSON standard sinon
+    from json import loads as json_loads
+
 import config
 from core.logger import get_module_logger
 from api.binance_client import BinanceAPIClient
@@ -205,7 +209,7 @@ class UserDataStreamManager:
             message: Message JSON reçu
         """
         try:
-            data = json.loads(message)
+            data = json_loads(message)
             event_type = data.get("e")
             
             if event_type == "ORDER_TRADE_UPDATE":
@@ -245,21 +249,35 @@ class UserDataStreamManager:
             self.logger.info(f"   Status: {order_status}, Execution: {execution_type}")
             self.logger.info(f"   Qty: {cumulative_qty}/{original_qty}, Price: {last_fill_price}")
             
+            # Créer un objet compatible avec le handler cascade
+            execution_data = {
+                "i": str(order_id),                    # Order ID
+                "s": symbol,                           # Symbol
+                "S": side,                             # Side (BUY/SELL)
+                "X": order_status,                     # Order status
+                "z": cumulative_qty,                   # Executed quantity
+                "L": last_fill_price,                  # Last executed price
+                "ap": order_data.get("ap", "0"),       # Average price
+                "ps": position_side                    # Position side
+            }
+
+            # Annulations/expirations: confirment les remplacements de SL ALL_OR_NOTHING
+            if order_status in ("CANCELED", "EXPIRED") and symbol == config.SYMBOL:
+                if self.trading_bot and hasattr(self.trading_bot, 'strategy_manager'):
+                    if self.trading_bot.strategy_manager.current_strategy_type == "ALL_OR_NOTHING":
+                        try:
+                            self.trading_bot.strategy_manager.current_strategy.handle_order_execution_from_websocket(
+                                execution_data
+                            )
+                        except AttributeError:
+                            self.logger.debug("AllOrNothingStrategy non accessible depuis la stratégie courante")
+                        except Exception as aon_error:
+                            self.logger.error(f"Erreur envoi à AllOrNothingStrategy: {aon_error}")
+
             # Ne traiter que les ordres FILLED de notre symbole
             if order_status == "FILLED" and symbol == config.SYMBOL:
                 self.logger.info(f"✅ Ordre FILLED détecté: {side} {cumulative_qty} {symbol} @ {last_fill_price}")
                 
-                # Créer un objet compatible avec le handler cascade
-                execution_data = {
-                    "i": str(order_id),                    # Order ID
-                    "s": symbol,                           # Symbol
-                    "S": side,                             # Side (BUY/SELL)
-                    "X": order_status,                     # Order status
-                    "z": cumulative_qty,                   # Executed quantity
-                    "L": last_fill_price,                  # Last executed price
-                    "ps": position_side                    # Position side
-                }
-                
                 # Appeler le handler si défini (directement dans la boucle d'événements)
                 if self.order_execution_handler:
                     self.order_execution_handler(execution_data)
@@ -3,11 +3,15 @@ Gestionnaire WebSocket
 Responsabilité unique : Gestion des connexions WebSocket avec reconnexion automatique
 """
 import asyncio
-import json
 from typing import Any, Callable, Optional
 
 import websockets
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson optionnel: décodage JSON standard sinon
+    from json import loads as json_loads
+
 import config
 from core.logger import get_module_logger
 
@@ -142,7 +146,7 @@ class WebSocketManager:
                     break
                     
                 data = await self._receive_websocket_data(websocket)
-                message_data = json.loads(data)
+                message_data = json_loads(data)
                 
                 # Vérifier à nouveau is_running après avoir reçu les données
                 if not self.is_running: